@@ -0,0 +1,63 @@
+"""
+Cœur commun des tests E2E AccessGate PoC
+- Logger JSONL, Kubernetes, API, frontend, navigateur, charge et seed
+- Imports paresseux : un module (et ses dépendances, ex. Playwright ou aiohttp)
+  n'est chargé qu'au premier accès à l'un de ses noms
+"""
+
+import importlib
+
+# Nom exporté -> module du paquet qui le définit
+_EXPORTS = {
+    "APITester": "api",
+    "AsyncLoadTester": "load_engine",
+    "AuthorizationBenchmark": "auth_bench",
+    "BatchedJSONLWriter": "jsonl_writer",
+    "BinaryLogWriter": "binary_log",
+    "BulkSeeder": "db_seed",
+    "DAGScheduler": "dag",
+    "E2ETestRunner": "runner",
+    "FanOutDataset": "auth_bench",
+    "FrontendTester": "frontend",
+    "IdentityAllocator": "identities",
+    "KubernetesDeployer": "deployer",
+    "KubernetesManager": "kubernetes",
+    "LatencyHistogram": "latency",
+    "LatencyRecorder": "latency",
+    "LoadAgent": "distributed",
+    "LoadCoordinator": "distributed",
+    "MetricsScraper": "prometheus",
+    "MultiProcessLoadRunner": "workers",
+    "OpenModelLoadTester": "load_profiles",
+    "PaginationBenchmark": "pagination_bench",
+    "PlaywrightE2ETester": "browser",
+    "PodReadinessWatcher": "k8s_watch",
+    "PodResourceSampler": "k8s_resources",
+    "PortForwardError": "port_forward",
+    "RBACDatasetGenerator": "rbac_dataset",
+    "RegressionDetector": "results_store",
+    "ResultsStore": "results_store",
+    "Scenario": "scenario",
+    "StandInBackend": "stand_in",
+    "Step": "scenario",
+    "StructuredLogger": "logger",
+    "TokenPool": "token_pool",
+    "configure_output": "logger",
+    "wait_for_tunnel": "port_forward",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    """Importer le module d'un nom exporté au premier accès"""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Tests de l'API backend AccessGate PoC
+- Santé, inscription, connexion, endpoints protégés
+- Session HTTP keep-alive unique et latence enregistrée par endpoint
+- Tir de charge asyncio délégué au moteur de charge
+"""
+
+import time
+from typing import Dict, List, Optional
+
+import requests
+
+from .latency import LatencyRecorder
+from .logger import StructuredLogger
+
+
+class APITester:
+    """Testeur d'API"""
+
+    def __init__(self, base_url: str = "http://localhost:8001",
+                 latency: Optional[LatencyRecorder] = None):
+        self.base_url = base_url
+        self.logger = StructuredLogger("api_tester")
+        self.session = requests.Session()
+        self.latency = latency or LatencyRecorder()
+        self.auth_token = None
+
+    def _timed_request(self, endpoint: str, method: str, path: str, **kwargs):
+        """Envoyer une requête en enregistrant sa latence pour l'endpoint"""
+        with self.latency.measure(endpoint):
+            return self.session.request(method, f"{self.base_url}{path}", **kwargs)
+
+    def test_health(self) -> bool:
+        """Tester l'endpoint de santé"""
+        try:
+            response = self._timed_request("health", "GET", "/health", timeout=10)
+            success = response.status_code == 200
+
+            self.logger.log_event("health_check", "Test health endpoint",
+                                status_code=response.status_code,
+                                success=success)
+
+            if success:
+                data = response.json()
+                self.logger.log_metric("health_uptime", data.get("uptime", 0))
+
+            return success
+        except Exception as e:
+            self.logger.log_event("health_check", "Erreur health check",
+                                error=str(e), success=False)
+            return False
+
+    def register_user(self, email: str, password: str, first_name: str, last_name: str) -> bool:
+        """Inscrire un utilisateur"""
+        try:
+            data = {
+                "email": email,
+                "password": password,
+                "firstName": first_name,
+                "lastName": last_name
+            }
+
+            response = self._timed_request("auth_register", "POST", "/api/auth/register",
+                                           json=data, timeout=10)
+
+            success = response.status_code == 201
+            self.logger.log_event("user_registration", "Inscription utilisateur",
+                                email=email, status_code=response.status_code,
+                                success=success)
+
+            if success:
+                result = response.json()
+                self.auth_token = result.get("accessToken")
+                self.logger.log_metric("user_registration_success", 1)
+            else:
+                self.logger.log_metric("user_registration_failure", 1)
+
+            return success
+        except Exception as e:
+            self.logger.log_event("user_registration", "Erreur inscription",
+                                error=str(e), success=False)
+            return False
+
+    def login_user(self, email: str, password: str) -> bool:
+        """Connecter un utilisateur"""
+        try:
+            data = {"email": email, "password": password}
+
+            response = self._timed_request("auth_login", "POST", "/api/auth/login",
+                                           json=data, timeout=10)
+
+            success = response.status_code == 200
+            self.logger.log_event("user_login", "Connexion utilisateur",
+                                email=email, status_code=response.status_code,
+                                success=success)
+
+            if success:
+                result = response.json()
+                self.auth_token = result.get("accessToken")
+                self.logger.log_metric("user_login_success", 1)
+            else:
+                self.logger.log_metric("user_login_failure", 1)
+
+            return success
+        except Exception as e:
+            self.logger.log_event("user_login", "Erreur connexion",
+                                error=str(e), success=False)
+            return False
+
+    def test_protected_endpoint(self) -> bool:
+        """Tester un endpoint protégé"""
+        if not self.auth_token:
+            self.logger.log_event("protected_test", "Pas de token d'auth",
+                                success=False)
+            return False
+
+        try:
+            headers = {"Authorization": f"Bearer {self.auth_token}"}
+            response = self._timed_request("users_list", "GET", "/api/users",
+                                           headers=headers, timeout=10)
+
+            success = response.status_code == 200
+            self.logger.log_event("protected_endpoint", "Test endpoint protégé",
+                                status_code=response.status_code, success=success)
+
+            if success:
+                data = response.json()
+                user_count = len(data.get("users", []))
+                self.logger.log_metric("users_count", user_count)
+
+            return success
+        except Exception as e:
+            self.logger.log_event("protected_endpoint", "Erreur endpoint protégé",
+                                error=str(e), success=False)
+            return False
+
+    def test_api_complete(self, email: str, password: str, first_name: str,
+                          last_name: str) -> bool:
+        """Parcours complet avec un compte dédié : inscription, connexion, endpoint protégé"""
+        start_time = time.perf_counter()
+        try:
+            reg_response = self._timed_request("auth_register", "POST", "/api/auth/register",
+                                               json={"email": email, "password": password,
+                                                     "firstName": first_name,
+                                                     "lastName": last_name},
+                                               timeout=10)
+            if reg_response.status_code != 201:
+                return False
+
+            login_response = self._timed_request("auth_login", "POST", "/api/auth/login",
+                                                 json={"email": email, "password": password},
+                                                 timeout=10)
+            if login_response.status_code != 200:
+                return False
+
+            token = login_response.json().get("accessToken")
+            users_response = self._timed_request("users_list", "GET", "/api/users",
+                                                 headers={"Authorization": f"Bearer {token}"},
+                                                 timeout=10)
+
+            success = users_response.status_code in [200, 403]  # 403 acceptable si pas de permissions
+
+            duration = time.perf_counter() - start_time
+            self.logger.log_test_result("api_complete", "PASS" if success else "FAIL", duration,
+                                      final_status_code=users_response.status_code)
+            return success
+        except Exception as e:
+            self.logger.log_test_result("api_complete", "FAIL",
+                                      time.perf_counter() - start_time, error=str(e))
+            return False
+
+    async def run_load(self, email: str, password: str, virtual_users: int = 100,
+                       duration: float = 30, max_connections: int = 100,
+                       pool_size: int = 10, endpoints: Optional[List[str]] = None) -> Dict:
+        """Tir de charge asyncio (par défaut /health et /api/users avec tokens pré-authentifiés)
+
+        Les tokens viennent des comptes seedés (db_seed.py) : le compte inscrit par la
+        suite n'a aucun rôle, /api/users lui répond 403. pool_size=0 l'utilise quand même.
+        """
+        from .load_engine import AsyncLoadTester
+        from .rbac_dataset import seeded_accounts
+
+        if not pool_size:
+            self.logger.log_event("load_accounts", "Tir avec le compte inscrit (sans rôle : "
+                                "403 attendus sur /api/users)", email=email, status="warning")
+
+        load_tester = AsyncLoadTester(self.logger, self.base_url,
+                                      max_connections=max_connections)
+        return await load_tester.run(virtual_users, duration,
+                                     endpoints=endpoints or ["health", "users"],
+                                     email=email, password=password,
+                                     accounts=seeded_accounts(pool_size) or None)
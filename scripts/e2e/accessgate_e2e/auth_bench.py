@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark du coût d'autorisation (checkAuth + requirePermission) d'AccessGate PoC
+- Un utilisateur par palier de fan-out : R rôles, P permissions générées par rôle
+- Route protégée bon marché (/api/permissions/:id) en boucle fermée, /health en référence
+- Paliers mesurés en alternance sur plusieurs tours (dérive du cluster répartie)
+- Coût par ligne role_permissions chargée (régression linéaire) et graphique SVG
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .latency import LatencyRecorder
+from .rbac_dataset import SEED_PASSWORD, RBACDatasetGenerator
+
+# Un login par palier : authRateLimiter n'en accepte que 5 par IP et par fenêtre de 15 min
+# (register / login / refresh confondus), d'où 4 paliers par défaut
+AUTH_LOGIN_LIMIT = 5
+DEFAULT_ROLE_COUNTS = (1, 100)
+DEFAULT_PERMISSION_COUNTS = (1, 50)
+
+# Route protégée par checkAuth + requirePermission('role.read') au traitement minimal
+TARGET_PATH = "/api/permissions/{permission_id}"
+BASELINE = "baseline"
+
+
+def tier_name(roles: int, permissions: int) -> str:
+    """Nom d'un palier : "r10-p50" (10 rôles de 50 permissions générées)"""
+    return f"r{roles}-p{permissions}"
+
+
+def parse_counts(value: str) -> Tuple[int, ...]:
+    """Liste CLI de paliers : "1,10,100" """
+    counts = tuple(int(item) for item in value.split(",") if item.strip())
+    if not counts or min(counts) < 1:
+        raise ValueError(f"Paliers invalides: {value}")
+    return counts
+
+
+class FanOutDataset(RBACDatasetGenerator):
+    """Jeu RBAC à fan-out exact : un utilisateur par palier (rôles x permissions par rôle)
+
+    Chaque rôle reçoit ses propres permissions générées : l'utilisateur d'un palier charge
+    R x (P + permissions accordées) lignes role_permissions, pour R x P + 2 permissions
+    distinctes. Mêmes lignes et même seed que RBACDatasetGenerator (db_seed, substitut).
+    """
+
+    def __init__(self, role_counts: Sequence[int] = DEFAULT_ROLE_COUNTS,
+                 permission_counts: Sequence[int] = DEFAULT_PERMISSION_COUNTS,
+                 prefix: str = "authbench", **options):
+        self.tiers = [(roles, permissions) for roles in role_counts
+                      for permissions in permission_counts]
+        super().__init__(users=len(self.tiers), roles=sum(roles for roles, _ in self.tiers),
+                         permissions=max(roles * permissions for roles, permissions in self.tiers),
+                         roles_per_user=(min(role_counts), max(role_counts)),
+                         permissions_per_role=(min(permission_counts), max(permission_counts)),
+                         prefix=prefix, **options)
+        # Premier rôle de chaque utilisateur, puis (P, rang dans le palier) de chaque rôle
+        self.role_offsets: List[int] = []
+        self.role_tiers: List[Tuple[int, int]] = []
+        for roles, permissions in self.tiers:
+            self.role_offsets.append(len(self.role_tiers))
+            self.role_tiers.extend((permissions, rank) for rank in range(roles))
+
+    def user_email(self, index: int) -> str:
+        return f"{self.prefix}-{tier_name(*self.tiers[index])}@accessgate.com"
+
+    def role_indexes(self, user_index: int) -> Sequence[int]:
+        offset = self.role_offsets[user_index]
+        return range(offset, offset + self.tiers[user_index][0])
+
+    def permission_indexes(self, role_index: int) -> Sequence[int]:
+        permissions, rank = self.role_tiers[role_index]
+        return range(rank * permissions, (rank + 1) * permissions)
+
+    def accounts(self) -> Dict[str, Tuple[str, str]]:
+        """Identifiants (email, mot de passe) par palier"""
+        return {tier_name(*tier): (self.user_email(index), SEED_PASSWORD)
+                for index, tier in enumerate(self.tiers)}
+
+    def describe(self) -> Dict:
+        return {**super().describe(), "tiers": [list(tier) for tier in self.tiers]}
+
+
+def linear_fit(points: Sequence[Tuple[float, float]]) -> Optional[Dict]:
+    """Moindres carrés y = a + b.x (None si moins de deux abscisses distinctes)"""
+    if len({x for x, _ in points}) < 2:
+        return None
+    count = len(points)
+    mean_x = sum(x for x, _ in points) / count
+    mean_y = sum(y for _, y in points) / count
+    sxx = sum((x - mean_x) ** 2 for x, _ in points)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    syy = sum((y - mean_y) ** 2 for _, y in points)
+    slope = sxy / sxx
+    return {"intercept": mean_y - slope * mean_x, "slope": slope,
+            "r2": sxy * sxy / (sxx * syy) if syy else 1.0}
+
+
+def planned_requests(tiers: int, requests: int, warmup: int) -> int:
+    """Requêtes d'un run soumises au rateLimiter global (logins, cible, paliers et /health)"""
+    return tiers + 1 + (tiers + 1) * (warmup + requests)
+
+
+class AuthorizationBenchmark:
+    """Latence de la route cible par palier de fan-out, en boucle fermée"""
+
+    def __init__(self, logger, base_url: str = "http://localhost:8001",
+                 concurrency: int = 4, timeout: float = 10):
+        self.logger = logger
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.recorder = LatencyRecorder()
+        self.errors: Dict[str, int] = {}
+        # 429 du rateLimiter global : réponses rejetées avant checkAuth, hors histogrammes
+        self.rate_limited: Dict[str, int] = {}
+        self.durations: Dict[str, float] = {}
+
+    async def _resolve_target(self, session, headers: Dict[str, str]) -> Optional[Dict]:
+        """Permission détenue par le moins de rôles : corps de réponse indépendant du fan-out
+
+        getPermissionById inclut les rôles qui détiennent la permission ; role.read,
+        accordée à tous les rôles générés, grossirait avec les paliers.
+        """
+        async with session.get(f"{self.base_url}/api/permissions", headers=headers) as response:
+            if response.status == 429:
+                self.rate_limited["permissions"] = 1
+            if response.status != 200:
+                return None
+            permissions = await response.json()
+        if not permissions:
+            return None
+        return min(permissions, key=lambda permission: (
+            permission.get("_count", {}).get("rolePermissions", 0), permission["name"]))
+
+    async def _measure(self, session, name: str, url: str, headers: Dict[str, str],
+                       requests: int, record: bool = True) -> bool:
+        """requests requêtes sur concurrency connexions ; latence envoi -> corps lu
+
+        Retourne False au premier 429 du rateLimiter global (mesure arrêtée) : ces réponses
+        courtes ne passent pas par checkAuth et fausseraient latences et régression.
+        """
+        histogram = self.recorder.histogram(name)
+        remaining = requests
+
+        async def client():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                sent = time.perf_counter()
+                try:
+                    async with session.get(url, headers=headers) as response:
+                        await response.read()
+                        status = response.status
+                except Exception:
+                    status = 0
+                if status == 429:
+                    self.rate_limited[name] = self.rate_limited.get(name, 0) + 1
+                    remaining = 0
+                elif record:
+                    histogram.record(time.perf_counter() - sent)
+                    if status != 200:
+                        self.errors[name] = self.errors.get(name, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(min(self.concurrency, requests))))
+        if record:
+            self.durations[name] = self.durations.get(name, 0.0) + time.perf_counter() - started
+        return name not in self.rate_limited
+
+    def _rate_limited_error(self, planned: int) -> Dict:
+        """Journaliser l'arrêt sur 429 du rateLimiter global ; retourne un rapport vide"""
+        self.logger.log_event("auth_bench_error", "Réponses 429 du rateLimiter global : relever "
+                            "RATE_LIMIT_MAX_REQUESTS (k8s/configmap.yaml) au-delà des requêtes "
+                            "prévues", planned_requests=planned, rate_limited=self.rate_limited,
+                            status="error")
+        return {}
+
+    async def run(self, dataset: FanOutDataset, requests: int = 2000, warmup: int = 100,
+                  rounds: int = 4, seed: int = 42) -> Dict:
+        """Mesurer chaque palier (et la référence /health) ; retourne le rapport"""
+        try:
+            import aiohttp
+        except ImportError:
+            self.logger.log_event("auth_bench_import", "aiohttp non installé", status="error")
+            return {}
+        from .token_pool import TokenPool
+
+        accounts = dataset.accounts()
+        planned = planned_requests(len(accounts), requests, warmup)
+        self.logger.log_event("auth_bench_start", "Démarrage microbenchmark d'autorisation",
+                            base_url=self.base_url, dataset=dataset.describe(),
+                            requests=requests, warmup=warmup, rounds=rounds,
+                            concurrency=self.concurrency, planned_requests=planned)
+
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            pool = TokenPool(self.logger, self.base_url)
+            await pool.fill(session, list(accounts.values()))
+            slots = {slot.email: slot for slot in pool.slots}
+            headers = {name: slots[email].headers() for name, (email, _) in accounts.items()
+                       if email in slots}
+            missing = sorted(set(accounts) - set(headers))
+            if missing and pool.retry_after is not None:
+                self.logger.log_event("auth_bench_error", "Logins refusés par authRateLimiter "
+                                    "(5 par fenêtre de 15 min), relancer après retry_after "
+                                    "secondes", tiers=missing, retry_after=pool.retry_after,
+                                    status="error")
+                return {}
+            if missing:
+                self.logger.log_event("auth_bench_error", "Comptes de palier non authentifiés "
+                                    "(jeu seedé ? voir --seed-db)", tiers=missing, status="error")
+                return {}
+
+            target = await self._resolve_target(session, next(iter(headers.values())))
+            if self.rate_limited:
+                return self._rate_limited_error(planned)
+            if target is None:
+                self.logger.log_event("auth_bench_error", "Aucune permission lisible",
+                                    status="error")
+                return {}
+            url = self.base_url + TARGET_PATH.format(permission_id=target["id"])
+            urls = {name: (url, tier_headers) for name, tier_headers in headers.items()}
+            urls[BASELINE] = (f"{self.base_url}/health", {})
+
+            for name, (tier_url, tier_headers) in urls.items():
+                if not await self._measure(session, name, tier_url, tier_headers, warmup,
+                                           record=False):
+                    return self._rate_limited_error(planned)
+
+            # Tours entrelacés, ordre mélangé : une dérive touche tous les paliers
+            rng = random.Random(seed)
+            order = list(urls)
+            for index in range(rounds):
+                rng.shuffle(order)
+                share = requests // rounds + (1 if index < requests % rounds else 0)
+                for name in order:
+                    if not await self._measure(session, name, *urls[name], share):
+                        return self._rate_limited_error(planned)
+
+        return self._report(dataset, target)
+
+    def _report(self, dataset: FanOutDataset, target: Dict) -> Dict:
+        """Latences par palier, coût relatif à /health et régression sur le fan-out"""
+        baseline = self.recorder.histograms[BASELINE].summary()
+        grant = len(dataset.grant)
+        tiers = {}
+        for roles, permissions in dataset.tiers:
+            name = tier_name(roles, permissions)
+            summary = self.recorder.histograms[name].summary()
+            tiers[name] = {
+                "roles": roles,
+                "permissions_per_role": permissions,
+                "role_permission_rows": roles * (permissions + grant),
+                "distinct_permissions": roles * permissions + grant,
+                "requests": summary["count"],
+                "errors": self.errors.get(name, 0),
+                "latency": summary,
+                "auth_cost_mean": summary["mean"] - baseline["mean"],
+                "auth_cost_p50": summary["p50"] - baseline["p50"],
+            }
+
+        fit = linear_fit([(tier["role_permission_rows"], tier["latency"]["mean"])
+                          for tier in tiers.values()])
+        report = {
+            "target": {"id": target["id"], "name": target["name"]},
+            "baseline": baseline,
+            "tiers": tiers,
+            "fit": fit,
+            "histograms": self.recorder.to_dict(),
+        }
+        self.logger.log_event("auth_bench_complete", "Microbenchmark d'autorisation terminé",
+                            target=report["target"], baseline=baseline, tiers=tiers, fit=fit,
+                            status="success" if not any(self.errors.values()) else "warning")
+        self.recorder.log_summary(self.logger, prefix="auth_bench_latency")
+        for name, tier in tiers.items():
+            self.logger.log_metric("auth_cost_mean", tier["auth_cost_mean"], endpoint=name,
+                                   roles=tier["roles"],
+                                   permissions_per_role=tier["permissions_per_role"],
+                                   unit="seconds")
+        if fit is not None:
+            self.logger.log_metric("auth_cost_per_role_permission_row", fit["slope"],
+                                   unit="seconds", r2=fit["r2"])
+        return report
+
+    def store_endpoints(self) -> Dict[str, Dict]:
+        """Paliers au format de la base des résultats (results_store)"""
+        return {name: {"requests": histogram.count, "errors": self.errors.get(name, 0),
+                       "duration": self.durations.get(name),
+                       "histogram": histogram}
+                for name, histogram in self.recorder.histograms.items() if histogram.count}
+
+
+def render_plot(report: Dict, width: int = 720, height: int = 420) -> str:
+    """Graphique SVG : latence moyenne (trait plein) et p99 (tirets) en fonction des rôles
+
+    Axe des rôles logarithmique, une courbe par nombre de permissions par rôle,
+    référence /health en gris.
+    """
+    tiers = list(report["tiers"].values())
+    role_counts = sorted({tier["roles"] for tier in tiers})
+    series: Dict[int, List[Dict]] = {}
+    for tier in sorted(tiers, key=lambda tier: tier["roles"]):
+        series.setdefault(tier["permissions_per_role"], []).append(tier)
+
+    left, right, top, bottom = 70, 150, 30, 50
+    plot_width, plot_height = width - left - right, height - top - bottom
+    y_max = max(tier["latency"]["p99"] for tier in tiers) * 1.1 or 1e-3
+    log_min = math.log10(role_counts[0])
+    log_span = (math.log10(role_counts[-1]) - log_min) or 1
+
+    def x(roles: float) -> float:
+        if len(role_counts) == 1:
+            return left + plot_width / 2
+        return left + (math.log10(roles) - log_min) / log_span * plot_width
+
+    def y(seconds: float) -> float:
+        return top + plot_height - seconds / y_max * plot_height
+
+    colors = ("#1f77b4", "#d62728", "#2ca02c", "#ff7f0e", "#9467bd", "#8c564b")
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+             f'font-family="sans-serif" font-size="12">',
+             f'<rect width="{width}" height="{height}" fill="white"/>',
+             f'<text x="{left}" y="18" font-size="14">Coût checkAuth + requirePermission '
+             f'(GET /api/permissions/:id)</text>',
+             f'<line x1="{left}" y1="{top + plot_height}" x2="{left + plot_width}" '
+             f'y2="{top + plot_height}" stroke="black"/>',
+             f'<line x1="{left}" y1="{top}" x2="{left}" y2="{top + plot_height}" stroke="black"/>',
+             f'<text x="{left + plot_width / 2}" y="{height - 10}" text-anchor="middle">'
+             f'Rôles par utilisateur (log)</text>',
+             f'<text x="15" y="{top + plot_height / 2}" text-anchor="middle" '
+             f'transform="rotate(-90 15 {top + plot_height / 2})">Latence (ms)</text>']
+    for roles in role_counts:
+        parts.append(f'<text x="{x(roles):.1f}" y="{top + plot_height + 18}" '
+                     f'text-anchor="middle">{roles}</text>')
+    for step in range(6):
+        value = y_max * step / 5
+        parts.append(f'<line x1="{left - 4}" y1="{y(value):.1f}" x2="{left + plot_width}" '
+                     f'y2="{y(value):.1f}" stroke="#ddd"/>')
+        parts.append(f'<text x="{left - 8}" y="{y(value) + 4:.1f}" text-anchor="end">'
+                     f'{value * 1000:.1f}</text>')
+
+    baseline = report["baseline"]["mean"]
+    parts.append(f'<line x1="{left}" y1="{y(baseline):.1f}" x2="{left + plot_width}" '
+                 f'y2="{y(baseline):.1f}" stroke="#999" stroke-dasharray="2,3"/>')
+    parts.append(f'<text x="{left + plot_width + 8}" y="{y(baseline) + 4:.1f}" fill="#999">'
+                 f'/health</text>')
+    for index, (permissions, points) in enumerate(sorted(series.items())):
+        color = colors[index % len(colors)]
+        for key, dash in (("mean", ""), ("p99", ' stroke-dasharray="6,4"')):
+            path = " ".join(f"{x(tier['roles']):.1f},{y(tier['latency'][key]):.1f}"
+                            for tier in points)
+            parts.append(f'<polyline points="{path}" fill="none" stroke="{color}" '
+                         f'stroke-width="2"{dash}/>')
+        for tier in points:
+            parts.append(f'<circle cx="{x(tier["roles"]):.1f}" '
+                         f'cy="{y(tier["latency"]["mean"]):.1f}" r="3" fill="{color}"/>')
+        legend_y = top + 20 + index * 18
+        parts.append(f'<line x1="{left + plot_width + 8}" y1="{legend_y - 4}" '
+                     f'x2="{left + plot_width + 28}" y2="{legend_y - 4}" stroke="{color}" '
+                     f'stroke-width="2"/>')
+        parts.append(f'<text x="{left + plot_width + 34}" y="{legend_y}">'
+                     f'{permissions} perm./rôle</text>')
+    parts.append(f'<text x="{left + plot_width + 8}" y="{top + 30 + len(series) * 18}" '
+                 f'fill="#555">plein : moyenne</text>')
+    parts.append(f'<text x="{left + plot_width + 8}" y="{top + 46 + len(series) * 18}" '
+                 f'fill="#555">tirets : p99</text>')
+    parts.append("</svg>")
+    return "\n".join(parts) + "\n"
+
+
+def print_report(report: Dict):
+    """Tableau console des paliers"""
+    baseline = report["baseline"]
+    print(f"\n🎯 Cible : GET /api/permissions/{report['target']['id']} ({report['target']['name']})")
+    print(f"   Référence /health : moyenne {baseline['mean'] * 1000:.2f} ms, "
+          f"p99 {baseline['p99'] * 1000:.2f} ms")
+    print(f"\n{'palier':>12} {'lignes':>7} {'moyenne':>9} {'p50':>9} {'p99':>9} "
+          f"{'coût auth':>10} {'erreurs':>8}")
+    for name, tier in report["tiers"].items():
+        latency = tier["latency"]
+        print(f"{name:>12} {tier['role_permission_rows']:>7} {latency['mean'] * 1000:>7.2f}ms "
+              f"{latency['p50'] * 1000:>7.2f}ms {latency['p99'] * 1000:>7.2f}ms "
+              f"{tier['auth_cost_mean'] * 1000:>8.2f}ms {tier['errors']:>8}")
+    fit = report["fit"]
+    if fit is not None:
+        print(f"\n📈 Coût par ligne role_permissions chargée : {fit['slope'] * 1e6:.2f} µs "
+              f"(ordonnée {fit['intercept'] * 1000:.2f} ms, R² {fit['r2']:.3f})")
+
+
+def main():
+    """Point d'entrée CLI du microbenchmark d'autorisation"""
+    from .db_seed import BulkSeeder
+    from .logger import StructuredLogger, configure_output
+    from .results_store import add_store_arguments, record_and_compare
+    from .stand_in import add_stand_in_arguments, stand_in_from_args
+
+    parser = argparse.ArgumentParser(description="Microbenchmark checkAuth / requirePermission "
+                                                 "AccessGate PoC")
+    parser.add_argument("--base-url", default="http://localhost:8001")
+    parser.add_argument("--roles", type=parse_counts, default=DEFAULT_ROLE_COUNTS,
+                        help="Paliers de rôles par utilisateur, ex. 1,10,100")
+    parser.add_argument("--permissions-per-role", type=parse_counts,
+                        default=DEFAULT_PERMISSION_COUNTS,
+                        help="Paliers de permissions générées par rôle, ex. 1,10,50")
+    parser.add_argument("--login-limit", type=int, default=AUTH_LOGIN_LIMIT,
+                        help="Logins autorisés par authRateLimiter (un par palier ; "
+                             "0 : pas de contrôle, backend au limiteur relâché)")
+    parser.add_argument("--requests", type=int, default=2000,
+                        help="Requêtes mesurées par palier ; le rateLimiter global doit laisser "
+                             "passer tout le run (RATE_LIMIT_MAX_REQUESTS, défaut 100 par 15 min : "
+                             "à relever, sinon arrêt au premier 429)")
+    parser.add_argument("--warmup", type=int, default=100, help="Requêtes d'échauffement par palier")
+    parser.add_argument("--rounds", type=int, default=4,
+                        help="Tours entrelacés (ordre des paliers mélangé à chaque tour)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Requêtes simultanées")
+    parser.add_argument("--seed", type=int, default=42, help="Graine de l'ordre des paliers")
+    parser.add_argument("--prefix", default="authbench", help="Préfixe des entités générées")
+    parser.add_argument("--seed-db", action="store_true",
+                        help="Seeder les utilisateurs de palier avant la mesure (db_seed)")
+    parser.add_argument("--namespace", default="accessgate-poc")
+    parser.add_argument("--database", default="accessgate")
+    parser.add_argument("--db-port", type=int, help="Port postgres forwardé (sinon kubectl exec)")
+    parser.add_argument("--plot", default="logs/auth-bench.svg",
+                        help="Graphique SVG (vide : pas de graphique)")
+    add_stand_in_arguments(parser)
+    add_store_arguments(parser)
+    args = parser.parse_args()
+    tiers = len(args.roles) * len(args.permissions_per_role)
+    if not args.stand_in and args.login_limit and tiers > args.login_limit:
+        parser.error(f"{tiers} paliers, soit {tiers} logins : authRateLimiter n'en accepte que "
+                     f"{args.login_limit} par fenêtre de 15 min (réduire --roles / "
+                     f"--permissions-per-role, ou --login-limit 0)")
+
+    configure_output("logs/auth-bench-results.jsonl")
+    logger = StructuredLogger("auth_bench")
+    dataset = FanOutDataset(args.roles, args.permissions_per_role, prefix=args.prefix)
+
+    if args.seed_db and not args.stand_in:
+        try:
+            BulkSeeder(logger, namespace=args.namespace, database=args.database,
+                       port=args.db_port).seed(dataset.tables())
+        except (RuntimeError, subprocess.CalledProcessError, FileNotFoundError) as e:
+            logger.log_event("auth_bench_error", "Seed des paliers impossible", error=str(e),
+                             status="error")
+            return 1
+
+    backend = stand_in_from_args(args, dataset)
+    if backend is not None:
+        # Valide le banc sans cluster ; le substitut ne reproduit pas le coût Prisma
+        args.base_url = backend.start_in_thread()
+    bench = AuthorizationBenchmark(logger, args.base_url, args.concurrency)
+    try:
+        report = asyncio.run(bench.run(dataset, args.requests, args.warmup, args.rounds,
+                                       args.seed))
+    finally:
+        if backend is not None:
+            backend.stop_thread()
+    if not report:
+        return 1
+
+    print_report(report)
+    if args.plot:
+        Path(args.plot).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.plot).write_text(render_plot(report), encoding="utf-8")
+        print(f"🖼️  Graphique : {args.plot}")
+
+    if args.store:
+        scenario = {"tiers": [list(tier) for tier in dataset.tiers],
+                    "target": "stand-in" if args.stand_in else args.base_url,
+                    "concurrency": args.concurrency}
+        regressions = record_and_compare(args.store, "auth_bench", scenario,
+                                         bench.store_endpoints(), logger, args.baseline_runs,
+                                         base_url=args.base_url)
+        if regressions and args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
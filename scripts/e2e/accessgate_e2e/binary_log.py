@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Format de résultats binaire compact pour AccessGate PoC (alternative au JSONL)
+- Blocs autonomes préfixés par leur longueur, un bloc par lot du thread d'écriture
+- Chaînes (composant, événement, nom de métrique, clés...) internées dans chaque bloc
+- Horodatages en microsecondes, codés en écart avec l'enregistrement précédent
+- Conversion vers JSONL (Grafana) identique octet pour octet à BatchedJSONLWriter
+
+Chaque bloc repart de tables vides : plusieurs processus peuvent ajouter des blocs au
+même fichier, et une fin tronquée (arrêt brutal) ne fait perdre que le dernier bloc.
+"""
+
+import argparse
+import json
+import os
+import struct
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, TextIO
+
+from .jsonl_writer import BatchedJSONLWriter
+
+BINARY_SUFFIX = ".agbin"
+LOG_FORMATS = ("jsonl", "binary")
+
+# En-tête de bloc : signature + version, puis longueur du contenu (u32 little-endian)
+MAGIC = b"AGB\x01"
+_BLOCK_HEADER = struct.Struct("<4sI")
+_FLOAT = struct.Struct("<d")
+
+# Chaînes plus longues écrites telles quelles (messages d'erreur, corps de réponse...)
+MAX_INTERNED_LENGTH = 128
+
+# Types de valeur
+_NONE, _TRUE, _FALSE, _INT, _FLOAT_TAG, _STR_NEW, _STR_REF, _STR_RAW, _LIST, _DICT, _TIME = range(11)
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _varint(out: bytearray, value: int):
+    """Entier positif en base 128 (7 bits par octet)"""
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _zigzag(value: int) -> int:
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+def _parse_timestamp(value: str) -> Optional[int]:
+    """Horodatage du logger ("2025-01-01T12:00:00.123456Z") en µs, sinon None
+
+    Seules les deux formes produites par isoformat() + "Z" sont acceptées, ce qui
+    garantit un aller-retour exact vers la même chaîne.
+    """
+    if len(value) not in (20, 27) or value[-1] != "Z" or value[10] != "T":
+        return None
+    try:
+        moment = datetime.fromisoformat(value[:-1])
+    except ValueError:
+        return None
+    if moment.tzinfo is not None:
+        return None
+    return (moment - _EPOCH) // _MICROSECOND
+
+
+def _format_timestamp(micros: int) -> str:
+    return (_EPOCH + timedelta(microseconds=micros)).isoformat() + "Z"
+
+
+class _BlockEncoder:
+    """Encodage d'un bloc : table de chaînes et horodatage de référence propres au bloc"""
+
+    def __init__(self):
+        self.out = bytearray()
+        self.strings: Dict[str, int] = {}
+        self.last_time = 0
+
+    def string(self, value: str):
+        out = self.out
+        index = self.strings.get(value)
+        if index is not None:
+            out.append(_STR_REF)
+            _varint(out, index)
+            return
+        data = value.encode("utf-8")
+        if len(value) <= MAX_INTERNED_LENGTH:
+            self.strings[value] = len(self.strings)
+            out.append(_STR_NEW)
+        else:
+            out.append(_STR_RAW)
+        _varint(out, len(data))
+        out += data
+
+    def key(self, key) -> None:
+        if not isinstance(key, str):
+            # Même conversion que json.dumps pour les clés non textuelles
+            key = json.dumps(key) if key is None or isinstance(key, (bool, int, float)) else str(key)
+        self.string(key)
+
+    def value(self, value):
+        out = self.out
+        if value is None:
+            out.append(_NONE)
+        elif value is True:
+            out.append(_TRUE)
+        elif value is False:
+            out.append(_FALSE)
+        elif isinstance(value, str):
+            self.string(value)
+        elif isinstance(value, float):
+            out.append(_FLOAT_TAG)
+            out += _FLOAT.pack(value)
+        elif isinstance(value, int):
+            out.append(_INT)
+            _varint(out, _zigzag(int(value)))
+        elif isinstance(value, dict):
+            out.append(_DICT)
+            self.mapping(value)
+        elif isinstance(value, (list, tuple)):
+            out.append(_LIST)
+            _varint(out, len(value))
+            for item in value:
+                self.value(item)
+        else:
+            # Équivalent de default=str côté JSONL
+            self.string(str(value))
+
+    def mapping(self, entry: Dict):
+        _varint(self.out, len(entry))
+        for key, value in entry.items():
+            self.key(key)
+            self.value(value)
+
+    def entry(self, entry: Dict):
+        """Un enregistrement : l'horodatage du logger devient un écart en µs"""
+        out = self.out
+        _varint(out, len(entry))
+        for key, value in entry.items():
+            self.key(key)
+            micros = _parse_timestamp(value) if key == "timestamp" and isinstance(value, str) else None
+            if micros is None:
+                self.value(value)
+            else:
+                out.append(_TIME)
+                _varint(out, _zigzag(micros - self.last_time))
+                self.last_time = micros
+
+    def block(self, count: int) -> bytes:
+        payload = bytearray()
+        _varint(payload, count)
+        payload += self.out
+        return _BLOCK_HEADER.pack(MAGIC, len(payload)) + payload
+
+
+def encode_block(entries: Sequence[Dict]) -> bytes:
+    """Encoder un lot d'entrées en un bloc autonome"""
+    encoder = _BlockEncoder()
+    for entry in entries:
+        encoder.entry(entry)
+    return encoder.block(len(entries))
+
+
+class _BlockDecoder:
+    """Lecture d'un bloc (tables reconstruites dans l'ordre d'apparition)"""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.position = 0
+        self.strings: List[str] = []
+        self.last_time = 0
+
+    def varint(self) -> int:
+        data, position = self.data, self.position
+        result = shift = 0
+        while True:
+            byte = data[position]
+            position += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                self.position = position
+                return result
+            shift += 7
+
+    def value(self):
+        tag = self.data[self.position]
+        self.position += 1
+        if tag == _STR_REF:
+            return self.strings[self.varint()]
+        if tag == _STR_NEW or tag == _STR_RAW:
+            length = self.varint()
+            value = self.data[self.position:self.position + length].decode("utf-8")
+            self.position += length
+            if tag == _STR_NEW:
+                self.strings.append(value)
+            return value
+        if tag == _FLOAT_TAG:
+            value = _FLOAT.unpack_from(self.data, self.position)[0]
+            self.position += _FLOAT.size
+            return value
+        if tag == _INT:
+            return _unzigzag(self.varint())
+        if tag == _TIME:
+            self.last_time += _unzigzag(self.varint())
+            return _format_timestamp(self.last_time)
+        if tag == _DICT:
+            return self.mapping()
+        if tag == _LIST:
+            return [self.value() for _ in range(self.varint())]
+        if tag == _NONE:
+            return None
+        if tag == _TRUE:
+            return True
+        if tag == _FALSE:
+            return False
+        raise ValueError(f"Type de valeur inconnu: {tag} (octet {self.position - 1})")
+
+    def mapping(self) -> Dict:
+        entry = {}
+        for _ in range(self.varint()):
+            key = self.value()
+            entry[key] = self.value()
+        return entry
+
+    def entries(self) -> Iterator[Dict]:
+        for _ in range(self.varint()):
+            yield self.mapping()
+
+
+def iter_entries(path: str) -> Iterator[Dict]:
+    """Relire un fichier binaire, bloc par bloc (mémoire bornée par la taille d'un lot)"""
+    with open(path, "rb") as source:
+        while True:
+            header = source.read(_BLOCK_HEADER.size)
+            if not header:
+                return
+            if len(header) < _BLOCK_HEADER.size:
+                print(f"{path}: bloc final tronqué ignoré", file=sys.stderr)
+                return
+            magic, length = _BLOCK_HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError(f"{path}: signature de bloc invalide à l'octet "
+                                 f"{source.tell() - _BLOCK_HEADER.size}")
+            payload = source.read(length)
+            if len(payload) < length:
+                print(f"{path}: bloc final tronqué ignoré", file=sys.stderr)
+                return
+            yield from _BlockDecoder(payload).entries()
+
+
+class BinaryLogWriter(BatchedJSONLWriter):
+    """Écrivain binaire par lots : même file, même thread et mêmes politiques que le JSONL
+
+    Pas d'écho console par défaut : c'est la sérialisation JSON que ce format évite.
+    """
+
+    def __init__(self, path: str, stream: Optional[TextIO] = None, **options):
+        super().__init__(path, stream, **options)
+
+    def _write_batch(self, batch):
+        """Un bloc par lot, ajouté en un seul appel (sûr entre processus)"""
+        try:
+            block = encode_block(batch)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "ab") as output:
+                output.write(block)
+            if self.stream is not None:
+                self.stream.write("".join(json.dumps(entry, default=str) + "\n"
+                                          for entry in batch))
+                self.stream.flush()
+        except Exception as e:
+            print(f"Erreur écriture {self.path}: {e}", file=sys.stderr)
+
+
+def is_binary_log(path: str) -> bool:
+    return str(path).endswith(BINARY_SUFFIX)
+
+
+def output_path(path: str, log_format: str) -> str:
+    """Chemin de sortie d'un point d'entrée selon le format choisi"""
+    if log_format == "binary" and not is_binary_log(path):
+        return str(Path(path).with_suffix(BINARY_SUFFIX))
+    return path
+
+
+def add_format_arguments(parser: argparse.ArgumentParser):
+    """Option CLI du format des résultats"""
+    parser.add_argument("--log-format", choices=LOG_FORMATS, default="jsonl",
+                        help="Format du fichier de résultats (binary : .agbin compact, "
+                             "à convertir avec convert-logs.py)")
+
+
+def convert(paths: Sequence[str], output: TextIO) -> int:
+    """Écrire en JSONL les entrées de fichiers binaires ; retourne le nombre d'entrées"""
+    count = 0
+    for path in paths:
+        lines = []
+        for entry in iter_entries(path):
+            lines.append(json.dumps(entry, default=str) + "\n")
+            if len(lines) >= 4096:
+                output.write("".join(lines))
+                count += len(lines)
+                lines = []
+        output.write("".join(lines))
+        count += len(lines)
+    return count
+
+
+def main():
+    """Point d'entrée CLI de la conversion binaire -> JSONL"""
+    parser = argparse.ArgumentParser(description="Conversion des résultats binaires "
+                                                 "AccessGate PoC en JSONL (Grafana)")
+    parser.add_argument("paths", nargs="+", help="Fichiers .agbin")
+    parser.add_argument("-o", "--output",
+                        help="Fichier JSONL (défaut : même nom en .jsonl, '-' : sortie standard)")
+    parser.add_argument("--append", action="store_true",
+                        help="Ajouter au fichier de sortie au lieu de le remplacer")
+    args = parser.parse_args()
+
+    if args.output == "-":
+        count = convert(args.paths, sys.stdout)
+        print(f"{count} entrées converties", file=sys.stderr)
+        return 0
+
+    targets = ([(args.paths, args.output)] if args.output
+               else [([path], str(Path(path).with_suffix(".jsonl"))) for path in args.paths])
+    for sources, target in targets:
+        if os.path.dirname(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, "a" if args.append else "w", encoding="utf-8") as output:
+            count = convert(sources, output)
+        print(f"{', '.join(sources)} -> {target} : {count} entrées", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Ordonnanceur de tâches à dépendances (DAG) pour AccessGate PoC
+- Exécute en parallèle les étapes indépendantes
+- Saute les étapes dont une dépendance a échoué
+- Mesure chaque étape et calcule le chemin critique
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+class DAGStep:
+    """Étape du graphe et son résultat"""
+
+    def __init__(self, name: str, func: Callable, depends_on: Iterable[str] = ()):
+        self.name = name
+        self.func = func
+        self.depends_on = list(depends_on)
+        self.status = "pending"
+        self.result = None
+        self.error: Optional[str] = None
+        self.start: Optional[float] = None
+        self.end: Optional[float] = None
+
+    @property
+    def duration(self) -> float:
+        """Durée d'exécution (0 si non exécutée)"""
+        if self.start is None or self.end is None:
+            return 0.0
+        return self.end - self.start
+
+
+class DAGScheduler:
+    """Exécuteur parallèle d'étapes ordonnées par leurs dépendances"""
+
+    def __init__(self, logger, max_workers: int = 4):
+        self.logger = logger
+        self.max_workers = max_workers
+        self.steps: Dict[str, DAGStep] = {}
+
+    def add(self, name: str, func: Callable, depends_on: Iterable[str] = ()):
+        """Déclarer une étape"""
+        if name in self.steps:
+            raise ValueError(f"Étape déjà déclarée: {name}")
+        self.steps[name] = DAGStep(name, func, depends_on)
+
+    def _validate(self):
+        """Vérifier les dépendances et l'absence de cycle"""
+        for step in self.steps.values():
+            for dependency in step.depends_on:
+                if dependency not in self.steps:
+                    raise ValueError(f"Dépendance inconnue: {step.name} -> {dependency}")
+
+        visiting, visited = set(), set()
+
+        def visit(name: str):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Cycle de dépendances autour de {name}")
+            visiting.add(name)
+            for dependency in self.steps[name].depends_on:
+                visit(dependency)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.steps:
+            visit(name)
+
+    def run(self) -> bool:
+        """Exécuter le graphe ; True si toutes les étapes ont réussi"""
+        self._validate()
+        origin = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+            while True:
+                for step in self.steps.values():
+                    if step.status != "pending":
+                        continue
+                    statuses = [self.steps[name].status for name in step.depends_on]
+                    if any(status in ("failed", "skipped") for status in statuses):
+                        step.status = "skipped"
+                        self.logger.log_event("dag_step_skipped", f"Étape {step.name} ignorée",
+                                            step=step.name, status="warning")
+                    elif all(status == "success" for status in statuses):
+                        step.status = "running"
+                        step.start = time.perf_counter()
+                        running[executor.submit(step.func)] = step
+
+                if not running:
+                    # Une étape sautée peut débloquer d'autres sauts : reboucler si besoin
+                    if any(step.status == "pending" for step in self.steps.values()):
+                        continue
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    step.end = time.perf_counter()
+                    try:
+                        step.result = future.result()
+                        step.status = "success"
+                    except Exception as e:
+                        step.error = str(e)
+                        step.status = "failed"
+                    self.logger.log_event("dag_step_complete", f"Étape {step.name}: {step.status}",
+                                        step=step.name, step_status=step.status,
+                                        duration=step.duration,
+                                        offset=step.start - origin,
+                                        **({"error": step.error} if step.error else {}))
+
+        critical_path = self.critical_path()
+        self.logger.log_event("dag_complete", "Graphe exécuté",
+                            wall_time=time.perf_counter() - origin,
+                            critical_path=critical_path,
+                            steps={name: {"status": step.status, "duration": step.duration}
+                                   for name, step in self.steps.items()})
+        return all(step.status == "success" for step in self.steps.values())
+
+    def critical_path(self) -> List[str]:
+        """Chaîne de dépendances qui a déterminé la fin de l'exécution"""
+        finished = [step for step in self.steps.values() if step.end is not None]
+        if not finished:
+            return []
+        step = max(finished, key=lambda candidate: candidate.end)
+        path = [step.name]
+        while True:
+            dependencies = [self.steps[name] for name in step.depends_on
+                            if self.steps[name].end is not None]
+            if not dependencies:
+                break
+            step = max(dependencies, key=lambda candidate: candidate.end)
+            path.append(step.name)
+        return list(reversed(path))
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Seed massif de la base AccessGate PoC
+- Passe par le pod postgres existant (kubectl exec) ou par un port forwardé
+- Flux COPY par lots, en mémoire constante (100k+ utilisateurs)
+- Tables de staging + INSERT ... ON CONFLICT : rejouable sans doublons
+"""
+
+import argparse
+import csv
+import io
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, TextIO, Tuple
+
+from .jsonl_writer import BatchedJSONLWriter
+from .logger import StructuredLogger
+from .rbac_dataset import TABLE_COLUMNS, add_dataset_arguments, generator_from_args
+
+# Les permissions sont rattachées par nom : une permission réelle déjà présente
+# (ex. role.read créée par le seed backend) garde son id existant
+REMAPPED_INSERTS = {
+    "role_permissions": (
+        'INSERT INTO "role_permissions" ("roleId", "permissionId", "assignedAt") '
+        'SELECT s."roleId", p."id", s."assignedAt" FROM "seed_role_permissions" s '
+        'JOIN "seed_permissions" sp ON sp."id" = s."permissionId" '
+        'JOIN "permissions" p ON p."name" = sp."name" '
+        'ON CONFLICT DO NOTHING;\n'
+    ),
+}
+
+def _quote(identifier: str) -> str:
+    """Identifiant SQL entre guillemets (colonnes camelCase Prisma)"""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+class BulkSeeder:
+    """Chargement COPY en flux vers PostgreSQL via psql"""
+
+    def __init__(self, logger, namespace: str = "accessgate-poc",
+                 database: str = "accessgate", user: str = "accessgate",
+                 port: Optional[int] = None, host: str = "127.0.0.1",
+                 password: Optional[str] = None, batch_size: int = 5000):
+        self.logger = logger
+        self.namespace = namespace
+        self.database = database
+        self.user = user
+        self.port = port
+        self.host = host
+        self.password = password
+        self.batch_size = batch_size
+
+    def _postgres_pod(self) -> str:
+        """Nom du pod postgres existant"""
+        result = subprocess.run([
+            "kubectl", "get", "pods", "-n", self.namespace, "-l", "app=postgres",
+            "-o", "jsonpath={.items[0].metadata.name}"
+        ], capture_output=True, text=True, check=True)
+        if not result.stdout.strip():
+            raise RuntimeError("Aucun pod postgres trouvé")
+        return result.stdout.strip()
+
+    def psql_command(self, database: Optional[str] = None) -> List[str]:
+        """Commande psql : port forwardé si configuré, sinon kubectl exec"""
+        psql = ["psql", "-U", self.user, "-d", database or self.database,
+                "-v", "ON_ERROR_STOP=1", "-q"]
+        if self.port:
+            return psql + ["-h", self.host, "-p", str(self.port)]
+        return ["kubectl", "exec", "-i", "-n", self.namespace,
+                self._postgres_pod(), "--"] + psql
+
+    def _open(self, database: Optional[str] = None) -> subprocess.Popen:
+        """Démarrer psql avec un stdin en flux"""
+        env = dict(os.environ)
+        if self.password:
+            env["PGPASSWORD"] = self.password
+        return subprocess.Popen(self.psql_command(database), stdin=subprocess.PIPE,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                text=True, env=env)
+
+    def _finish(self, process: subprocess.Popen) -> None:
+        """Fermer le flux et remonter l'erreur psql éventuelle"""
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+        stderr = process.stderr.read()
+        if process.wait() != 0:
+            raise RuntimeError(f"psql a échoué (code {process.returncode}) : {stderr.strip()}")
+
+    def run_sql(self, sql: str, database: Optional[str] = None):
+        """Exécuter un script SQL dans le pod existant (sans pod jetable)"""
+        process = self._open(database)
+        try:
+            process.stdin.write(sql)
+        except BrokenPipeError:
+            pass
+        self._finish(process)
+
+    def query(self, sql: str, database: Optional[str] = None) -> str:
+        """Exécuter un script SQL et retourner sa sortie brute (psql -t -A)"""
+        env = dict(os.environ)
+        if self.password:
+            env["PGPASSWORD"] = self.password
+        result = subprocess.run(self.psql_command(database) + ["-t", "-A"], input=sql,
+                                capture_output=True, text=True, env=env)
+        if result.returncode != 0:
+            raise RuntimeError(f"psql a échoué (code {result.returncode}) : "
+                               f"{result.stderr.strip()}")
+        return result.stdout
+
+    def write_script(self, stream: TextIO, dataset: Dict[str, Iterable[Tuple]]) -> Dict[str, int]:
+        """Écrire le script psql (transaction + COPY) d'un jeu de données"""
+        counts: Dict[str, int] = {}
+        stream.write("SET synchronous_commit = off;\nBEGIN;\n")
+        for table in TABLE_COLUMNS:
+            if table in dataset:
+                counts[table] = self._copy_table(stream, table, dataset[table],
+                                                 remap="permissions" in counts)
+        stream.write("COMMIT;\n")
+        return counts
+
+    def seed(self, dataset: Dict[str, Iterable[Tuple]]) -> Dict[str, int]:
+        """Charger les tables du jeu de données ; retourne le nombre de lignes par table"""
+        start_time = time.perf_counter()
+        counts: Dict[str, int] = {}
+        process = self._open()
+
+        self.logger.log_event("db_seed_start", "Démarrage seed massif",
+                            tables=list(dataset), batch_size=self.batch_size)
+        try:
+            counts = self.write_script(process.stdin, dataset)
+        except BrokenPipeError:
+            # psql s'est arrêté (ON_ERROR_STOP) : l'erreur est lue par _finish
+            pass
+        self._finish(process)
+
+        duration = time.perf_counter() - start_time
+        total_rows = sum(counts.values())
+        self.logger.log_event("db_seed_complete", "Seed massif terminé",
+                            rows=counts, duration=duration,
+                            rows_per_second=total_rows / duration if duration > 0 else 0)
+        self.logger.log_metric("db_seed_rows_per_second",
+                             total_rows / duration if duration > 0 else 0)
+        return counts
+
+    def _copy_table(self, stream: TextIO, table: str, rows: Iterable[Tuple],
+                    remap: bool = False) -> int:
+        """Envoyer une table via COPY dans une table de staging, par lots"""
+        columns = ", ".join(_quote(column) for column in TABLE_COLUMNS[table])
+        staging = _quote(f"seed_{table}")
+        stream.write(f"CREATE TEMP TABLE {staging} (LIKE {_quote(table)} INCLUDING DEFAULTS) "
+                     f"ON COMMIT DROP;\n"
+                     f"COPY {staging} ({columns}) FROM STDIN WITH (FORMAT csv);\n")
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        count = 0
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+            if count % self.batch_size == 0:
+                stream.write(buffer.getvalue())
+                buffer.seek(0)
+                buffer.truncate()
+        stream.write(buffer.getvalue())
+
+        stream.write("\\.\n")
+        if remap and table in REMAPPED_INSERTS:
+            stream.write(REMAPPED_INSERTS[table])
+        else:
+            stream.write(f"INSERT INTO {_quote(table)} ({columns}) SELECT {columns} FROM {staging} "
+                         f"ON CONFLICT DO NOTHING;\n")
+        self.logger.log_event("db_seed_table", f"Table {table} envoyée", table=table, rows=count)
+        return count
+
+
+def main():
+    """Point d'entrée CLI du seed massif"""
+    parser = argparse.ArgumentParser(description="Seed massif de la base AccessGate PoC")
+    add_dataset_arguments(parser)
+    parser.add_argument("--namespace", default="accessgate-poc")
+    parser.add_argument("--database", default="accessgate")
+    parser.add_argument("--port", type=int, help="Port local forwardé (sinon kubectl exec)")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--output", help="Écrire le script COPY dans un fichier (- : stdout) "
+                                         "au lieu de l'exécuter")
+    args = parser.parse_args()
+
+    generator = generator_from_args(args)
+    logger = StructuredLogger("db_seed", BatchedJSONLWriter(
+        "logs/db-seed-results.jsonl", stream=None if args.output == "-" else sys.stdout))
+    seeder = BulkSeeder(logger, namespace=args.namespace, database=args.database,
+                        port=args.port, password=os.environ.get("PGPASSWORD"),
+                        batch_size=args.batch_size)
+
+    if args.output:
+        if args.output == "-":
+            seeder.write_script(sys.stdout, generator.tables())
+        else:
+            with open(args.output, "w", encoding="utf-8") as output:
+                seeder.write_script(output, generator.tables())
+        return 0
+
+    logger.log_event("db_seed_dataset", "Jeu RBAC généré", **generator.describe())
+    try:
+        seeder.seed(generator.tables())
+    except (RuntimeError, subprocess.CalledProcessError, FileNotFoundError) as e:
+        logger.log_event("db_seed_error", "Erreur seed massif", error=str(e), status="error")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
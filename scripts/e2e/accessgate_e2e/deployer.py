@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Déploiement Kubernetes complet d'AccessGate PoC
+- Graphe de dépendances : les composants indépendants se déploient en parallèle
+- Initialisation de la base dans le pod postgres existant
+"""
+
+import subprocess
+import time
+
+from .dag import DAGScheduler
+from .db_seed import BulkSeeder
+from .logger import StructuredLogger
+
+
+class KubernetesDeployer:
+    """Déployeur Kubernetes complet"""
+    
+    def __init__(self, namespace: str = "accessgate-poc"):
+        self.logger = StructuredLogger("k8s_deployer")
+        self.namespace = namespace
+    
+    def deploy_all_components(self) -> bool:
+        """Déployer tous les composants"""
+        self.logger.log_event("deployment_start", "Démarrage déploiement complet")
+        start_time = time.time()
+        
+        try:
+            # Graphe de déploiement : les étapes indépendantes s'exécutent en parallèle
+            # (le frontend et les services n'attendent pas l'initialisation de la DB)
+            dag = DAGScheduler(self.logger, max_workers=4)
+            dag.add("namespace", self._create_namespace)
+            dag.add("postgres", self._deploy_postgres, depends_on=["namespace"])
+            dag.add("postgres_ready", self._wait_for_postgres, depends_on=["postgres"])
+            dag.add("database_init", self._init_database, depends_on=["postgres_ready"])
+            dag.add("backend", self._deploy_backend, depends_on=["database_init"])
+            dag.add("frontend", self._deploy_frontend, depends_on=["namespace"])
+            dag.add("services", self._deploy_services, depends_on=["namespace"])
+            dag.add("verify", self._verify_deployment,
+                    depends_on=["backend", "frontend", "services"])
+            
+            success = dag.run() and dag.steps["verify"].result
+            
+            duration = time.time() - start_time
+            self.logger.log_event("deployment_complete", "Déploiement terminé",
+                                success=success, duration=duration,
+                                critical_path=dag.critical_path(),
+                                step_durations={name: step.duration
+                                                for name, step in dag.steps.items()})
+            
+            return success
+            
+        except Exception as e:
+            self.logger.log_event("deployment_error", "Erreur déploiement", 
+                                error=str(e), status="error")
+            return False
+    
+    def _create_namespace(self):
+        """Créer le namespace"""
+        self.logger.log_event("namespace_create", "Création namespace")
+        try:
+            subprocess.run([
+                "kubectl", "create", "namespace", self.namespace, 
+                "--dry-run=client", "-o", "yaml"
+            ], check=True, capture_output=True)
+            subprocess.run([
+                "kubectl", "apply", "-f", "-"
+            ], input=subprocess.run([
+                "kubectl", "create", "namespace", self.namespace, 
+                "--dry-run=client", "-o", "yaml"
+            ], capture_output=True, check=True).stdout, check=True)
+            self.logger.log_event("namespace_created", "Namespace créé")
+        except subprocess.CalledProcessError:
+            self.logger.log_event("namespace_exists", "Namespace existe déjà")
+    
+    def _deploy_postgres(self):
+        """Déployer PostgreSQL"""
+        self.logger.log_event("postgres_deploy", "Déploiement PostgreSQL")
+        try:
+            subprocess.run([
+                "kubectl", "apply", "-f", "k8s/postgres.yaml", "-n", self.namespace
+            ], check=True)
+            self.logger.log_event("postgres_deployed", "PostgreSQL déployé")
+        except subprocess.CalledProcessError as e:
+            self.logger.log_event("postgres_error", "Erreur déploiement PostgreSQL", 
+                                error=str(e))
+            raise
+    
+    def _wait_for_postgres(self):
+        """Attendre que PostgreSQL soit prêt"""
+        self.logger.log_event("postgres_wait", "Attente PostgreSQL")
+        try:
+            subprocess.run([
+                "kubectl", "wait", "--for=condition=ready", 
+                "pod", "-l", "app=postgres", "-n", self.namespace, 
+                "--timeout=300s"
+            ], check=True)
+            self.logger.log_event("postgres_ready", "PostgreSQL prêt")
+        except subprocess.CalledProcessError as e:
+            self.logger.log_event("postgres_timeout", "Timeout PostgreSQL", 
+                                error=str(e))
+            raise
+    
+    def _init_database(self):
+        """Initialiser la base de données"""
+        self.logger.log_event("db_init", "Initialisation base de données")
+        try:
+            # Créer les tables et insérer les données
+            init_sql = """
+            CREATE TABLE IF NOT EXISTS users (
+                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+                email VARCHAR(255) UNIQUE NOT NULL,
+                password VARCHAR(255) NOT NULL,
+                first_name VARCHAR(100) NOT NULL,
+                last_name VARCHAR(100) NOT NULL,
+                is_active BOOLEAN DEFAULT true,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            
+            CREATE TABLE IF NOT EXISTS roles (
+                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+                name VARCHAR(100) UNIQUE NOT NULL,
+                description TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            
+            CREATE TABLE IF NOT EXISTS permissions (
+                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+                name VARCHAR(100) UNIQUE NOT NULL,
+                resource VARCHAR(100) NOT NULL,
+                description TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            
+            CREATE TABLE IF NOT EXISTS user_roles (
+                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+                user_id UUID REFERENCES users(id) ON DELETE CASCADE,
+                role_id UUID REFERENCES roles(id) ON DELETE CASCADE,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(user_id, role_id)
+            );
+            
+            CREATE TABLE IF NOT EXISTS role_permissions (
+                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+                role_id UUID REFERENCES roles(id) ON DELETE CASCADE,
+                permission_id UUID REFERENCES permissions(id) ON DELETE CASCADE,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(role_id, permission_id)
+            );
+            
+            -- Insérer des données de test
+            INSERT INTO roles (name, description) VALUES 
+                ('Admin', 'Administrateur système'),
+                ('Manager', 'Gestionnaire d''équipe'),
+                ('User', 'Utilisateur standard')
+            ON CONFLICT (name) DO NOTHING;
+            
+            INSERT INTO permissions (name, resource, description) VALUES 
+                ('user.read', 'users', 'Lire les utilisateurs'),
+                ('user.write', 'users', 'Modifier les utilisateurs'),
+                ('role.read', 'roles', 'Lire les rôles'),
+                ('role.write', 'roles', 'Modifier les rôles'),
+                ('permission.read', 'permissions', 'Lire les permissions'),
+                ('permission.write', 'permissions', 'Modifier les permissions')
+            ON CONFLICT (name) DO NOTHING;
+            
+            -- Assigner des permissions aux rôles
+            INSERT INTO role_permissions (role_id, permission_id)
+            SELECT r.id, p.id FROM roles r, permissions p
+            WHERE r.name = 'Admin'
+            ON CONFLICT DO NOTHING;
+            
+            INSERT INTO role_permissions (role_id, permission_id)
+            SELECT r.id, p.id FROM roles r, permissions p
+            WHERE r.name = 'Manager' AND p.name IN ('user.read', 'role.read')
+            ON CONFLICT DO NOTHING;
+            
+            INSERT INTO role_permissions (role_id, permission_id)
+            SELECT r.id, p.id FROM roles r, permissions p
+            WHERE r.name = 'User' AND p.name IN ('user.read')
+            ON CONFLICT DO NOTHING;
+            """
+            
+            # Exécution dans le pod postgres existant (pas de pod jetable à planifier)
+            seeder = BulkSeeder(self.logger, namespace=self.namespace)
+            seeder.run_sql(init_sql, database="accessgate_poc")
+            
+            self.logger.log_event("db_initialized", "Base de données initialisée")
+        except (subprocess.CalledProcessError, RuntimeError) as e:
+            self.logger.log_event("db_init_error", "Erreur initialisation DB", 
+                                error=str(e))
+            # Ne pas échouer si la DB existe déjà
+            self.logger.log_event("db_init_skip", "Initialisation DB ignorée")
+    
+    def _deploy_backend(self):
+        """Déployer le backend"""
+        self.logger.log_event("backend_deploy", "Déploiement Backend")
+        try:
+            subprocess.run([
+                "kubectl", "apply", "-f", "k8s/backend.yaml", "-n", self.namespace
+            ], check=True)
+            self.logger.log_event("backend_deployed", "Backend déployé")
+        except subprocess.CalledProcessError as e:
+            self.logger.log_event("backend_error", "Erreur déploiement Backend", 
+                                error=str(e))
+            raise
+    
+    def _deploy_frontend(self):
+        """Déployer le frontend"""
+        self.logger.log_event("frontend_deploy", "Déploiement Frontend")
+        try:
+            subprocess.run([
+                "kubectl", "apply", "-f", "k8s/frontend.yaml", "-n", self.namespace
+            ], check=True)
+            self.logger.log_event("frontend_deployed", "Frontend déployé")
+        except subprocess.CalledProcessError as e:
+            self.logger.log_event("frontend_error", "Erreur déploiement Frontend", 
+                                error=str(e))
+            raise
+    
+    def _deploy_services(self):
+        """Déployer les services"""
+        self.logger.log_event("services_deploy", "Déploiement Services")
+        try:
+            subprocess.run([
+                "kubectl", "apply", "-f", "k8s/services.yaml", "-n", self.namespace
+            ], check=True)
+            self.logger.log_event("services_deployed", "Services déployés")
+        except subprocess.CalledProcessError as e:
+            self.logger.log_event("services_error", "Erreur déploiement Services", 
+                                error=str(e))
+            raise
+    
+    def _verify_deployment(self) -> bool:
+        """Vérifier le déploiement"""
+        self.logger.log_event("deployment_verify", "Vérification déploiement")
+        try:
+            # Attendre que tous les pods soient prêts
+            subprocess.run([
+                "kubectl", "wait", "--for=condition=ready", 
+                "pod", "-l", "app=accessgate-backend", "-n", self.namespace, 
+                "--timeout=300s"
+            ], check=True)
+            
+            subprocess.run([
+                "kubectl", "wait", "--for=condition=ready", 
+                "pod", "-l", "app=accessgate-frontend", "-n", self.namespace, 
+                "--timeout=300s"
+            ], check=True)
+            
+            self.logger.log_event("deployment_verified", "Déploiement vérifié")
+            return True
+        except subprocess.CalledProcessError as e:
+            self.logger.log_event("deployment_verify_error", "Erreur vérification", 
+                                error=str(e))
+            return False
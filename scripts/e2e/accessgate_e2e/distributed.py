@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Tir en modèle ouvert réparti sur plusieurs machines (coordinateur / agents)
+- Les agents se connectent au coordinateur en TCP (une ligne JSON par message)
+- Écoute sur la boucle locale par défaut ; hors boucle locale, jeton partagé obligatoire
+  (le canal n'est pas chiffré : comptes et jeton circulent en clair)
+- Le coordinateur envoie le scénario et la part de débit, puis le départ commun
+- Les agents remontent leurs fenêtres en histogrammes bruts, fusionnés par le coordinateur
+"""
+
+import argparse
+import asyncio
+import hmac
+import ipaddress
+import json
+import os
+import socket
+import sys
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from .load_profiles import (ArrivalProfile, OpenModelLoadTester, RouteStats, ScaledProfile,
+                            profile_from_description)
+from .logger import StructuredLogger
+from .workers import MERGED_EVENTS, RELAYED_METRICS, IntervalMerger, snapshot_window
+
+DEFAULT_PORT = 7700
+DEFAULT_LISTEN = f"127.0.0.1:{DEFAULT_PORT}"
+
+# Jeton partagé coordinateur / agents (sinon --agent-token)
+AGENT_TOKEN_ENV = "ACCESSGATE_AGENT_TOKEN"
+
+# Taille maximale d'une ligne du protocole (fenêtres avec de nombreux buckets)
+LINE_LIMIT = 16 * 1024 * 1024
+
+
+def send_message(writer: asyncio.StreamWriter, message_type: str, **payload):
+    """Envoyer un message (ligne JSON) sans attendre le vidage du tampon"""
+    writer.write(json.dumps({"type": message_type, **payload}).encode() + b"\n")
+
+
+async def receive_message(reader: asyncio.StreamReader) -> Dict:
+    """Lire le prochain message ; ConnectionError si le pair a fermé"""
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("connexion fermée par le pair")
+    return json.loads(line)
+
+
+def parse_address(value: str, default_host: str = "127.0.0.1") -> Tuple[str, int]:
+    """Adresse CLI "hôte:port" (":port" ou "port" seuls acceptés)"""
+    host, _, port = value.rpartition(":")
+    return host or default_host, int(port or DEFAULT_PORT)
+
+
+def is_loopback(host: str) -> bool:
+    """Adresse d'écoute limitée à la machine locale"""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class _StreamLogWriter:
+    """Écrivain JSONL d'un agent : relaie les entrées au coordinateur
+
+    L'écriture est synchrone (logger) : le tampon de la socket est vidé à chaque fenêtre
+    close par l'agent (on_interval), il reste donc borné au volume d'une fenêtre.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter, agent: str):
+        self.stream = writer
+        self.agent = agent
+
+    def write(self, entry: Dict):
+        if (entry.get("event_type") not in MERGED_EVENTS
+                or entry.get("metric_name") in RELAYED_METRICS):
+            send_message(self.stream, "log", entry={**entry, "agent": self.agent})
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class LoadCoordinator:
+    """Coordinateur : attend les agents, distribue le scénario et fusionne les fenêtres"""
+
+    def __init__(self, logger, agents: int, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                 join_timeout: float = 300, token: Optional[str] = None, **tester_options):
+        if not token and not is_loopback(host):
+            # Les agents reçoivent les identifiants des comptes du pool
+            raise ValueError(f"Écoute sur {host} sans jeton partagé ({AGENT_TOKEN_ENV})")
+        self.logger = logger
+        self.agents = agents
+        self.host = host
+        self.port = port
+        self.token = token
+        self.join_timeout = join_timeout
+        self.tester_options = tester_options
+        # Instance locale réutilisée pour les rapports fusionnés et la saturation
+        self.reporter = OpenModelLoadTester(logger, **tester_options)
+        self.agent_names: List[str] = []
+        self.connections: Dict[int, asyncio.StreamWriter] = {}
+        self.ready: Set[int] = set()
+        self.started = False
+        self.merger: Optional[IntervalMerger] = None
+
+    async def run(self, profile: ArrivalProfile, route_mix: Optional[Dict[str, float]] = None,
+                  accounts: Sequence[Tuple[str, str]] = (), poisson: bool = False,
+                  seed: int = 42) -> Dict:
+        """Piloter le tir sur tous les agents et retourner le résumé fusionné"""
+        self.merger = IntervalMerger(self.reporter, profile, self.agents)
+        joined = asyncio.Event()
+        finished = asyncio.Event()
+        scenario = {
+            "agents": self.agents,
+            "profile": profile.describe(),
+            "routes": route_mix,
+            "poisson": poisson,
+            "seed": seed,
+            "options": self.tester_options,
+        }
+
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+            try:
+                await self._handle_agent(reader, writer, scenario, accounts, joined)
+            finally:
+                if self.merger.complete:
+                    finished.set()
+
+        server = await asyncio.start_server(handle, self.host, self.port, limit=LINE_LIMIT)
+        self.logger.log_event("load_coordinator_listen", "Coordinateur en attente des agents",
+                            host=self.host, port=self.port, agents=self.agents)
+        try:
+            try:
+                await asyncio.wait_for(joined.wait(), self.join_timeout)
+            except asyncio.TimeoutError:
+                self.logger.log_event("load_coordinator_error", "Agents manquants",
+                                    expected=self.agents, joined=len(self.agent_names),
+                                    status="error")
+                return {}
+
+            self.logger.log_event("load_profile_start", "Démarrage tir distribué",
+                                profile=profile.describe(), routes=route_mix,
+                                poisson=poisson, agents=self.agent_names)
+            await finished.wait()
+        finally:
+            server.close()
+            for writer in self.connections.values():
+                writer.close()
+            await server.wait_closed()
+
+        return self.merger.summary()
+
+    async def _handle_agent(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                            scenario: Dict, accounts: Sequence[Tuple[str, str]],
+                            joined: asyncio.Event):
+        """Dialogue avec un agent, de l'inscription au résultat final"""
+        try:
+            hello = await receive_message(reader)
+        except (ConnectionError, ValueError):
+            writer.close()
+            return
+        if self.token and not hmac.compare_digest(str(hello.get("token") or ""), self.token):
+            self.logger.log_event("load_agent_rejected", "Agent refusé : jeton invalide",
+                                agent=hello.get("agent"),
+                                peer=str(writer.get_extra_info("peername")), status="warning")
+            send_message(writer, "error", error="jeton invalide")
+            writer.close()
+            return
+        if len(self.agent_names) >= self.agents:
+            send_message(writer, "error", error="coordinateur complet")
+            writer.close()
+            return
+
+        index = len(self.agent_names)
+        self.agent_names.append(hello.get("agent") or f"agent-{index}")
+        self.connections[index] = writer
+        self.logger.log_event("load_agent_joined", "Agent connecté",
+                            agent=self.agent_names[index], index=index)
+        if len(self.agent_names) == self.agents:
+            joined.set()
+        await joined.wait()
+
+        # Comptes répartis : chaque login compte pour authRateLimiter
+        agent_accounts = list(accounts[index::self.agents]) or list(accounts)
+        send_message(writer, "scenario", index=index, accounts=agent_accounts, **scenario)
+
+        try:
+            while True:
+                message = await receive_message(reader)
+                kind = message["type"]
+                if kind == "log":
+                    self.logger.writer.write(message["entry"])
+                elif kind == "ready":
+                    self.ready.add(index)
+                    self._start_when_ready()
+                elif kind == "interval":
+                    self.merger.add_interval(index, message["index"], message["start"],
+                                             message["end"], message["routes"])
+                elif kind == "done":
+                    self.merger.add_totals(index, message["totals"], message["duration"],
+                                           message["max_lag"])
+                    return
+                elif kind == "error":
+                    raise RuntimeError(message["error"])
+        except (ConnectionError, RuntimeError, ValueError) as e:
+            self.logger.log_event("load_agent_error", "Échec d'un agent",
+                                agent=self.agent_names[index], error=str(e), status="error")
+            self.merger.fail(index)
+            self._start_when_ready()
+
+    def _start_when_ready(self):
+        """Départ commun dès que chaque agent restant a obtenu ses tokens"""
+        if self.started or len(self.ready | self.merger.failed) < self.agents:
+            return
+        self.started = True
+        for index, writer in self.connections.items():
+            if index not in self.merger.failed:
+                send_message(writer, "start")
+        self.logger.log_event("load_agents_started", "Départ commun envoyé",
+                            agents=len(self.ready))
+
+
+class LoadAgent:
+    """Agent : exécute sa part du scénario et remonte ses fenêtres au coordinateur"""
+
+    def __init__(self, logger, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                 name: Optional[str] = None, base_url: Optional[str] = None,
+                 token: Optional[str] = None):
+        self.logger = logger
+        self.host = host
+        self.port = port
+        self.name = name or socket.gethostname()
+        self.token = token
+        # URL cible propre à l'agent (sinon celle du coordinateur)
+        self.base_url = base_url
+
+    async def run(self) -> bool:
+        """Se connecter, exécuter le scénario reçu et envoyer les totaux"""
+        try:
+            reader, writer = await asyncio.open_connection(self.host, self.port, limit=LINE_LIMIT)
+        except OSError as e:
+            self.logger.log_event("load_agent_error", "Coordinateur injoignable",
+                                host=self.host, port=self.port, error=str(e), status="error")
+            return False
+
+        try:
+            send_message(writer, "hello", agent=self.name, token=self.token)
+            scenario = await receive_message(reader)
+            if scenario["type"] != "scenario":
+                raise ConnectionError(scenario.get("error", "scénario attendu"))
+            self.logger.log_event("load_agent_scenario", "Scénario reçu", agent=self.name,
+                                index=scenario["index"], agents=scenario["agents"],
+                                profile=scenario["profile"])
+            summary, totals = await self._run_scenario(reader, writer, scenario)
+            if summary:
+                send_message(writer, "done", totals=totals, duration=summary["duration"],
+                             max_lag=summary["max_schedule_lag"])
+            else:
+                send_message(writer, "error", error="tir interrompu (voir les logs de l'agent)")
+            await writer.drain()
+            return bool(summary)
+        except (ConnectionError, ValueError) as e:
+            self.logger.log_event("load_agent_error", "Échec du dialogue avec le coordinateur",
+                                agent=self.name, error=str(e), status="error")
+            return False
+        finally:
+            writer.close()
+
+    async def _run_scenario(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                            scenario: Dict) -> Tuple[Dict, Dict]:
+        """Exécuter la part de débit de l'agent"""
+        index, agents = scenario["index"], scenario["agents"]
+        options = dict(scenario["options"])
+        if self.base_url:
+            options["base_url"] = self.base_url
+        # Emails inscrits : préfixe du tir transmis par le coordinateur, compteur propre à l'agent
+        options["identity_worker"] = f"a{index}"
+        tester = OpenModelLoadTester(StructuredLogger("load_agent",
+                                                      _StreamLogWriter(writer, self.name)),
+                                     **options)
+
+        async def on_ready():
+            send_message(writer, "ready")
+            await writer.drain()
+            message = await receive_message(reader)
+            if message["type"] != "start":
+                raise ConnectionError(message.get("error", "départ attendu"))
+
+        async def on_interval(interval: int, start: float, end: float,
+                              window: Dict[str, RouteStats]):
+            send_message(writer, "interval", index=interval, start=start, end=end,
+                         routes=snapshot_window(window))
+            # Coordinateur lent : le tir attend plutôt que d'accumuler fenêtres et logs
+            await writer.drain()
+
+        profile = ScaledProfile(profile_from_description(scenario["profile"]), 1.0 / agents)
+        accounts = [tuple(account) for account in scenario["accounts"]]
+        summary = await tester.run(profile, scenario["routes"], accounts,
+                                   poisson=scenario["poisson"], seed=scenario["seed"] + index,
+                                   phase=index / agents, on_ready=on_ready,
+                                   on_interval=on_interval)
+        return summary, snapshot_window(tester.totals)
+
+
+def add_token_argument(parser: argparse.ArgumentParser):
+    """Option CLI du jeton partagé coordinateur / agents"""
+    parser.add_argument("--agent-token", default=os.environ.get(AGENT_TOKEN_ENV),
+                        help=f"Jeton partagé coordinateur / agents (défaut : ${AGENT_TOKEN_ENV} ; "
+                             "obligatoire si le coordinateur écoute hors boucle locale)")
+
+
+def main():
+    """Point d'entrée CLI d'un agent"""
+    from .binary_log import add_format_arguments, output_path
+    from .logger import configure_output
+
+    parser = argparse.ArgumentParser(description="Agent de tir distribué AccessGate PoC")
+    parser.add_argument("--coordinator", default=f"127.0.0.1:{DEFAULT_PORT}",
+                        help="Adresse du coordinateur (hôte:port)")
+    parser.add_argument("--name", help="Nom de l'agent (défaut : nom d'hôte)")
+    parser.add_argument("--base-url", help="URL cible vue depuis cet agent")
+    add_token_argument(parser)
+    parser.add_argument("--output", default="logs/load-agent-results.jsonl",
+                        help="Logs locaux de l'agent")
+    add_format_arguments(parser)
+    args = parser.parse_args()
+
+    configure_output(output_path(args.output, args.log_format))
+    host, port = parse_address(args.coordinator)
+    agent = LoadAgent(StructuredLogger("load_agent"), host, port, args.name, args.base_url,
+                      args.agent_token)
+    return 0 if asyncio.run(agent.run()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Identités uniques pour les inscriptions AccessGate PoC
+- Préfixe propre à chaque tir ("e2e-3f9a1c07") : aucune collision entre tirs successifs
+- Compteur par worker ("e2e-3f9a1c07-2-15@accessgate.com") : aucune collision entre
+  processus ou agents, sans verrou ni état partagé
+- Nettoyage groupé des comptes créés (DELETE par motif d'email) pour rejouer
+  /api/auth/register à l'identique
+"""
+
+import argparse
+import os
+import re
+import secrets
+import subprocess
+import sys
+import time
+from typing import Dict, Optional, Tuple
+
+from .rbac_dataset import SEED_PASSWORD
+
+DEFAULT_NAMESPACE = "e2e"
+DEFAULT_DOMAIN = "accessgate.com"
+
+# Espace de noms et identifiant de worker : ni "_" ni "%" (motifs SQL), email valide
+_NAME = re.compile(r"^[a-z0-9]+(-[a-z0-9]+)*$")
+_WORKER = re.compile(r"^[a-z0-9]+$")
+RUN_ID_LENGTH = 8
+
+
+def new_run_id() -> str:
+    """Identifiant court d'un tir (8 caractères hexadécimaux)"""
+    return secrets.token_hex(RUN_ID_LENGTH // 2)
+
+
+def run_prefix(namespace: str = DEFAULT_NAMESPACE, run_id: Optional[str] = None) -> str:
+    """Préfixe d'un tir : espace de noms + identifiant ("e2e-3f9a1c07")"""
+    if not _NAME.match(namespace):
+        raise ValueError(f"Espace de noms invalide: {namespace!r} (a-z, 0-9, '-')")
+    return f"{namespace}-{run_id or new_run_id()}"
+
+
+def identity_pattern(prefix: str, domain: str = DEFAULT_DOMAIN, all_runs: bool = False) -> str:
+    """Expression régulière PostgreSQL des emails alloués sous un préfixe
+
+    all_runs : prefix est un espace de noms, tous ses tirs sont visés. Le motif exige
+    la forme complète (tir, worker, compteur) : les comptes seedés ("bench-12@...")
+    ou de test fixes ne sont jamais concernés.
+    """
+    if not _NAME.match(prefix):
+        raise ValueError(f"Préfixe invalide: {prefix!r}")
+    run = f"-[0-9a-f]{{{RUN_ID_LENGTH}}}" if all_runs else ""
+    return f"^{prefix}{run}-[a-z0-9]+-[0-9]+@{re.escape(domain)}$"
+
+
+def cleanup_sql(pattern: str) -> str:
+    """Suppression groupée des comptes correspondant au motif, dans une transaction
+
+    Les rattachements user_roles sont supprimés d'abord : assignedBy n'est pas en
+    cascade. Le script affiche le nombre d'utilisateurs supprimés.
+    """
+    literal = pattern.replace("'", "''")
+    return (
+        "BEGIN;\n"
+        f"CREATE TEMP TABLE cleanup_ids ON COMMIT DROP AS "
+        f"SELECT \"id\" FROM \"users\" WHERE \"email\" ~ '{literal}';\n"
+        'DELETE FROM "user_roles" WHERE "userId" IN (SELECT "id" FROM cleanup_ids) '
+        'OR "assignedBy" IN (SELECT "id" FROM cleanup_ids);\n'
+        'WITH deleted AS (DELETE FROM "users" WHERE "id" IN (SELECT "id" FROM cleanup_ids) '
+        "RETURNING 1) SELECT count(*) FROM deleted;\n"
+        "COMMIT;\n"
+    )
+
+
+class IdentityAllocator:
+    """Allocation d'emails uniques : préfixe du tir, identifiant du worker, compteur local
+
+    Un allocateur par worker (processus, agent ou boucle asyncio) : le compteur n'est
+    pas partagé, l'unicité vient de l'identifiant du worker.
+    """
+
+    def __init__(self, prefix: Optional[str] = None, worker: str = "0",
+                 domain: str = DEFAULT_DOMAIN, password: str = SEED_PASSWORD):
+        self.prefix = prefix or run_prefix()
+        if not _NAME.match(self.prefix):
+            raise ValueError(f"Préfixe invalide: {self.prefix!r}")
+        worker = str(worker)
+        if not _WORKER.match(worker):
+            raise ValueError(f"Identifiant de worker invalide: {worker!r} (a-z, 0-9)")
+        self.worker = worker
+        self.domain = domain
+        self.password = password
+        self.allocated = 0
+
+    def for_worker(self, worker) -> "IdentityAllocator":
+        """Allocateur d'un autre worker du même tir"""
+        return IdentityAllocator(self.prefix, str(worker), self.domain, self.password)
+
+    def email(self) -> str:
+        """Prochain email unique du worker"""
+        index = self.allocated
+        self.allocated += 1
+        return f"{self.prefix}-{self.worker}-{index}@{self.domain}"
+
+    def account(self, first_name: str = "Load", last_name: str = "User",
+                password: Optional[str] = None) -> Tuple[str, str, str, str]:
+        """Compte complet (email, mot de passe, prénom, nom) pour E2ETestRunner"""
+        return self.email(), password or self.password, first_name, last_name
+
+    def registration(self) -> Dict[str, str]:
+        """Corps de POST /api/auth/register avec un email neuf"""
+        email = self.email()
+        return {"email": email, "password": self.password, "firstName": "Load",
+                "lastName": email.split("@")[0]}
+
+    def pattern(self) -> str:
+        """Motif des emails de tout le tir (tous workers confondus)"""
+        return identity_pattern(self.prefix, self.domain)
+
+    def describe(self) -> Dict:
+        return {"prefix": self.prefix, "worker": self.worker, "allocated": self.allocated}
+
+
+def delete_identities(logger, pattern: str, seeder=None, stand_in=None) -> Optional[int]:
+    """Supprimer les comptes alloués (base via BulkSeeder, ou backend de substitution)
+
+    Retourne le nombre de comptes supprimés, None en cas d'échec (journalisé).
+    """
+    start_time = time.perf_counter()
+    try:
+        if stand_in is not None:
+            deleted = stand_in.delete_users(pattern)
+        else:
+            output = seeder.query(cleanup_sql(pattern))
+            deleted = int(output.split()[-1]) if output.split() else 0
+    except (RuntimeError, ValueError, subprocess.CalledProcessError, FileNotFoundError) as e:
+        logger.log_event("identity_cleanup", "Erreur nettoyage des comptes", pattern=pattern,
+                         error=str(e), status="error")
+        return None
+    logger.log_event("identity_cleanup", "Comptes alloués supprimés", pattern=pattern,
+                     deleted=deleted, duration=time.perf_counter() - start_time,
+                     status="success")
+    return deleted
+
+
+def add_identity_arguments(parser: argparse.ArgumentParser, database: bool = True):
+    """Options CLI de l'allocation et du nettoyage des comptes
+
+    database=False si le point d'entrée déclare déjà --database / --db-port.
+    """
+    parser.add_argument("--identity-prefix", default=DEFAULT_NAMESPACE,
+                        help="Espace de noms des comptes inscrits (préfixe unique par tir)")
+    parser.add_argument("--cleanup-users", action="store_true",
+                        help="Supprimer en fin de tir les comptes inscrits pendant le tir")
+    if database:
+        parser.add_argument("--database", default="accessgate")
+        parser.add_argument("--db-port", type=int,
+                            help="Port PostgreSQL forwardé pour le nettoyage (sinon kubectl exec)")
+
+
+def cleanup_from_args(args: argparse.Namespace, logger, pattern: str,
+                      stand_in=None) -> Optional[int]:
+    """Nettoyage décrit par les options CLI (None si --cleanup-users absent ou échec)"""
+    if not args.cleanup_users:
+        return None
+    if stand_in is not None:
+        return delete_identities(logger, pattern, stand_in=stand_in)
+    from .db_seed import BulkSeeder
+
+    seeder = BulkSeeder(logger, namespace=getattr(args, "namespace", "accessgate-poc"),
+                        database=args.database, port=args.db_port,
+                        password=os.environ.get("PGPASSWORD"))
+    return delete_identities(logger, pattern, seeder=seeder)
+
+
+def main():
+    """Point d'entrée CLI : supprimer les comptes d'un tir (ou de tous les tirs d'un préfixe)"""
+    from .db_seed import BulkSeeder
+    from .logger import StructuredLogger, configure_output
+
+    parser = argparse.ArgumentParser(description="Nettoyage des comptes inscrits "
+                                                 "par les tirs AccessGate PoC")
+    parser.add_argument("prefix", help="Préfixe d'un tir (ex. e2e-3f9a1c07, journalisé au "
+                                       "démarrage) ou espace de noms avec --all-runs")
+    parser.add_argument("--all-runs", action="store_true",
+                        help="Tous les tirs de l'espace de noms (après un arrêt brutal)")
+    parser.add_argument("--domain", default=DEFAULT_DOMAIN)
+    parser.add_argument("--namespace", default="accessgate-poc")
+    parser.add_argument("--database", default="accessgate")
+    parser.add_argument("--port", type=int, help="Port local forwardé (sinon kubectl exec)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Afficher le script SQL sans l'exécuter")
+    args = parser.parse_args()
+
+    try:
+        pattern = identity_pattern(args.prefix, args.domain, args.all_runs)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    if args.dry_run:
+        sys.stdout.write(cleanup_sql(pattern))
+        return 0
+
+    configure_output("logs/identity-cleanup.jsonl")
+    logger = StructuredLogger("identities")
+    seeder = BulkSeeder(logger, namespace=args.namespace, database=args.database,
+                        port=args.port, password=os.environ.get("PGPASSWORD"))
+    deleted = delete_identities(logger, pattern, seeder=seeder)
+    if deleted is None:
+        return 1
+    print(f"🧹 {deleted} compte(s) supprimé(s) ({pattern})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
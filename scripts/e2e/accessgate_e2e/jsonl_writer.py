@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Écriture JSONL non bloquante pour AccessGate PoC
+- File d'attente bornée, sérialisation et écriture par lots dans un thread dédié
+- Politique de saturation : bloquer l'appelant ou abandonner l'entrée
+- Vidage garanti à la sortie du processus
+"""
+
+import atexit
+import json
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional, TextIO
+
+# Marqueur de fin de flux pour le thread d'écriture
+_STOP = object()
+
+WRITER_POLICIES = ("block", "drop")
+
+
+def utc_timestamp() -> str:
+    """Horodatage UTC des entrées : "2025-01-01T12:00:00.123456Z" (isoformat() + "Z")"""
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+
+
+class BatchedJSONLWriter:
+    """Écrivain JSONL asynchrone (fichier + console) par lots"""
+
+    def __init__(self, path: str, stream: Optional[TextIO] = sys.stdout,
+                 max_queue: int = 10000, batch_size: int = 512,
+                 flush_interval: float = 0.2, policy: str = "block"):
+        if policy not in WRITER_POLICIES:
+            raise ValueError(f"Politique inconnue: {policy} (attendu: {', '.join(WRITER_POLICIES)})")
+
+        self.path = Path(path)
+        self.stream = stream
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def write(self, entry: Dict):
+        """Mettre une entrée en file (elle ne doit plus être modifiée ensuite)"""
+        if self._closed:
+            # Après la fermeture (ex. handlers atexit tardifs), écrire directement
+            self._write_batch([entry])
+            return
+
+        self._ensure_started()
+        if self.policy == "block":
+            self._queue.put(entry)
+            return
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        """Vider la file et arrêter le thread d'écriture"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+
+        if thread is not None:
+            # Le marqueur passe toujours, même en politique "drop"
+            self._queue.put(_STOP)
+            thread.join()
+
+        if self.dropped:
+            self._write_batch([{
+                "timestamp": utc_timestamp(),
+                "component": "results_writer",
+                "event_type": "log_dropped",
+                "message": f"{self.dropped} entrées abandonnées (file saturée)",
+                "level": "WARNING",
+                "dropped": self.dropped,
+            }])
+
+    def _ensure_started(self):
+        """Démarrer le thread d'écriture au premier événement"""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name="jsonl-writer",
+                                                daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self):
+        """Boucle du thread : regrouper les entrées disponibles et les écrire"""
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            batch = []
+            stop = item is _STOP
+            if not stop:
+                batch.append(item)
+            while not stop and len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                else:
+                    batch.append(item)
+
+            if batch:
+                self._write_batch(batch)
+            if stop:
+                return
+
+    def _write_batch(self, batch):
+        """Sérialiser un lot et l'écrire en un seul appel par sortie"""
+        lines = "".join(json.dumps(entry, default=str) + "\n" for entry in batch)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as output:
+                output.write(lines)
+            if self.stream is not None:
+                self.stream.write(lines)
+                self.stream.flush()
+        except Exception as e:
+            print(f"Erreur écriture {self.path}: {e}", file=sys.stderr)
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Échantillonnage des ressources des pods pendant un tir AccessGate PoC
+- Un seul processus `kubectl proxy` longue durée, interrogé en HTTP à chaque tick
+- CPU et mémoire via l'API metrics.k8s.io (metrics-server), redémarrages via l'API pods
+- Efficacité par application : req/s par cœur, croissance mémoire pour 10k requêtes
+"""
+
+import argparse
+import json
+import queue
+import re
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from typing import Dict, List, Optional
+
+# Suffixes des quantités Kubernetes (CPU en cœurs, mémoire en octets)
+_CPU_UNITS = {"n": 1e-9, "u": 1e-6, "m": 1e-3, "": 1.0}
+_MEMORY_UNITS = {"": 1, "k": 10**3, "K": 10**3, "M": 10**6, "G": 10**9, "T": 10**12,
+                 "Ki": 2**10, "Mi": 2**20, "Gi": 2**30, "Ti": 2**40}
+_QUANTITY = re.compile(r"^([0-9.eE+-]+?)([a-zA-Z]*)$")
+
+
+def parse_cpu(value: str) -> float:
+    """Quantité CPU Kubernetes ("250m", "12345678n", "2") en cœurs"""
+    number, unit = _QUANTITY.match(value).groups()
+    return float(number) * _CPU_UNITS[unit]
+
+
+def parse_memory(value: str) -> int:
+    """Quantité mémoire Kubernetes ("123456Ki", "512Mi", "1G") en octets"""
+    number, unit = _QUANTITY.match(value).groups()
+    return int(float(number) * _MEMORY_UNITS[unit])
+
+
+class PodResourceSampler:
+    """Échantillonneur périodique CPU / mémoire / redémarrages des pods d'un namespace
+
+    metrics-server agrège l'usage sur sa propre fenêtre (15 s à 1 min) : un intervalle
+    plus court répète les mêmes mesures, dédoublonnées sur leur horodatage.
+    """
+
+    def __init__(self, logger, namespace: str = "accessgate-poc", interval: float = 15.0,
+                 selector: Optional[str] = None, timeout: float = 5):
+        self.logger = logger
+        self.namespace = namespace
+        self.interval = interval
+        self.selector = selector
+        self.timeout = timeout
+        self.samples: List[Dict] = []
+        self.metrics_available = True
+        self.proxy_url: Optional[str] = None
+        self._process: Optional[subprocess.Popen] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._started = 0.0
+
+    def _start_proxy(self) -> bool:
+        """Lancer kubectl proxy sur un port libre et lire l'adresse annoncée"""
+        try:
+            self._process = subprocess.Popen(
+                ["kubectl", "proxy", "--port=0", "--address=127.0.0.1"],
+                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+            )
+        except FileNotFoundError as e:
+            self.logger.log_event("pod_resources_error", "kubectl non disponible",
+                                error=str(e), status="error")
+            return False
+
+        # "Starting to serve on 127.0.0.1:41235" ; readline bloquant lu dans un thread
+        lines: queue.Queue = queue.Queue()
+        threading.Thread(target=lambda: lines.put(self._process.stdout.readline()),
+                         daemon=True).start()
+        try:
+            line = lines.get(timeout=10)
+        except queue.Empty:
+            line = ""
+        match = re.search(r"serve on ([\w.:\[\]]+)", line)
+        if match is None:
+            self._stop_proxy()
+            self.logger.log_event("pod_resources_error", "kubectl proxy non démarré",
+                                output=line.strip(), status="error")
+            return False
+        self.proxy_url = f"http://{match.group(1)}"
+        return True
+
+    def _stop_proxy(self):
+        if self._process is not None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+            self._process = None
+
+    def _get(self, path: str) -> Dict:
+        """GET JSON sur l'API Kubernetes via le proxy"""
+        query = f"?labelSelector={urllib.parse.quote(self.selector)}" if self.selector else ""
+        with urllib.request.urlopen(self.proxy_url + path + query, timeout=self.timeout) as response:
+            return json.load(response)
+
+    def sample(self) -> Optional[Dict]:
+        """Un échantillon : usage et redémarrages par pod"""
+        offset = time.monotonic() - self._started
+        try:
+            pods = self._get(f"/api/v1/namespaces/{self.namespace}/pods")
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            self.logger.log_event("pod_resources_error", "Lecture des pods impossible",
+                                error=str(e), status="warning")
+            return None
+
+        usage = {}
+        if self.metrics_available:
+            try:
+                metrics = self._get(f"/apis/metrics.k8s.io/v1beta1/namespaces/{self.namespace}/pods")
+                for item in metrics.get("items", []):
+                    containers = item.get("containers", [])
+                    usage[item["metadata"]["name"]] = {
+                        "cpu": sum(parse_cpu(c["usage"]["cpu"]) for c in containers),
+                        "memory": sum(parse_memory(c["usage"]["memory"]) for c in containers),
+                        "metrics_timestamp": item.get("timestamp"),
+                    }
+            except urllib.error.HTTPError as e:
+                if e.code != 404:
+                    # 503 pendant le démarrage de metrics-server : nouvel essai au tick suivant
+                    self.logger.log_event("pod_resources_error", "Lecture des métriques "
+                                        "impossible", error=str(e), status="warning")
+                else:
+                    # metrics-server absent : seuls les redémarrages restent mesurés
+                    self.metrics_available = False
+                    self.logger.log_event("pod_resources_error", "API metrics.k8s.io "
+                                        "indisponible", error=str(e), status="warning")
+            except (urllib.error.URLError, OSError, ValueError) as e:
+                self.logger.log_event("pod_resources_error", "Lecture des métriques impossible",
+                                    error=str(e), status="warning")
+
+        sample = {"offset": offset, "pods": {}}
+        for pod in pods.get("items", []):
+            name = pod["metadata"]["name"]
+            statuses = pod.get("status", {}).get("containerStatuses", [])
+            sample["pods"][name] = {
+                "app": pod["metadata"].get("labels", {}).get("app", name),
+                "phase": pod.get("status", {}).get("phase"),
+                "restarts": sum(status.get("restartCount", 0) for status in statuses),
+                **usage.get(name, {}),
+            }
+        self.samples.append(sample)
+        self.logger.log_event("pod_resources_sample", "Ressources des pods",
+                            offset=offset, pods=sample["pods"])
+        return sample
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self) -> bool:
+        """Démarrer le proxy, prendre l'échantillon initial puis échantillonner en fond"""
+        if not self._start_proxy():
+            return False
+        self._started = time.monotonic()
+        self._stop.clear()
+        self.logger.log_event("pod_resources_start", "Échantillonnage des ressources des pods",
+                            namespace=self.namespace, interval=self.interval,
+                            selector=self.selector, proxy=self.proxy_url)
+        self.sample()
+        self._thread = threading.Thread(target=self._run, name="pod-resources", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> List[Dict]:
+        """Échantillon final, arrêt du thread et du proxy"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout=self.timeout * 2 + 5)
+            self._thread = None
+            self.sample()
+        self._stop_proxy()
+        return self.samples
+
+    def report(self, total_requests: int, duration: float) -> Dict:
+        """Efficacité par application sur le tir (requêtes du générateur de charge)"""
+        if not self.samples:
+            return {}
+        pods: Dict[str, Dict] = {}
+        for sample in self.samples:
+            for name, pod in sample["pods"].items():
+                entry = pods.setdefault(name, {"app": pod["app"], "restarts": [],
+                                               "cpu": {}, "memory": []})
+                entry["restarts"].append(pod["restarts"])
+                if "cpu" in pod:
+                    # Dédoublonnage : une mesure par fenêtre metrics-server
+                    entry["cpu"][pod["metrics_timestamp"]] = pod["cpu"]
+                    entry["memory"].append(pod["memory"])
+
+        per_pod = {}
+        for name, entry in pods.items():
+            cpu = list(entry["cpu"].values())
+            memory = entry["memory"]
+            per_pod[name] = {
+                "app": entry["app"],
+                "restarts": entry["restarts"][-1] - entry["restarts"][0],
+                "cpu_mean": sum(cpu) / len(cpu) if cpu else None,
+                "cpu_max": max(cpu) if cpu else None,
+                "memory_first": memory[0] if memory else None,
+                "memory_last": memory[-1] if memory else None,
+                "memory_max": max(memory) if memory else None,
+            }
+
+        throughput = total_requests / duration if duration > 0 else 0
+        apps: Dict[str, Dict] = {}
+        for name, pod in per_pod.items():
+            app = apps.setdefault(pod["app"], {"pods": [], "restarts": 0, "cpu_cores": None,
+                                               "memory_growth": None})
+            app["pods"].append(name)
+            app["restarts"] += pod["restarts"]
+            if pod["cpu_mean"] is not None:
+                app["cpu_cores"] = (app["cpu_cores"] or 0) + pod["cpu_mean"]
+                app["memory_growth"] = ((app["memory_growth"] or 0)
+                                        + pod["memory_last"] - pod["memory_first"])
+        for app in apps.values():
+            cores, growth = app["cpu_cores"], app["memory_growth"]
+            app["rps_per_core"] = throughput / cores if cores else None
+            app["memory_growth_per_10k_requests"] = (growth / total_requests * 10000
+                                                     if growth is not None and total_requests
+                                                     else None)
+
+        self.logger.log_event("pod_resources_complete", "Efficacité des ressources",
+                            samples=len(self.samples), throughput_rps=throughput,
+                            total_requests=total_requests, apps=apps, pods=per_pod,
+                            metrics_available=self.metrics_available)
+        for name, app in apps.items():
+            self.logger.log_metric("pod_restarts", app["restarts"], app=name)
+            if app["rps_per_core"] is not None:
+                self.logger.log_metric("rps_per_cpu_core", app["rps_per_core"], app=name)
+            if app["memory_growth_per_10k_requests"] is not None:
+                self.logger.log_metric("memory_growth_per_10k_requests",
+                                     app["memory_growth_per_10k_requests"], app=name,
+                                     unit="bytes")
+        return {"samples": self.samples, "pods": per_pod, "apps": apps}
+
+
+def add_resource_arguments(parser: argparse.ArgumentParser):
+    """Option CLI de l'échantillonnage des ressources des pods"""
+    parser.add_argument("--sample-resources", nargs="?", type=float, const=15.0, default=None,
+                        metavar="INTERVAL",
+                        help="Échantillonner CPU/mémoire/redémarrages des pods pendant le tir "
+                             "(intervalle en s, défaut 15)")
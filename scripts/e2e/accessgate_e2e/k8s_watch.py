@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Attente de readiness des pods pour AccessGate PoC
+- Un seul processus `kubectl get pods --watch -o json` longue durée
+- Retour immédiat dès que tous les pods sont prêts
+- Temps de mise à disposition (time-to-ready) par pod
+"""
+
+import json
+import queue
+import subprocess
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+# Marqueur de fin du flux watch
+_EOF = object()
+
+
+def iter_json_objects(lines) -> Iterator[Dict]:
+    """Découper un flux de documents JSON concaténés (indentés ou compacts)"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    for line in lines:
+        buffer += line
+        stripped = line.rstrip()
+        # Un document se termine par une accolade fermante en colonne 0
+        if not stripped.endswith("}") or line[:1].isspace():
+            continue
+        try:
+            document, _ = decoder.raw_decode(buffer.strip())
+        except json.JSONDecodeError:
+            continue
+        buffer = ""
+        yield document
+
+
+def pod_is_ready(pod: Dict) -> bool:
+    """Condition Ready du pod"""
+    for condition in pod.get("status", {}).get("conditions", []):
+        if condition.get("type") == "Ready":
+            return condition.get("status") == "True"
+    return False
+
+
+def pod_is_finished(pod: Dict) -> bool:
+    """Pods terminés (jobs) ou en cours de suppression : à ignorer"""
+    return (pod.get("status", {}).get("phase") in ("Succeeded", "Failed")
+            or "deletionTimestamp" in pod.get("metadata", {}))
+
+
+def _parse_k8s_time(value: Optional[str]) -> Optional[datetime]:
+    """Horodatage Kubernetes (RFC 3339, UTC)"""
+    if not value:
+        return None
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ")
+
+
+def pod_time_to_ready(pod: Dict) -> Optional[float]:
+    """Délai entre la création du pod et sa condition Ready (secondes)"""
+    created = _parse_k8s_time(pod.get("metadata", {}).get("creationTimestamp"))
+    for condition in pod.get("status", {}).get("conditions", []):
+        if condition.get("type") == "Ready" and condition.get("status") == "True":
+            ready = _parse_k8s_time(condition.get("lastTransitionTime"))
+            if created and ready:
+                return (ready - created).total_seconds()
+    return None
+
+
+class PodReadinessWatcher:
+    """Attente de readiness pilotée par les événements watch Kubernetes"""
+
+    def __init__(self, logger, namespace: str = "accessgate-poc",
+                 selector: Optional[str] = None):
+        self.logger = logger
+        self.namespace = namespace
+        self.selector = selector
+
+    def _kubectl_get(self) -> List[str]:
+        """Commande kubectl get pods de base"""
+        command = ["kubectl", "get", "pods", "-n", self.namespace, "-o", "json"]
+        if self.selector:
+            command += ["-l", self.selector]
+        return command
+
+    def _snapshot(self) -> Optional[Dict[str, Dict]]:
+        """État initial : ensemble des pods à attendre"""
+        try:
+            result = subprocess.run(self._kubectl_get(), capture_output=True,
+                                    text=True, check=True)
+        except (subprocess.CalledProcessError, FileNotFoundError) as e:
+            self.logger.log_event("pods_watch", "Erreur récupération pods",
+                                error=str(e), status="error")
+            return None
+        items = json.loads(result.stdout).get("items", [])
+        return {pod["metadata"]["name"]: pod for pod in items}
+
+    def wait_ready(self, timeout: float = 300) -> Optional[Dict[str, Dict]]:
+        """Attendre que tous les pods soient prêts ; None en cas d'échec ou timeout"""
+        start_time = time.time()
+        pods = self._snapshot()
+        if pods is None:
+            return None
+
+        ready: Dict[str, Dict] = {}
+        self._collect_ready(pods, ready, start_time)
+        if self._all_ready(pods, ready):
+            return self._report(ready, start_time)
+
+        process = subprocess.Popen(
+            self._kubectl_get() + ["--watch", "--output-watch-events"],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+        )
+        events: queue.Queue = queue.Queue()
+        reader = threading.Thread(target=self._read_events, args=(process, events),
+                                  daemon=True)
+        reader.start()
+
+        try:
+            while True:
+                remaining = timeout - (time.time() - start_time)
+                if remaining <= 0:
+                    break
+                try:
+                    event = events.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+                if event is _EOF:
+                    stderr = process.stderr.read() if process.stderr else ""
+                    self.logger.log_event("pods_watch", "Flux watch interrompu",
+                                        error=stderr.strip(), status="error")
+                    return None
+
+                pod = event.get("object", event)
+                name = pod.get("metadata", {}).get("name")
+                if not name:
+                    continue
+                if event.get("type") == "DELETED":
+                    pods.pop(name, None)
+                    ready.pop(name, None)
+                else:
+                    pods[name] = pod
+                self._collect_ready(pods, ready, start_time)
+
+                if self._all_ready(pods, ready):
+                    return self._report(ready, start_time)
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+        not_ready = sorted(name for name, pod in pods.items()
+                           if name not in ready and not pod_is_finished(pod))
+        self.logger.log_event("pods_timeout", "Timeout attente pods",
+                            status="error", duration=timeout, pods_not_ready=not_ready)
+        return None
+
+    def _read_events(self, process: subprocess.Popen, events: queue.Queue):
+        """Thread lecteur : décoder le flux JSON de kubectl"""
+        try:
+            for document in iter_json_objects(process.stdout):
+                events.put(document)
+        finally:
+            events.put(_EOF)
+
+    def _collect_ready(self, pods: Dict[str, Dict], ready: Dict[str, Dict],
+                       start_time: float):
+        """Enregistrer les pods nouvellement prêts"""
+        for name, pod in pods.items():
+            if name in ready or pod_is_finished(pod) or not pod_is_ready(pod):
+                continue
+            ready[name] = {
+                "time_to_ready": pod_time_to_ready(pod),
+                "observed_after": time.time() - start_time,
+            }
+            self.logger.log_event("pod_ready", f"Pod {name} prêt", pod=name, **ready[name])
+            if ready[name]["time_to_ready"] is not None:
+                self.logger.log_metric("pod_time_to_ready", ready[name]["time_to_ready"],
+                                     pod=name)
+
+    def _all_ready(self, pods: Dict[str, Dict], ready: Dict[str, Dict]) -> bool:
+        """Tous les pods actifs sont-ils prêts ?"""
+        return all(name in ready for name, pod in pods.items() if not pod_is_finished(pod))
+
+    def _report(self, ready: Dict[str, Dict], start_time: float) -> Dict[str, Dict]:
+        """Journaliser la fin de l'attente"""
+        self.logger.log_event("pods_ready", "Tous les pods sont prêts",
+                            duration=time.time() - start_time, pods=ready)
+        return ready
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Accès Kubernetes des tests E2E AccessGate PoC
+- Vérification kubectl et statut des pods
+- Attente de readiness par flux watch
+- Port-forwards backend/frontend sondés jusqu'à disponibilité
+"""
+
+import json
+import subprocess
+from typing import Dict
+
+from .k8s_watch import PodReadinessWatcher
+from .logger import StructuredLogger
+from .port_forward import PortForwardError, StderrDrain, wait_for_tunnel
+
+# Tunnels kubectl port-forward : service, port local, port distant, chemin sondé
+PORT_FORWARDS = {
+    "backend": ("accessgate-backend-service", 8001, 8000, "/health"),
+    "frontend": ("accessgate-frontend-service", 3001, 3000, "/"),
+}
+
+
+class KubernetesManager:
+    """Gestionnaire Kubernetes"""
+    
+    def __init__(self, namespace: str = "accessgate-poc"):
+        self.logger = StructuredLogger("kubernetes")
+        self.namespace = namespace
+    
+    def check_kubectl(self) -> bool:
+        """Vérifier que kubectl est disponible"""
+        try:
+            result = subprocess.run(["kubectl", "version", "--client"], 
+                                  capture_output=True, text=True, check=True)
+            self.logger.log_event("kubectl_check", "kubectl disponible", 
+                                kubectl_version=result.stdout.strip())
+            return True
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            self.logger.log_event("kubectl_check", "kubectl non disponible", 
+                                status="error")
+            return False
+    
+    def get_pods_status(self) -> Dict:
+        """Obtenir le statut des pods"""
+        try:
+            result = subprocess.run([
+                "kubectl", "get", "pods", "-n", self.namespace, "-o", "json"
+            ], capture_output=True, text=True, check=True)
+            
+            pods_data = json.loads(result.stdout)
+            pods_status = {}
+            
+            for pod in pods_data.get("items", []):
+                pod_name = pod["metadata"]["name"]
+                status = pod["status"]["phase"]
+                ready = pod["status"].get("containerStatuses", [{}])[0].get("ready", False)
+                
+                pods_status[pod_name] = {
+                    "status": status,
+                    "ready": ready,
+                    "restarts": pod["status"].get("containerStatuses", [{}])[0].get("restartCount", 0)
+                }
+            
+            self.logger.log_event("pods_status", "Statut des pods récupéré", 
+                                pods=pods_status)
+            return pods_status
+            
+        except subprocess.CalledProcessError as e:
+            self.logger.log_event("pods_status", "Erreur récupération pods", 
+                                error=str(e), status="error")
+            return {}
+    
+    def wait_for_pods_ready(self, timeout: int = 300) -> bool:
+        """Attendre que tous les pods soient prêts (flux watch, sans polling)"""
+        self.logger.log_event("pods_wait", "Attente des pods...")
+        watcher = PodReadinessWatcher(self.logger, self.namespace)
+        return watcher.wait_ready(timeout) is not None
+    
+    def setup_port_forwarding(self) -> Dict[str, subprocess.Popen]:
+        """Configurer le port forwarding"""
+        self.logger.log_event("port_forward", "Configuration port forwarding...")
+        
+        processes = {}
+        drains = {}
+        
+        for name, (service, local_port, remote_port, _) in PORT_FORWARDS.items():
+            try:
+                processes[name] = subprocess.Popen([
+                    "kubectl", "port-forward",
+                    f"service/{service}",
+                    f"{local_port}:{remote_port}", "-n", self.namespace
+                ], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+                drains[name] = StderrDrain(processes[name])
+                self.logger.log_event("port_forward", f"{name.capitalize()} port forwarding démarré",
+                                    port=str(local_port))
+            except Exception as e:
+                self.logger.log_event("port_forward", f"Erreur {name} port forwarding",
+                                    error=str(e), status="error")
+        
+        # Sonder chaque tunnel jusqu'à ce qu'il réponde
+        self._wait_for_tunnels(processes, drains)
+        return processes
+    
+    def _wait_for_tunnels(self, processes: dict, drains: Dict[str, StderrDrain]):
+        """Attendre que chaque tunnel réponde (échec immédiat si kubectl s'arrête)"""
+        try:
+            for name, process in processes.items():
+                _, port, _, path = PORT_FORWARDS[name]
+                duration = wait_for_tunnel(process, port, path, stderr=drains.get(name))
+                self.logger.log_event("port_forward_ready", f"Tunnel {name} opérationnel",
+                                    port=str(port), duration=duration)
+        except PortForwardError as e:
+            self.logger.log_event("port_forward_error", "Tunnel inutilisable",
+                                error=str(e), status="error")
+            self.cleanup_port_forwarding(processes)
+            raise
+    
+    def cleanup_port_forwarding(self, processes: Dict[str, subprocess.Popen]):
+        """Nettoyer les processus de port forwarding"""
+        self.logger.log_event("port_forward_cleanup", "Nettoyage port forwarding...")
+        
+        for name, process in processes.items():
+            try:
+                process.terminate()
+                process.wait(timeout=5)
+                self.logger.log_event("port_forward_cleanup", f"Processus {name} arrêté")
+            except subprocess.TimeoutExpired:
+                process.kill()
+                self.logger.log_event("port_forward_cleanup", f"Processus {name} tué")
+            except Exception as e:
+                self.logger.log_event("port_forward_cleanup", f"Erreur arrêt {name}", 
+                                    error=str(e))
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Histogrammes de latence pour AccessGate PoC
+- Buckets logarithmiques compacts (précision relative bornée)
+- Fusionnables entre workers, processus ou machines
+- Percentiles p50/p90/p99/p99.9 et max par endpoint
+"""
+
+import math
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable
+
+# Percentiles publiés dans les résumés
+DEFAULT_PERCENTILES = (50, 90, 99, 99.9)
+
+
+class LatencyHistogram:
+    """Histogramme à buckets logarithmiques (latences en secondes)"""
+
+    def __init__(self, precision: float = 0.01, min_value: float = 1e-6):
+        self.precision = precision
+        self.min_value = min_value
+        self._log_base = math.log1p(precision)
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def _index(self, value: float) -> int:
+        """Index du bucket couvrant une valeur"""
+        if value <= self.min_value:
+            return 0
+        return int(math.log(value / self.min_value) / self._log_base)
+
+    def _bucket_value(self, index: int) -> float:
+        """Valeur représentative (milieu géométrique) d'un bucket"""
+        return self.min_value * math.exp((index + 0.5) * self._log_base)
+
+    def record(self, value: float, count: int = 1):
+        """Enregistrer une latence"""
+        index = self._index(value)
+        self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += count
+        self.total += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram"):
+        """Fusionner un autre histogramme de même précision"""
+        if (other.precision, other.min_value) != (self.precision, self.min_value):
+            raise ValueError("Histogrammes de précisions différentes")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percentile: float) -> float:
+        """Latence au percentile demandé (0 si vide)"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * percentile / 100))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+
+    def summary(self, percentiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict:
+        """Résumé compact : count, mean, max et percentiles"""
+        summary = {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+        }
+        for percentile in percentiles:
+            summary[f"p{percentile:g}"] = self.percentile(percentile)
+        return summary
+
+    def to_dict(self) -> Dict:
+        """Forme sérialisable (JSON) de l'histogramme"""
+        return {
+            "precision": self.precision,
+            "min_value": self.min_value,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max,
+            "buckets": {str(index): count for index, count in self.buckets.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LatencyHistogram":
+        """Reconstruire un histogramme depuis to_dict()"""
+        histogram = cls(data["precision"], data["min_value"])
+        histogram.buckets = {int(index): count for index, count in data["buckets"].items()}
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        histogram.min = data["min"] if data["min"] is not None else math.inf
+        histogram.max = data["max"]
+        return histogram
+
+
+class LatencyRecorder:
+    """Enregistreur de latences par endpoint"""
+
+    def __init__(self, precision: float = 0.01):
+        self.precision = precision
+        self.histograms: Dict[str, LatencyHistogram] = {}
+
+    def histogram(self, endpoint: str) -> LatencyHistogram:
+        """Histogramme d'un endpoint (créé à la demande)"""
+        if endpoint not in self.histograms:
+            self.histograms[endpoint] = LatencyHistogram(self.precision)
+        return self.histograms[endpoint]
+
+    def record(self, endpoint: str, duration: float):
+        """Enregistrer une latence pour un endpoint"""
+        self.histogram(endpoint).record(duration)
+
+    @contextmanager
+    def measure(self, endpoint: str):
+        """Mesurer la durée d'un bloc pour un endpoint"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(endpoint, time.perf_counter() - start)
+
+    def merge(self, other: "LatencyRecorder"):
+        """Fusionner les histogrammes d'un autre enregistreur"""
+        for endpoint, histogram in other.histograms.items():
+            self.histogram(endpoint).merge(histogram)
+
+    def summary(self) -> Dict[str, Dict]:
+        """Résumé des percentiles par endpoint"""
+        return {endpoint: histogram.summary()
+                for endpoint, histogram in sorted(self.histograms.items())}
+
+    def log_summary(self, logger, prefix: str = "latency", **kwargs):
+        """Publier les percentiles comme métriques Grafana"""
+        for endpoint, summary in self.summary().items():
+            for key, value in summary.items():
+                if key == "count":
+                    continue
+                logger.log_metric(f"{prefix}_{key.replace('.', '_')}", value,
+                                  endpoint=endpoint, unit="seconds", **kwargs)
+            logger.log_metric(f"{prefix}_count", summary["count"],
+                              endpoint=endpoint, **kwargs)
+
+    def to_dict(self) -> Dict[str, Dict]:
+        """Forme sérialisable de tous les histogrammes"""
+        return {endpoint: histogram.to_dict()
+                for endpoint, histogram in self.histograms.items()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Dict], precision: float = 0.01) -> "LatencyRecorder":
+        """Reconstruire un enregistreur depuis to_dict()"""
+        recorder = cls(precision)
+        for endpoint, histogram in data.items():
+            recorder.histograms[endpoint] = LatencyHistogram.from_dict(histogram)
+        return recorder
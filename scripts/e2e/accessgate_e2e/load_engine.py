@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Moteur de charge asyncio pour AccessGate PoC
+- Utilisateurs virtuels concurrents sur un pool de connexions keep-alive borné
+- Cible /health, /api/auth/login et /api/users
+- Tokens pré-authentifiés (pool) : la mesure porte sur les routes protégées, pas sur le login
+- Mesure le débit soutenu (req/s) par endpoint
+- Scénarios déclaratifs compilés (run_scenario, voir accessgate_e2e.scenario)
+"""
+
+import asyncio
+import random
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .latency import LatencyHistogram
+from .token_pool import TokenPool, TokenSlot
+
+# Endpoints pilotables par les utilisateurs virtuels
+LOAD_ENDPOINTS = {
+    "health": ("GET", "/health"),
+    "login": ("POST", "/api/auth/login"),
+    "users": ("GET", "/api/users"),
+}
+
+
+class EndpointStats:
+    """Statistiques agrégées d'un endpoint"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.latency = LatencyHistogram()
+        self.status_codes: Dict[int, int] = {}
+
+    def record(self, latency: float, status_code: int):
+        """Enregistrer une requête (status_code 0 = erreur réseau)"""
+        self.requests += 1
+        self.latency.record(latency)
+        self.status_codes[status_code] = self.status_codes.get(status_code, 0) + 1
+        if status_code == 0 or status_code >= 400:
+            self.errors += 1
+
+    def to_dict(self, elapsed: float) -> Dict:
+        """Résumé de l'endpoint sur la fenêtre de mesure"""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "throughput_rps": self.requests / elapsed if elapsed > 0 else 0,
+            "latency": self.latency.summary(),
+            "status_codes": {str(code): count for code, count in self.status_codes.items()},
+        }
+
+
+class AsyncLoadTester:
+    """Générateur de charge asyncio avec pool de connexions partagé"""
+
+    def __init__(self, logger, base_url: str = "http://localhost:8001",
+                 max_connections: int = 100, timeout: float = 10):
+        self.logger = logger
+        self.base_url = base_url
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.token_pool: Optional[TokenPool] = None
+
+    async def run(self, virtual_users: int = 100, duration: float = 30,
+                  endpoints: Optional[List[str]] = None, ramp_up: float = 0,
+                  email: str = "", password: str = "",
+                  accounts: Optional[Sequence[Tuple[str, str]]] = None) -> Dict:
+        """Exécuter un tir de charge et retourner le débit par endpoint"""
+        try:
+            import aiohttp
+        except ImportError:
+            self.logger.log_event("load_import", "aiohttp non installé",
+                                status="error")
+            return {}
+
+        endpoints = endpoints or ["health", "users"]
+        unknown = [name for name in endpoints if name not in LOAD_ENDPOINTS]
+        if unknown:
+            raise ValueError(f"Endpoints inconnus: {', '.join(unknown)}")
+
+        self.logger.log_event("load_start", "Démarrage tir de charge",
+                            virtual_users=virtual_users, duration=duration,
+                            endpoints=endpoints, max_connections=self.max_connections)
+
+        stats = {name: EndpointStats() for name in endpoints}
+        connector = aiohttp.TCPConnector(limit=self.max_connections,
+                                         keepalive_timeout=30)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+        # Session d'authentification séparée : le pool saturé par les utilisateurs
+        # virtuels n'est pas équitable et affamerait les rafraîchissements de tokens
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session, \
+                aiohttp.ClientSession(timeout=timeout) as auth_session:
+            credentials = {"email": email, "password": password}
+
+            # Pré-authentification des comptes : les tokens sont répartis entre utilisateurs virtuels
+            if "users" in endpoints:
+                self.token_pool = TokenPool(self.logger, self.base_url)
+                if not await self.token_pool.fill(auth_session, accounts or [(email, password)]):
+                    # Sans token, /api/users ne mesurerait que des 401
+                    self.logger.log_event("load_error", "Aucun token obtenu, tir annulé",
+                                        status="error")
+                    return {}
+                self.token_pool.start(auth_session)
+
+            start_time = time.perf_counter()
+            deadline = start_time + duration
+            workers = []
+            for index in range(virtual_users):
+                delay = ramp_up * index / virtual_users if ramp_up > 0 else 0
+                workers.append(asyncio.create_task(
+                    self._virtual_user(session, endpoints, credentials, stats,
+                                       deadline, delay)
+                ))
+            await asyncio.gather(*workers)
+            elapsed = time.perf_counter() - start_time
+            if self.token_pool:
+                await self.token_pool.stop()
+
+        return self._report(stats, virtual_users, elapsed)
+
+    async def _virtual_user(self, session, endpoints: List[str], credentials: Dict,
+                            stats: Dict[str, EndpointStats], deadline: float,
+                            delay: float):
+        """Boucle d'un utilisateur virtuel jusqu'à l'échéance"""
+        if delay:
+            await asyncio.sleep(delay)
+
+        slot = self.token_pool.acquire() if self.token_pool else None
+        while time.perf_counter() < deadline:
+            for name in endpoints:
+                latency, status_code = await self._request(session, name, credentials, slot)
+                stats[name].record(latency, status_code)
+
+    async def _request(self, session, name: str, credentials: Dict,
+                       slot: Optional[TokenSlot] = None):
+        """Envoyer une requête et retourner (latence, code HTTP)"""
+        method, path = LOAD_ENDPOINTS[name]
+        kwargs = {}
+        if name == "login":
+            kwargs["json"] = credentials
+        elif name == "users" and slot:
+            kwargs["headers"] = slot.headers()
+
+        start = time.perf_counter()
+        try:
+            async with session.request(method, self.base_url + path, **kwargs) as response:
+                # Lire le corps pour rendre la connexion au pool keep-alive
+                await response.read()
+                return time.perf_counter() - start, response.status
+        except Exception:
+            return time.perf_counter() - start, 0
+
+    async def run_scenario(self, scenario, virtual_users: int = 50, duration: float = 30,
+                           ramp_up: float = 0,
+                           accounts: Optional[Sequence[Tuple[str, str]]] = None,
+                           seed: Optional[int] = None) -> Dict:
+        """Exécuter un scénario déclaratif (accessgate_e2e.scenario), compilé une seule fois"""
+        try:
+            import aiohttp
+        except ImportError:
+            self.logger.log_event("load_import", "aiohttp non installé",
+                                status="error")
+            return {}
+        from .identities import new_run_id
+        from .scenario import ScenarioStats
+
+        compiled = scenario.compile(self.base_url)
+        run = new_run_id()
+        accounts = list(accounts or [])
+        self.logger.log_event("scenario_start", "Démarrage scénario",
+                            scenario=scenario.describe(), run=run,
+                            virtual_users=virtual_users, duration=duration,
+                            max_connections=self.max_connections)
+
+        stats = {name: EndpointStats() for name in compiled.step_names}
+        scenario_stats = ScenarioStats()
+        connector = aiohttp.TCPConnector(limit=self.max_connections,
+                                         keepalive_timeout=30)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session, \
+                aiohttp.ClientSession(timeout=timeout) as auth_session:
+            if scenario.uses_pool:
+                self.token_pool = TokenPool(self.logger, self.base_url)
+                if not await self.token_pool.fill(auth_session, accounts):
+                    return {}
+                self.token_pool.start(auth_session)
+
+            start_time = time.perf_counter()
+            deadline = start_time + duration
+
+            async def virtual_user(index: int):
+                if ramp_up > 0:
+                    await asyncio.sleep(ramp_up * index / virtual_users)
+                account = accounts[index % len(accounts)] if accounts else None
+                slot = self.token_pool.acquire() if scenario.uses_pool else None
+                context = compiled.context(index, run, account, slot)
+                rng = random.Random(f"{seed}-{index}") if seed is not None else random.Random()
+                await compiled.run_user(session, context, stats, scenario_stats,
+                                        deadline, rng)
+
+            await asyncio.gather(*(virtual_user(index) for index in range(virtual_users)))
+            elapsed = time.perf_counter() - start_time
+            if self.token_pool:
+                await self.token_pool.stop()
+
+        summary = self._report({name: endpoint for name, endpoint in stats.items()
+                                if endpoint.requests}, virtual_users, elapsed)
+        failures = sum(sum(checks.values()) for checks in scenario_stats.assertions.values())
+        for name, checks in scenario_stats.assertions.items():
+            self.logger.log_metric("scenario_assertion_failures", sum(checks.values()),
+                                 endpoint=name, checks=checks)
+        self.logger.log_event("scenario_complete", "Scénario terminé",
+                            scenario=scenario.name, run=run,
+                            iterations=scenario_stats.iterations,
+                            aborted_users=scenario_stats.aborted_users,
+                            assertion_failures=failures,
+                            assertions=scenario_stats.assertions,
+                            status="error" if failures else "success")
+        summary.update(scenario=scenario.name, run=run, iterations=scenario_stats.iterations,
+                       aborted_users=scenario_stats.aborted_users,
+                       assertion_failures=failures, assertions=scenario_stats.assertions)
+        return summary
+
+    def _report(self, stats: Dict[str, EndpointStats], virtual_users: int,
+                elapsed: float) -> Dict:
+        """Journaliser et retourner le résumé du tir"""
+        endpoints = {name: endpoint.to_dict(elapsed) for name, endpoint in stats.items()}
+        total_requests = sum(endpoint.requests for endpoint in stats.values())
+        total_errors = sum(endpoint.errors for endpoint in stats.values())
+        throughput = total_requests / elapsed if elapsed > 0 else 0
+
+        for name, summary in endpoints.items():
+            self.logger.log_metric("load_throughput_rps", summary["throughput_rps"],
+                                 endpoint=name)
+            self.logger.log_metric("load_error_count", summary["errors"],
+                                 endpoint=name)
+            for key, value in summary["latency"].items():
+                if key != "count":
+                    self.logger.log_metric(f"load_latency_{key.replace('.', '_')}", value,
+                                         endpoint=name, unit="seconds")
+
+        self.logger.log_event("load_complete", "Tir de charge terminé",
+                            virtual_users=virtual_users,
+                            total_requests=total_requests,
+                            total_errors=total_errors,
+                            throughput_rps=throughput,
+                            duration=elapsed,
+                            endpoints=endpoints)
+        self.logger.log_metric("load_throughput_rps", throughput, endpoint="all")
+
+        return {
+            "virtual_users": virtual_users,
+            "duration": elapsed,
+            "total_requests": total_requests,
+            "total_errors": total_errors,
+            "throughput_rps": throughput,
+            "endpoints": endpoints,
+            # Histogrammes bruts (stockage des résultats, comparaison entre runs)
+            "histograms": {name: endpoint.latency.to_dict() for name, endpoint in stats.items()},
+        }
@@ -0,0 +1,714 @@
+#!/usr/bin/env python3
+"""
+Charge en modèle ouvert (taux d'arrivée) pour AccessGate PoC
+- Profils : débit constant, rampe linéaire, paliers, pic, soak de plusieurs heures
+- Les requêtes partent à l'heure prévue, que les précédentes aient répondu ou non
+- Correction de l'omission coordonnée : latence mesurée depuis l'heure d'envoi prévue
+- Cible les routes réelles (backend/src/routes/*.ts), protégées par checkAuth
+"""
+
+import argparse
+import asyncio
+import inspect
+import random
+import sys
+import time
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .identities import IdentityAllocator
+from .latency import LatencyHistogram
+from .token_pool import TokenPool, TokenSlot
+
+# Routes ciblables : méthode, chemin, authentification requise
+# (login et refresh sont exclus : authRateLimiter limite /api/auth/* à 5 requêtes / 15 min ;
+# auth_register, hors mélange par défaut, n'est mesurable qu'avec un limiteur relâché
+# ou le backend de substitution)
+LOAD_ROUTES = {
+    "health": ("GET", "/health", False),
+    "auth_register": ("POST", "/api/auth/register", False),
+    "users_list": ("GET", "/api/users?page=1&limit=10", True),
+    "user_by_id": ("GET", "/api/users/{user_id}", True),
+    "roles_list": ("GET", "/api/roles", True),
+    "permissions_list": ("GET", "/api/permissions", True),
+    "permissions_grouped": ("GET", "/api/permissions/grouped", True),
+}
+
+# Mélange par défaut : lectures protégées par checkAuth + requirePermission
+DEFAULT_ROUTE_MIX = {"users_list": 3, "roles_list": 1, "permissions_list": 1, "user_by_id": 1}
+
+LOAD_PROFILES = ("constant", "ramp", "step", "spike", "soak")
+
+# Fenêtre plus courte que cette fraction de --report-interval : partielle
+PARTIAL_WINDOW_RATIO = 0.9
+
+# Rappel de fin de fenêtre : index, début et fin (secondes depuis le départ), stats par route
+IntervalCallback = Callable[[int, float, float, Dict[str, "RouteStats"]],
+                            Optional[Awaitable]]
+
+
+class ArrivalProfile:
+    """Profil de débit offert : taux d'arrivée (req/s) en fonction du temps"""
+
+    name = "constant"
+
+    def __init__(self, rps: float, duration: float):
+        self.rps = rps
+        self.duration = duration
+
+    def rate_at(self, elapsed: float) -> float:
+        """Débit offert à l'instant elapsed (secondes depuis le début)"""
+        return self.rps
+
+    def describe(self) -> Dict:
+        """Paramètres du profil (pour les logs)"""
+        return {"name": self.name, "rps": self.rps, "duration": self.duration}
+
+    def arrivals(self, poisson: bool = False, seed: int = 42,
+                 phase: float = 0.0) -> Iterator[float]:
+        """Heures d'envoi prévues (secondes depuis le début)
+
+        phase décale la première arrivée d'une fraction de l'intervalle initial
+        (workers parallèles entrelacés plutôt que synchronisés).
+        """
+        rng = random.Random(seed)
+        rate = self.rate_at(0.0)
+        elapsed = phase / rate if rate > 0 else 0.0
+        while elapsed < self.duration:
+            rate = self.rate_at(elapsed)
+            if rate <= 0:
+                # Débit nul : avancer jusqu'au prochain changement possible
+                elapsed += 0.01
+                continue
+            yield elapsed
+            elapsed += rng.expovariate(rate) if poisson else 1.0 / rate
+
+
+class RampProfile(ArrivalProfile):
+    """Rampe linéaire de start_rps à end_rps"""
+
+    name = "ramp"
+
+    def __init__(self, start_rps: float, end_rps: float, duration: float):
+        super().__init__(end_rps, duration)
+        self.start_rps = start_rps
+        self.end_rps = end_rps
+
+    def rate_at(self, elapsed: float) -> float:
+        return self.start_rps + (self.end_rps - self.start_rps) * min(elapsed / self.duration, 1.0)
+
+    def describe(self) -> Dict:
+        return {"name": self.name, "start_rps": self.start_rps, "end_rps": self.end_rps,
+                "duration": self.duration}
+
+
+class StepProfile(ArrivalProfile):
+    """Paliers : start_rps puis + step_rps toutes les step_duration secondes"""
+
+    name = "step"
+
+    def __init__(self, start_rps: float, step_rps: float, step_duration: float, steps: int):
+        super().__init__(start_rps + step_rps * (steps - 1), step_duration * steps)
+        self.start_rps = start_rps
+        self.step_rps = step_rps
+        self.step_duration = step_duration
+        self.steps = steps
+
+    def rate_at(self, elapsed: float) -> float:
+        step = min(int(elapsed // self.step_duration), self.steps - 1)
+        return self.start_rps + self.step_rps * step
+
+    def describe(self) -> Dict:
+        return {"name": self.name, "start_rps": self.start_rps, "step_rps": self.step_rps,
+                "step_duration": self.step_duration, "steps": self.steps,
+                "duration": self.duration}
+
+
+class SpikeProfile(ArrivalProfile):
+    """Débit de base avec un pic de spike_rps entre spike_start et spike_start + spike_duration"""
+
+    name = "spike"
+
+    def __init__(self, base_rps: float, spike_rps: float, duration: float,
+                 spike_start: float, spike_duration: float):
+        super().__init__(base_rps, duration)
+        self.spike_rps = spike_rps
+        self.spike_start = spike_start
+        self.spike_duration = spike_duration
+
+    def rate_at(self, elapsed: float) -> float:
+        if self.spike_start <= elapsed < self.spike_start + self.spike_duration:
+            return self.spike_rps
+        return self.rps
+
+    def describe(self) -> Dict:
+        return {"name": self.name, "base_rps": self.rps, "spike_rps": self.spike_rps,
+                "spike_start": self.spike_start, "spike_duration": self.spike_duration,
+                "duration": self.duration}
+
+
+class SoakProfile(ArrivalProfile):
+    """Débit constant sur une longue durée (dérive mémoire, fuites de connexions)"""
+
+    name = "soak"
+
+
+class ScaledProfile(ArrivalProfile):
+    """Part d'un profil confiée à un worker (débit multiplié par share)"""
+
+    def __init__(self, profile: ArrivalProfile, share: float):
+        super().__init__(profile.rps * share, profile.duration)
+        self.profile = profile
+        self.share = share
+        self.name = profile.name
+
+    def rate_at(self, elapsed: float) -> float:
+        return self.profile.rate_at(elapsed) * self.share
+
+    def describe(self) -> Dict:
+        return {**self.profile.describe(), "share": self.share}
+
+
+class RouteStats:
+    """Statistiques d'une route : latence corrigée, temps de service, codes HTTP"""
+
+    def __init__(self):
+        self.scheduled = 0
+        self.requests = 0
+        self.errors = 0
+        self.dropped = 0
+        self.latency = LatencyHistogram()
+        self.service_time = LatencyHistogram()
+        self.status_codes: Dict[int, int] = {}
+
+    def record(self, latency: float, service_time: float, status_code: int):
+        """Enregistrer une réponse (status_code 0 = erreur réseau)"""
+        self.requests += 1
+        self.latency.record(latency)
+        self.service_time.record(service_time)
+        self.status_codes[status_code] = self.status_codes.get(status_code, 0) + 1
+        if status_code == 0 or status_code >= 400:
+            self.errors += 1
+
+    def merge(self, other: "RouteStats"):
+        """Fusionner les statistiques d'un autre worker"""
+        self.scheduled += other.scheduled
+        self.requests += other.requests
+        self.errors += other.errors
+        self.dropped += other.dropped
+        self.latency.merge(other.latency)
+        self.service_time.merge(other.service_time)
+        for code, count in other.status_codes.items():
+            self.status_codes[code] = self.status_codes.get(code, 0) + count
+
+    def to_snapshot(self) -> Dict:
+        """Forme compacte et sérialisable (histogrammes bruts, pas de percentiles)"""
+        return {
+            "scheduled": self.scheduled,
+            "requests": self.requests,
+            "errors": self.errors,
+            "dropped": self.dropped,
+            "latency": self.latency.to_dict(),
+            "service_time": self.service_time.to_dict(),
+            "status_codes": {str(code): count for code, count in self.status_codes.items()},
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: Dict) -> "RouteStats":
+        """Reconstruire les statistiques depuis to_snapshot()"""
+        stats = cls()
+        stats.scheduled = data["scheduled"]
+        stats.requests = data["requests"]
+        stats.errors = data["errors"]
+        stats.dropped = data["dropped"]
+        stats.latency = LatencyHistogram.from_dict(data["latency"])
+        stats.service_time = LatencyHistogram.from_dict(data["service_time"])
+        stats.status_codes = {int(code): count for code, count in data["status_codes"].items()}
+        return stats
+
+    def to_dict(self, elapsed: float) -> Dict:
+        """Résumé de la route sur la fenêtre"""
+        return {
+            "scheduled": self.scheduled,
+            "requests": self.requests,
+            "errors": self.errors,
+            "dropped": self.dropped,
+            "offered_rps": self.scheduled / elapsed if elapsed > 0 else 0,
+            "throughput_rps": self.requests / elapsed if elapsed > 0 else 0,
+            "latency": self.latency.summary(),
+            "service_time": self.service_time.summary(),
+            "status_codes": {str(code): count for code, count in self.status_codes.items()},
+        }
+
+
+class OpenModelLoadTester:
+    """Générateur de charge à taux d'arrivée imposé (modèle ouvert)"""
+
+    def __init__(self, logger, base_url: str = "http://localhost:8001",
+                 max_connections: int = 200, max_backlog: int = 10000,
+                 timeout: float = 10, report_interval: float = 10,
+                 slo_p99: float = 0.5, max_error_rate: float = 0.01,
+                 record_requests: bool = False, identity_prefix: Optional[str] = None,
+                 identity_worker: str = "0"):
+        self.logger = logger
+        self.base_url = base_url
+        self.max_connections = max_connections
+        # Requêtes en attente au-delà desquelles le client lui-même sature
+        self.max_backlog = max_backlog
+        self.timeout = timeout
+        self.report_interval = report_interval
+        self.slo_p99 = slo_p99
+        self.max_error_rate = max_error_rate
+        # Un échantillon par requête (volumineux : à réserver au format binaire)
+        self.record_requests = record_requests
+        # Emails neufs pour auth_register : préfixe du tir partagé, compteur par worker
+        self.identities = IdentityAllocator(identity_prefix, identity_worker)
+        self.token_pool: Optional[TokenPool] = None
+        self.totals: Dict[str, RouteStats] = {}
+        self.window: Dict[str, RouteStats] = {}
+        self.intervals: List[Dict] = []
+
+    @staticmethod
+    def parse_route_mix(value: str) -> Dict[str, float]:
+        """Mélange CLI : "users_list=3,roles_list=1" (poids relatifs)"""
+        mix = {}
+        for item in value.split(","):
+            name, _, weight = item.strip().partition("=")
+            if name not in LOAD_ROUTES:
+                raise ValueError(f"Route inconnue: {name} (attendu: {', '.join(LOAD_ROUTES)})")
+            mix[name] = float(weight or 1)
+        return mix
+
+    async def run(self, profile: ArrivalProfile, route_mix: Optional[Dict[str, float]] = None,
+                  accounts: Sequence[Tuple[str, str]] = (), poisson: bool = False,
+                  seed: int = 42, phase: float = 0.0,
+                  on_ready: Optional[Callable[[], Awaitable]] = None,
+                  on_interval: Optional[IntervalCallback] = None) -> Dict:
+        """Exécuter un profil et retourner le résumé par route et par intervalle
+
+        on_ready est attendu une fois les tokens obtenus, juste avant le premier envoi
+        (départ synchronisé de plusieurs workers) ; on_interval reçoit chaque fenêtre
+        close (index, début, fin, statistiques par route), et s'il retourne une coroutine
+        elle est attendue avant l'envoi suivant (contre-pression d'un agent distant).
+        """
+        try:
+            import aiohttp
+        except ImportError:
+            self.logger.log_event("load_import", "aiohttp non installé",
+                                status="error")
+            return {}
+
+        route_mix = route_mix or DEFAULT_ROUTE_MIX
+        names = list(route_mix)
+        weights = [route_mix[name] for name in names]
+        rng = random.Random(seed)
+
+        self.logger.log_event("load_profile_start", "Démarrage tir en modèle ouvert",
+                            profile=profile.describe(), routes=route_mix, poisson=poisson,
+                            max_connections=self.max_connections)
+
+        # Arrivées comptées à l'envoi, réponses à leur réception (fenêtre courante)
+        self.totals = {name: RouteStats() for name in names}
+        self.window = {name: RouteStats() for name in names}
+        connector = aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=30)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session, \
+                aiohttp.ClientSession(timeout=timeout) as auth_session:
+            if any(LOAD_ROUTES[name][2] for name in names):
+                self.token_pool = TokenPool(self.logger, self.base_url)
+                if not await self.token_pool.fill(auth_session, accounts):
+                    self.logger.log_event("load_profile_error", "Aucun token obtenu",
+                                        status="error")
+                    return {}
+                self.token_pool.start(auth_session)
+
+            if on_ready is not None:
+                await on_ready()
+
+            pending = set()
+            start = time.perf_counter()
+            window_start = start
+            max_lag = 0.0
+
+            async def close_window(window_end: float):
+                # Fenêtres alignées sur start + k * report_interval (fusion entre workers)
+                index = round((window_start - start) / self.report_interval)
+                window, self.window = self.window, {name: RouteStats() for name in names}
+                self._report_interval(window, window_start, window_end, profile, start)
+                if on_interval is not None:
+                    result = on_interval(index, window_start - start, window_end - start, window)
+                    if inspect.isawaitable(result):
+                        await result
+
+            def send(name: str, intended: float):
+                self.totals[name].scheduled += 1
+                self.window[name].scheduled += 1
+                if len(pending) >= self.max_backlog:
+                    self.totals[name].dropped += 1
+                    self.window[name].dropped += 1
+                    return
+                slot = self.token_pool.acquire() if self.token_pool else None
+                task = asyncio.create_task(self._request(session, name, intended, slot))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+
+            for offset in profile.arrivals(poisson, seed, phase):
+                intended = start + offset
+                now = time.perf_counter()
+                if intended > now:
+                    await asyncio.sleep(intended - now)
+                    now = time.perf_counter()
+                else:
+                    # En retard : rendre la main pour laisser avancer les réponses
+                    await asyncio.sleep(0)
+                max_lag = max(max_lag, now - intended)
+
+                while now - window_start >= self.report_interval:
+                    await close_window(window_start + self.report_interval)
+                    window_start += self.report_interval
+
+                send(rng.choices(names, weights)[0], intended)
+
+            # Réponses encore en vol : continuer à clore les fenêtres pendant la vidange
+            while pending:
+                next_boundary = window_start + self.report_interval
+                await asyncio.wait(pending, timeout=max(0.0, next_boundary - time.perf_counter()))
+                if time.perf_counter() >= next_boundary:
+                    await close_window(next_boundary)
+                    window_start = next_boundary
+            end = time.perf_counter()
+            # Vidange finie avant la fin du profil : la dernière fenêtre couvre tout de même
+            # ses heures d'envoi prévues (sinon débit offert surestimé)
+            await close_window(max(end, start + profile.duration))
+            if self.token_pool:
+                await self.token_pool.stop()
+
+        return self._report(self.totals, profile, end - start, max_lag)
+
+    async def _request(self, session, name: str, intended: float,
+                       slot: Optional[TokenSlot]):
+        """Envoyer une requête ; latence comptée depuis l'heure prévue"""
+        method, path, requires_auth = LOAD_ROUTES[name]
+        kwargs = {}
+        if requires_auth and slot:
+            kwargs["headers"] = slot.headers()
+            path = path.format(user_id=slot.user_id)
+        elif name == "auth_register":
+            kwargs["json"] = self.identities.registration()
+
+        sent = time.perf_counter()
+        try:
+            async with session.request(method, self.base_url + path, **kwargs) as response:
+                # Lire le corps pour rendre la connexion au pool keep-alive
+                await response.read()
+                status_code = response.status
+        except Exception:
+            status_code = 0
+        done = time.perf_counter()
+        self.totals[name].record(done - intended, done - sent, status_code)
+        self.window[name].record(done - intended, done - sent, status_code)
+        if self.record_requests:
+            self.logger.log_metric("load_request_latency", done - intended, endpoint=name,
+                                   service_time=done - sent, status_code=status_code)
+
+    def _report_interval(self, window: Dict[str, RouteStats], window_start: float,
+                         window_end: float, profile: ArrivalProfile, start: float):
+        """Journaliser un intervalle (débit offert vs obtenu, p99 corrigé)"""
+        elapsed = window_end - window_start
+        if elapsed <= 0:
+            return
+        merged = RouteStats()
+        for route_stats in window.values():
+            merged.merge(route_stats)
+
+        interval = {
+            "offset": window_start - start,
+            "target_rps": profile.rate_at(window_start - start),
+            # Fenêtre finale (ou vidange) plus courte : quelques envois rapportés à une durée
+            # infime donneraient un débit offert aberrant, écarté du point de saturation
+            "partial": elapsed < PARTIAL_WINDOW_RATIO * self.report_interval,
+            **merged.to_dict(elapsed),
+            "routes": {name: route_stats.to_dict(elapsed)
+                       for name, route_stats in window.items()
+                       if route_stats.scheduled or route_stats.requests},
+        }
+        self.intervals.append(interval)
+        self.logger.log_event("load_interval", "Intervalle de charge",
+                            offset=interval["offset"],
+                            target_rps=interval["target_rps"],
+                            offered_rps=interval["offered_rps"],
+                            throughput_rps=interval["throughput_rps"],
+                            partial=interval["partial"],
+                            errors=interval["errors"], dropped=interval["dropped"],
+                            latency_p99=interval["latency"]["p99"],
+                            service_time_p99=interval["service_time"]["p99"])
+
+    def saturation_point(self) -> Optional[float]:
+        """Plus haut débit offert tenu (débit, p99 corrigé et erreurs dans les seuils)
+
+        Seules les fenêtres complètes comptent (voir "partial" dans _report_interval).
+        """
+        saturation = None
+        for interval in self.intervals:
+            offered = interval["offered_rps"]
+            if not offered or interval.get("partial"):
+                continue
+            completed = interval["requests"] + interval["dropped"]
+            error_rate = (interval["errors"] + interval["dropped"]) / completed if completed else 1
+            if (interval["throughput_rps"] < 0.95 * offered
+                    or interval["latency"]["p99"] > self.slo_p99
+                    or error_rate > self.max_error_rate):
+                break
+            saturation = max(saturation or 0, offered)
+        return saturation
+
+    def _report(self, totals: Dict[str, RouteStats], profile: ArrivalProfile,
+                elapsed: float, max_lag: float) -> Dict:
+        """Journaliser et retourner le résumé du tir"""
+        routes = {name: route_stats.to_dict(elapsed) for name, route_stats in totals.items()}
+        total_requests = sum(route_stats.requests for route_stats in totals.values())
+        total_errors = sum(route_stats.errors for route_stats in totals.values())
+        total_dropped = sum(route_stats.dropped for route_stats in totals.values())
+        rate_limited = sum(route_stats.status_codes.get(429, 0) for route_stats in totals.values())
+        saturation = self.saturation_point()
+
+        for name, summary in routes.items():
+            self.logger.log_metric("load_throughput_rps", summary["throughput_rps"],
+                                 endpoint=name)
+            self.logger.log_metric("load_error_count", summary["errors"], endpoint=name)
+            for key, value in summary["latency"].items():
+                if key != "count":
+                    self.logger.log_metric(f"load_latency_{key.replace('.', '_')}", value,
+                                         endpoint=name, unit="seconds")
+
+        if rate_limited:
+            # rateLimiter global (RATE_LIMIT_MAX_REQUESTS par IP) : la mesure porte sur le limiteur
+            self.logger.log_event("load_rate_limited", "Réponses 429 du rateLimiter global",
+                                responses=rate_limited, status="warning")
+
+        self.logger.log_event("load_profile_complete", "Tir en modèle ouvert terminé",
+                            total_requests=total_requests,
+                            total_errors=total_errors,
+                            total_dropped=total_dropped,
+                            throughput_rps=total_requests / elapsed if elapsed > 0 else 0,
+                            saturation_rps=saturation,
+                            max_schedule_lag=max_lag,
+                            duration=elapsed,
+                            profile=profile.describe(),
+                            routes=routes)
+        if saturation is not None:
+            self.logger.log_metric("load_saturation_rps", saturation)
+
+        return {
+            "profile": profile.describe(),
+            "duration": elapsed,
+            "total_requests": total_requests,
+            "total_errors": total_errors,
+            "total_dropped": total_dropped,
+            "throughput_rps": total_requests / elapsed if elapsed > 0 else 0,
+            "saturation_rps": saturation,
+            "max_schedule_lag": max_lag,
+            "routes": routes,
+            "intervals": self.intervals,
+            # Histogrammes bruts (stockage des résultats, comparaison entre runs)
+            "histograms": {name: route_stats.latency.to_dict()
+                           for name, route_stats in totals.items()},
+        }
+
+
+def profile_from_args(args: argparse.Namespace) -> ArrivalProfile:
+    """Construire le profil depuis les options CLI"""
+    if args.profile == "ramp":
+        return RampProfile(args.start_rps, args.rps, args.duration)
+    if args.profile == "step":
+        return StepProfile(args.start_rps, args.step_rps, args.step_duration, args.steps)
+    if args.profile == "spike":
+        return SpikeProfile(args.rps, args.spike_rps, args.duration,
+                            args.spike_start, args.spike_duration)
+    if args.profile == "soak":
+        return SoakProfile(args.rps, args.duration)
+    return ArrivalProfile(args.rps, args.duration)
+
+
+def profile_from_description(data: Dict) -> ArrivalProfile:
+    """Reconstruire un profil depuis describe() (scénario transmis aux agents)"""
+    if data["name"] == "ramp":
+        return RampProfile(data["start_rps"], data["end_rps"], data["duration"])
+    if data["name"] == "step":
+        return StepProfile(data["start_rps"], data["step_rps"],
+                           data["step_duration"], data["steps"])
+    if data["name"] == "spike":
+        return SpikeProfile(data["base_rps"], data["spike_rps"], data["duration"],
+                            data["spike_start"], data["spike_duration"])
+    if data["name"] == "soak":
+        return SoakProfile(data["rps"], data["duration"])
+    return ArrivalProfile(data["rps"], data["duration"])
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser):
+    """Options CLI décrivant un profil de charge"""
+    parser.add_argument("--profile", choices=LOAD_PROFILES, default="constant")
+    parser.add_argument("--rps", type=float, default=50,
+                        help="Débit offert (constant, soak, base du pic, fin de rampe)")
+    parser.add_argument("--duration", type=float, default=60, help="Durée en secondes")
+    parser.add_argument("--start-rps", type=float, default=10,
+                        help="Débit initial (rampe, paliers)")
+    parser.add_argument("--step-rps", type=float, default=50, help="Incrément par palier")
+    parser.add_argument("--step-duration", type=float, default=30, help="Durée d'un palier")
+    parser.add_argument("--steps", type=int, default=5, help="Nombre de paliers")
+    parser.add_argument("--spike-rps", type=float, default=500, help="Débit du pic")
+    parser.add_argument("--spike-start", type=float, default=20, help="Début du pic (s)")
+    parser.add_argument("--spike-duration", type=float, default=10, help="Durée du pic (s)")
+    parser.add_argument("--poisson", action="store_true",
+                        help="Arrivées de Poisson au lieu d'un espacement régulier")
+    parser.add_argument("--seed", type=int, default=42, help="Graine des arrivées et du mélange")
+
+
+def main():
+    """Point d'entrée CLI du tir en modèle ouvert"""
+    from .binary_log import add_format_arguments, output_path
+    from .distributed import add_token_argument, is_loopback, parse_address
+    from .identities import (add_identity_arguments, cleanup_from_args, identity_pattern,
+                             run_prefix)
+    from .k8s_resources import PodResourceSampler, add_resource_arguments
+    from .logger import StructuredLogger, configure_output
+    from .prometheus import MetricsScraper, add_scrape_arguments
+    from .rbac_dataset import RBACDatasetGenerator, seeded_accounts
+    from .results_store import add_store_arguments
+    from .stand_in import add_stand_in_arguments, stand_in_from_args
+
+    parser = argparse.ArgumentParser(description="Tir de charge en modèle ouvert AccessGate PoC")
+    add_profile_arguments(parser)
+    parser.add_argument("--base-url", default="http://localhost:8001")
+    parser.add_argument("--routes", type=OpenModelLoadTester.parse_route_mix,
+                        default=DEFAULT_ROUTE_MIX,
+                        help="Mélange pondéré, ex. users_list=3,roles_list=1")
+    parser.add_argument("--connections", type=int, default=200,
+                        help="Taille maximale du pool de connexions keep-alive")
+    parser.add_argument("--max-backlog", type=int, default=10000,
+                        help="Requêtes en vol au-delà desquelles les arrivées sont abandonnées")
+    parser.add_argument("--report-interval", type=float, default=10,
+                        help="Intervalle des rapports intermédiaires (s)")
+    parser.add_argument("--slo-p99", type=float, default=0.5,
+                        help="p99 corrigé maximal pour le point de saturation (s)")
+    parser.add_argument("--pool-size", type=int, default=10,
+                        help="Comptes seedés (db_seed.py) pré-authentifiés")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Processus workers (0 = un par cœur, 1 = processus unique)")
+    parser.add_argument("--agents", type=int, default=0,
+                        help="Mode coordinateur : nombre d'agents (load-agent.py) attendus")
+    parser.add_argument("--listen", default="127.0.0.1:7700",
+                        help="Adresse d'écoute du coordinateur (hôte:port ; hors boucle "
+                             "locale, --agent-token requis)")
+    add_token_argument(parser)
+    parser.add_argument("--email", help="Compte unique à la place des comptes seedés")
+    parser.add_argument("--password")
+    add_stand_in_arguments(parser)
+    add_store_arguments(parser)
+    add_scrape_arguments(parser)
+    add_resource_arguments(parser)
+    parser.add_argument("--namespace", default="accessgate-poc",
+                        help="Namespace des pods échantillonnés (--sample-resources)")
+    add_identity_arguments(parser)
+    add_format_arguments(parser)
+    parser.add_argument("--record-requests", action="store_true",
+                        help="Journaliser chaque requête (load_request_latency), "
+                             "de préférence avec --log-format binary")
+    args = parser.parse_args()
+    try:
+        args.run_prefix = run_prefix(args.identity_prefix)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.agents and not args.agent_token and not is_loopback(parse_address(args.listen)[0]):
+        # Les agents reçoivent les identifiants des comptes : pas d'écoute ouverte sans jeton
+        parser.error(f"--listen {args.listen} hors boucle locale : --agent-token requis")
+
+    configure_output(output_path("logs/load-test-results.jsonl", args.log_format))
+    logger = StructuredLogger("load_profile")
+    accounts = [(args.email, args.password)] if args.email else seeded_accounts(args.pool_size)
+
+    backend = stand_in_from_args(args, RBACDatasetGenerator(users=max(1000, args.pool_size)))
+    if backend is not None:
+        # Backend local dans un thread : mesure du générateur lui-même, sans cluster
+        args.base_url = backend.start_in_thread()
+    scraper = None
+    if args.scrape_metrics:
+        # Thread dédié : même scraper en processus unique, multi-processus ou coordinateur
+        scraper = MetricsScraper(logger, args.base_url, args.scrape_metrics)
+        if not scraper.start_in_thread():
+            scraper = None
+    sampler = None
+    if args.sample_resources and backend is None:
+        sampler = PodResourceSampler(logger, args.namespace, args.sample_resources)
+        if not sampler.start():
+            sampler = None
+    try:
+        summary = _run_from_args(args, logger, accounts)
+        if "auth_register" in args.routes:
+            cleanup_from_args(args, logger, identity_pattern(args.run_prefix), backend)
+    finally:
+        server = scraper.stop_thread() if scraper is not None else {}
+        if sampler is not None:
+            sampler.stop()
+        if backend is not None:
+            backend.stop_thread()
+
+    if summary and server:
+        # Temps de service client (envoi -> réponse) face au temps mesuré par metricsMiddleware
+        scraper.correlate(server, summary["routes"],
+                          {name: route[:2] for name, route in LOAD_ROUTES.items()},
+                          "service_time")
+    if summary and sampler is not None:
+        summary["resources"] = sampler.report(summary["total_requests"], summary["duration"])
+
+    if summary and args.store:
+        regressions = _record_results(args, summary, logger)
+        if regressions and args.fail_on_regression:
+            return 1
+    return 0 if summary else 1
+
+
+def _record_results(args: argparse.Namespace, summary: Dict, logger) -> List[Dict]:
+    """Enregistrer le tir dans la base des résultats et le comparer à sa référence"""
+    from .results_store import endpoints_from_summary, record_and_compare
+
+    # Scénario : ce qui rend deux tirs comparables (pas l'URL du substitut, port éphémère)
+    scenario = {"profile": summary["profile"], "routes": args.routes, "poisson": args.poisson,
+                "target": "stand-in" if args.stand_in else args.base_url}
+    return record_and_compare(args.store, "load_profile", scenario,
+                              endpoints_from_summary(summary), logger, args.baseline_runs,
+                              base_url=args.base_url, workers=args.workers, agents=args.agents,
+                              connections=args.connections)
+
+
+def _run_from_args(args: argparse.Namespace, logger, accounts: Sequence[Tuple[str, str]]) -> Dict:
+    """Exécuter le tir en processus unique, multi-processus ou coordinateur"""
+    tester_options = {"base_url": args.base_url, "max_connections": args.connections,
+                      "max_backlog": args.max_backlog, "report_interval": args.report_interval,
+                      "slo_p99": args.slo_p99, "record_requests": args.record_requests,
+                      "identity_prefix": args.run_prefix}
+    if "auth_register" in args.routes:
+        logger.log_event("load_identities", "Inscriptions sous un préfixe propre au tir",
+                         prefix=args.run_prefix, cleanup=args.cleanup_users)
+    if args.agents:
+        from .distributed import LoadCoordinator, parse_address
+
+        host, port = parse_address(args.listen)
+        coordinator = LoadCoordinator(logger, args.agents, host, port,
+                                      token=args.agent_token, **tester_options)
+        return asyncio.run(coordinator.run(profile_from_args(args), args.routes, accounts,
+                                           poisson=args.poisson, seed=args.seed))
+
+    if args.workers != 1:
+        from .workers import MultiProcessLoadRunner
+
+        runner = MultiProcessLoadRunner(logger, args.workers or None, **tester_options)
+        return runner.run(profile_from_args(args), args.routes, accounts,
+                          poisson=args.poisson, seed=args.seed)
+
+    tester = OpenModelLoadTester(logger, **tester_options)
+    return asyncio.run(tester.run(profile_from_args(args), args.routes, accounts,
+                                  poisson=args.poisson, seed=args.seed))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Analyse en flux des logs JSONL AccessGate PoC (soaks de plusieurs Go)
+- Lecture par mmap, une ligne à la fois : mémoire constante quelle que soit la taille
+- Comptes par component / event_type, agrégats des métriques, taux de réussite des tests
+- Découpage optionnel du fichier en tranches analysées par plusieurs processus
+- Fichiers binaires .agbin (binary_log) lus bloc par bloc, un processus par fichier
+"""
+
+import argparse
+import json
+import math
+import mmap
+import multiprocessing
+import os
+import re
+import sys
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .binary_log import is_binary_log, iter_entries
+
+# Labels distinguant les séries d'une même métrique (premier présent)
+SERIES_LABELS = ("endpoint", "app", "pod", "agent", "worker")
+
+# En-tête écrit par StructuredLogger (json.dumps, ordre des clés fixe)
+_HEADER = re.compile(rb'^\{"timestamp": "([^"\\]*)", "component": "([^"\\]*)", '
+                     rb'"event_type": "([^"\\]*)"')
+
+# Événements analysés en entier ; les autres sont comptés sur leur seul en-tête
+PARSED_EVENTS = {b"test_result", b"test_suite_complete"}
+
+# Métriques à plat (log_metric) : nom, valeur et label de série lus sans json.loads
+_METRIC = re.compile(rb'"metric_name": "([^"\\]*)", "metric_value": (-?[0-9][0-9.eE+-]*)[,}]')
+_SERIES = [(label, label.encode(), re.compile(rb'"%s": (?:"([^"\\]*)"|(-?[0-9][0-9.eE+-]*))[,}]'
+                                                 % label.encode()))
+           for label in SERIES_LABELS]
+
+# Volume lu entre deux libérations de pages du mmap
+RELEASE_SIZE = 16 * 1024 * 1024
+
+# En deçà, un seul processus : lancer des workers coûte plus que la lecture
+MIN_CHUNK_SIZE = 32 * 1024 * 1024
+
+
+class MetricAggregate:
+    """Agrégat d'une série de métrique : nombre, somme, min, max, dernière valeur"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.last: Optional[float] = None
+        self.last_timestamp = ""
+
+    def record(self, value: float, timestamp: str):
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if timestamp >= self.last_timestamp:
+            self.last, self.last_timestamp = value, timestamp
+
+    def merge(self, other: "MetricAggregate"):
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if other.last_timestamp >= self.last_timestamp:
+            self.last, self.last_timestamp = other.last, other.last_timestamp
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "last": self.last,
+        }
+
+
+class LogSummary:
+    """Résumé fusionnable d'un flux de logs (une tranche, un fichier ou plusieurs)"""
+
+    def __init__(self):
+        self.lines = 0
+        self.invalid = 0
+        self.first_timestamp: Optional[str] = None
+        self.last_timestamp: Optional[str] = None
+        self.events: Dict[Tuple[str, str], int] = {}
+        self.errors: Dict[Tuple[str, str], int] = {}
+        self.metrics: Dict[Tuple[str, str], MetricAggregate] = {}
+        # Tests : nom -> [réussis, échoués] ; suites : nombre, somme et minimum du taux
+        self.tests: Dict[str, List[int]] = {}
+        self.suites = [0, 0.0, math.inf]
+
+    def count(self, component: str, event_type: str, timestamp: str):
+        """Compter un événement (sans analyser le reste de l'entrée)"""
+        key = (component, event_type)
+        self.events[key] = self.events.get(key, 0) + 1
+        if timestamp:
+            if self.first_timestamp is None or timestamp < self.first_timestamp:
+                self.first_timestamp = timestamp
+            if self.last_timestamp is None or timestamp > self.last_timestamp:
+                self.last_timestamp = timestamp
+
+    def record_metric(self, name: str, series: str, value: float, timestamp: str):
+        """Ajouter une valeur à la série (name, series)"""
+        aggregate = self.metrics.get((name, series))
+        if aggregate is None:
+            aggregate = self.metrics[(name, series)] = MetricAggregate()
+        aggregate.record(value, timestamp)
+
+    def add(self, entry: Dict):
+        """Intégrer une entrée de log complète"""
+        event_type = str(entry.get("event_type"))
+        timestamp = entry.get("timestamp") or ""
+        key = (str(entry.get("component")), event_type)
+        self.count(*key, timestamp)
+        if entry.get("status") == "error" or entry.get("level") == "ERROR":
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+        if event_type == "metric":
+            value = entry.get("metric_value")
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                series = next((f"{label}={entry[label]}" for label in SERIES_LABELS
+                               if label in entry), "")
+                self.record_metric(str(entry.get("metric_name")), series, float(value), timestamp)
+        elif event_type == "test_result":
+            counts = self.tests.setdefault(str(entry.get("test_name")), [0, 0])
+            counts[0 if entry.get("test_status") == "PASS" else 1] += 1
+        elif event_type == "test_suite_complete":
+            rate = entry.get("success_rate")
+            if isinstance(rate, (int, float)):
+                self.suites[0] += 1
+                self.suites[1] += rate
+                self.suites[2] = min(self.suites[2], rate)
+
+    def merge(self, other: "LogSummary"):
+        """Fusionner le résumé d'une autre tranche"""
+        self.lines += other.lines
+        self.invalid += other.invalid
+        for timestamp in (other.first_timestamp, other.last_timestamp):
+            if timestamp is None:
+                continue
+            if self.first_timestamp is None or timestamp < self.first_timestamp:
+                self.first_timestamp = timestamp
+            if self.last_timestamp is None or timestamp > self.last_timestamp:
+                self.last_timestamp = timestamp
+        for key, count in other.events.items():
+            self.events[key] = self.events.get(key, 0) + count
+        for key, count in other.errors.items():
+            self.errors[key] = self.errors.get(key, 0) + count
+        for key, aggregate in other.metrics.items():
+            if key in self.metrics:
+                self.metrics[key].merge(aggregate)
+            else:
+                self.metrics[key] = aggregate
+        for name, (passed, failed) in other.tests.items():
+            counts = self.tests.setdefault(name, [0, 0])
+            counts[0] += passed
+            counts[1] += failed
+        self.suites[0] += other.suites[0]
+        self.suites[1] += other.suites[1]
+        self.suites[2] = min(self.suites[2], other.suites[2])
+
+    def to_dict(self) -> Dict:
+        """Résumé sérialisable (JSON)"""
+        passed = sum(counts[0] for counts in self.tests.values())
+        failed = sum(counts[1] for counts in self.tests.values())
+        return {
+            "lines": self.lines,
+            "invalid_lines": self.invalid,
+            "first_timestamp": self.first_timestamp,
+            "last_timestamp": self.last_timestamp,
+            "events": {f"{component}/{event_type}": count for (component, event_type), count
+                       in sorted(self.events.items(), key=lambda item: -item[1])},
+            "errors": {f"{component}/{event_type}": count for (component, event_type), count
+                       in sorted(self.errors.items(), key=lambda item: -item[1])},
+            "metrics": {f"{name}{{{series}}}" if series else name: aggregate.to_dict()
+                        for (name, series), aggregate in sorted(self.metrics.items())},
+            "tests": {
+                "passed": passed,
+                "failed": failed,
+                "pass_rate": passed / (passed + failed) * 100 if passed + failed else None,
+                "by_test": {name: {"passed": counts[0], "failed": counts[1],
+                                   "pass_rate": counts[0] / sum(counts) * 100}
+                            for name, counts in sorted(self.tests.items())},
+            },
+            "suites": {
+                "runs": self.suites[0],
+                "mean_success_rate": self.suites[1] / self.suites[0] if self.suites[0] else None,
+                "min_success_rate": self.suites[2] if self.suites[0] else None,
+            },
+        }
+
+
+def _fast_metric(line: bytes) -> Optional[Tuple[str, str, float]]:
+    """Nom, série et valeur d'une ligne log_metric à plat (None : analyse JSON complète)"""
+    if line.count(b"{") != 1:
+        return None
+    metric = _METRIC.search(line)
+    if metric is None:
+        return None
+    series = ""
+    for label, key, pattern in _SERIES:
+        if b'"' + key + b'": ' in line:
+            match = pattern.search(line)
+            if match is None:
+                return None
+            quoted, number = match.groups()
+            series = f"{label}={(number if quoted is None else quoted).decode()}"
+            break
+    return metric.group(1).decode(), series, float(metric.group(2))
+
+
+def iter_lines(data, start: int, end: int) -> Iterator[bytes]:
+    """Lignes commençant dans [start, end) d'un tampon (mmap) ; une ligne à cheval
+    sur end appartient à la tranche où elle commence"""
+    if start > 0 and data[start - 1:start] != b"\n":
+        newline = data.find(b"\n", start)
+        start = newline + 1 if newline != -1 else len(data)
+    # Pages déjà lues rendues au noyau : la mémoire résidente reste bornée (Unix)
+    release = hasattr(data, "madvise") and hasattr(mmap, "MADV_DONTNEED")
+    if release and hasattr(mmap, "MADV_SEQUENTIAL"):
+        data.madvise(mmap.MADV_SEQUENTIAL)
+    released = start - start % mmap.PAGESIZE
+    while start < end:
+        newline = data.find(b"\n", start)
+        if newline == -1:
+            newline = len(data)
+        yield data[start:newline]
+        start = newline + 1
+        if release and start - released >= RELEASE_SIZE:
+            length = (start - released) - (start - released) % mmap.PAGESIZE
+            data.madvise(mmap.MADV_DONTNEED, released, length)
+            released += length
+
+
+def summarize_range(path: str, start: int = 0, end: Optional[int] = None) -> LogSummary:
+    """Résumer les lignes d'un fichier commençant dans [start, end)"""
+    summary = LogSummary()
+    with open(path, "rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if size == 0:
+            return summary
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for line in iter_lines(data, start, size if end is None else min(end, size)):
+                line = line.rstrip()
+                if not line:
+                    continue
+                summary.lines += 1
+                # Chemin rapide : en-tête standard, entrée complète et aucune erreur signalée
+                header = _HEADER.match(line)
+                if (header is not None and line.endswith(b"}") and b'"error"' not in line
+                        and b'"ERROR"' not in line):
+                    timestamp, component, event_type = header.groups()
+                    metric = _fast_metric(line) if event_type == b"metric" else None
+                    if event_type not in PARSED_EVENTS and (metric is not None
+                                                            or event_type != b"metric"):
+                        timestamp = timestamp.decode()
+                        summary.count(component.decode(), event_type.decode(), timestamp)
+                        if metric is not None:
+                            summary.record_metric(*metric, timestamp)
+                        continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    summary.invalid += 1
+                    continue
+                if isinstance(entry, dict):
+                    summary.add(entry)
+                else:
+                    summary.invalid += 1
+    return summary
+
+
+def summarize_binary(path: str) -> LogSummary:
+    """Résumer un fichier binaire (entrées déjà décodées, pas de chemin rapide)"""
+    summary = LogSummary()
+    for entry in iter_entries(path):
+        summary.lines += 1
+        summary.add(entry)
+    return summary
+
+
+def _summarize_chunk(chunk: Tuple[str, int, int]) -> LogSummary:
+    if is_binary_log(chunk[0]):
+        return summarize_binary(chunk[0])
+    return summarize_range(*chunk)
+
+
+def summarize_files(paths: Sequence[str], workers: int = 1) -> LogSummary:
+    """Résumer un ou plusieurs fichiers JSONL (workers > 1 : tranches en parallèle)"""
+    chunks = []
+    for path in paths:
+        if is_binary_log(path):
+            # Blocs à longueur variable : pas de découpage arbitraire possible
+            chunks.append((path, 0, os.path.getsize(path)))
+            continue
+        size = os.path.getsize(path)
+        count = max(1, min(workers * 4, size // MIN_CHUNK_SIZE)) if workers > 1 else 1
+        step = math.ceil(size / count) if size else 1
+        chunks.extend((path, offset, min(offset + step, size))
+                      for offset in range(0, max(size, 1), step))
+
+    summary = LogSummary()
+    if workers <= 1 or len(chunks) == 1:
+        for chunk in chunks:
+            summary.merge(_summarize_chunk(chunk))
+        return summary
+
+    # spawn : même comportement sous Linux, macOS et Windows
+    with multiprocessing.get_context("spawn").Pool(workers) as pool:
+        for partial in pool.imap_unordered(_summarize_chunk, chunks):
+            summary.merge(partial)
+    return summary
+
+
+def print_summary(summary: Dict, top: int = 20):
+    """Affichage console du résumé"""
+    print(f"📄 {summary['lines']} lignes ({summary['invalid_lines']} invalides), "
+          f"{summary['first_timestamp']} → {summary['last_timestamp']}")
+
+    print(f"\n📊 Événements (component/event_type, {top} premiers) :")
+    for name, count in list(summary["events"].items())[:top]:
+        errors = summary["errors"].get(name)
+        print(f"   {count:>10}  {name}" + (f"  ❌ {errors} en erreur" if errors else ""))
+
+    tests = summary["tests"]
+    if tests["passed"] or tests["failed"]:
+        print(f"\n🧪 Tests : {tests['passed']} réussis, {tests['failed']} échoués "
+              f"({tests['pass_rate']:.1f} %)")
+        for name, counts in tests["by_test"].items():
+            status = "✅" if not counts["failed"] else "❌"
+            print(f"   {status} {name}: {counts['passed']}/{counts['passed'] + counts['failed']}")
+    suites = summary["suites"]
+    if suites["runs"]:
+        print(f"   Suites : {suites['runs']}, réussite moyenne {suites['mean_success_rate']:.1f} %, "
+              f"minimale {suites['min_success_rate']:.1f} %")
+
+    if summary["metrics"]:
+        print(f"\n📈 Métriques ({len(summary['metrics'])} séries) :")
+        for name, aggregate in summary["metrics"].items():
+            print(f"   {name}: n={aggregate['count']} moyenne={aggregate['mean']:.6g} "
+                  f"min={aggregate['min']:.6g} max={aggregate['max']:.6g} "
+                  f"dernière={aggregate['last']:.6g}")
+
+
+def main():
+    """Point d'entrée CLI de l'analyse des logs"""
+    parser = argparse.ArgumentParser(description="Analyse en flux des logs JSONL AccessGate PoC")
+    parser.add_argument("paths", nargs="*", default=["logs/e2e-test-results.jsonl"],
+                        help="Fichiers JSONL ou .agbin (défaut : logs/e2e-test-results.jsonl)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Processus d'analyse (0 = un par cœur, 1 = processus unique)")
+    parser.add_argument("--json", action="store_true", help="Résumé JSON sur la sortie standard")
+    parser.add_argument("--top", type=int, default=20, help="Événements affichés")
+    args = parser.parse_args()
+
+    missing = [path for path in args.paths if not os.path.isfile(path)]
+    if missing:
+        print(f"❌ Fichier(s) introuvable(s): {', '.join(missing)}", file=sys.stderr)
+        return 1
+
+    summary = summarize_files(args.paths, args.workers or os.cpu_count() or 1).to_dict()
+    if args.json:
+        json.dump(summary, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    else:
+        print_summary(summary, args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
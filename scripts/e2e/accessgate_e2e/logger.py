@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Logs structurés JSONL pour AccessGate PoC (Grafana)
+- Un seul logger pour tous les scripts E2E
+- Fichier de sortie choisi par le point d'entrée, ouvert au premier log (rien à l'import)
+- Suffixe .agbin : format binaire compact (binary_log), sinon JSONL
+"""
+
+from typing import Optional
+
+from .binary_log import BinaryLogWriter, is_binary_log
+from .jsonl_writer import BatchedJSONLWriter, utc_timestamp
+
+DEFAULT_OUTPUT = "logs/e2e-test-results.jsonl"
+
+_output_path = DEFAULT_OUTPUT
+_default_writer: Optional[BatchedJSONLWriter] = None
+
+
+def configure_output(path: str, **writer_options) -> BatchedJSONLWriter:
+    """Choisir le fichier de résultats des loggers sans écrivain explicite"""
+    global _output_path, _default_writer
+    if _default_writer is not None:
+        _default_writer.close()
+    _output_path = path
+    writer_class = BinaryLogWriter if is_binary_log(path) else BatchedJSONLWriter
+    _default_writer = writer_class(path, **writer_options)
+    return _default_writer
+
+
+def get_writer() -> BatchedJSONLWriter:
+    """Écrivain JSONL partagé (créé à la première utilisation)"""
+    global _default_writer
+    if _default_writer is None:
+        _default_writer = BatchedJSONLWriter(_output_path)
+    return _default_writer
+
+
+class StructuredLogger:
+    """Logger structuré pour Grafana"""
+
+    def __init__(self, component: str, writer: Optional[BatchedJSONLWriter] = None):
+        self.component = component
+        self._writer = writer
+
+    @property
+    def writer(self) -> BatchedJSONLWriter:
+        """Écrivain explicite, sinon écrivain partagé courant"""
+        return self._writer or get_writer()
+
+    def log_event(self, event_type: str, message: str, **kwargs):
+        """Log un événement structuré"""
+        log_entry = {
+            "timestamp": utc_timestamp(),
+            "component": self.component,
+            "event_type": event_type,
+            "message": message,
+            "level": "INFO",
+            **kwargs
+        }
+        self.writer.write(log_entry)
+
+    def log_metric(self, metric_name: str, value: float, **kwargs):
+        """Log une métrique"""
+        self.log_event("metric", f"Metric: {metric_name}",
+                       metric_name=metric_name,
+                       metric_value=value,
+                       **kwargs)
+
+    def log_test_result(self, test_name: str, status: str, duration: float, **kwargs):
+        """Log un résultat de test"""
+        self.log_event("test_result", f"Test {test_name}: {status}",
+                       test_name=test_name,
+                       test_status=status,
+                       test_duration=duration,
+                       **kwargs)
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Benchmark de pagination de /api/users (skip/take) pour AccessGate PoC
+- Parcours de toutes les pages (ou d'un échantillon régulier) à plusieurs tailles de page
+- Latence et taille de réponse par index de page, une requête à la fois
+- Ralentissement en profondeur : déciles de l'offset et pente par 1000 lignes sautées
+- Contrôle de cohérence du parcours complet (utilisateurs manquants ou vus deux fois)
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from typing import Dict, List, Sequence
+
+from .auth_bench import linear_fit, parse_counts
+from .latency import LatencyHistogram, LatencyRecorder
+
+DEFAULT_LIMITS = (10, 50, 100)
+USERS_PATH = "/api/users"
+
+# Tranches d'offset du rapport (déciles du parcours)
+DEPTH_BUCKETS = 10
+
+
+def page_indexes(pages: int, max_pages: int = 0) -> List[int]:
+    """Pages à parcourir : toutes, ou max_pages réparties de la première à la dernière"""
+    if max_pages <= 0 or pages <= max_pages:
+        return list(range(1, pages + 1))
+    if max_pages == 1:
+        return [1]
+    return sorted({1 + round(index * (pages - 1) / (max_pages - 1))
+                   for index in range(max_pages)})
+
+
+class PaginationBenchmark:
+    """Parcours séquentiel des pages de /api/users, une taille de page après l'autre"""
+
+    def __init__(self, logger, base_url: str = "http://localhost:8001", timeout: float = 30,
+                 log_pages: bool = True):
+        self.logger = logger
+        self.base_url = base_url
+        self.timeout = timeout
+        # Une métrique par page (latence, taille, offset) pour Grafana
+        self.log_pages = log_pages
+        self.recorder = LatencyRecorder()
+        self.deep: Dict[str, LatencyHistogram] = {}
+        self.durations: Dict[str, float] = {}
+        self.errors: Dict[str, int] = {}
+        # Parcours arrêté sur un 429 du rateLimiter global
+        self.rate_limited = False
+
+    async def _fetch(self, session, slot, page: int, limit: int) -> Dict:
+        """Une page : latence envoi -> corps lu, puis décodage hors mesure"""
+        url = f"{self.base_url}{USERS_PATH}?page={page}&limit={limit}"
+        sent = time.perf_counter()
+        try:
+            async with session.get(url, headers=slot.headers()) as response:
+                body = await response.read()
+                status = response.status
+        except Exception as e:
+            return {"page": page, "latency": time.perf_counter() - sent, "bytes": 0,
+                    "status": 0, "error": str(e), "data": None}
+        latency = time.perf_counter() - sent
+        try:
+            data = json.loads(body) if status == 200 else None
+        except ValueError:
+            data = None
+        return {"page": page, "latency": latency, "bytes": len(body), "status": status,
+                "data": data}
+
+    async def walk(self, session, slot, limit: int, max_pages: int = 0) -> Dict:
+        """Parcourir les pages d'une taille donnée ; retourne le rapport de cette taille"""
+        name = f"limit_{limit}"
+        # Première page hors mesure : nombre de pages et connexion établie
+        first = await self._fetch(session, slot, 1, limit)
+        if first["status"] == 429:
+            return self._rate_limited_error(limit, 1, 0)
+        if first["data"] is None:
+            self.logger.log_event("pagination_error", "Première page illisible", limit=limit,
+                                status_code=first["status"], error=first.get("error"),
+                                status="error")
+            return {}
+        pagination = first["data"]["pagination"]
+        indexes = page_indexes(pagination["pages"], max_pages)
+        if not indexes:
+            self.logger.log_event("pagination_error", "Aucun utilisateur à parcourir",
+                                limit=limit, status="error")
+            return {}
+        complete = len(indexes) == pagination["pages"]
+        self.logger.log_event("pagination_walk_start", "Parcours des pages de /api/users",
+                            limit=limit, total=pagination["total"], pages=pagination["pages"],
+                            walked=len(indexes), complete=complete)
+
+        histogram = self.recorder.histogram(name)
+        records: List[Dict] = []
+        seen: set = set()
+        listed = 0
+        started = time.perf_counter()
+        for page in indexes:
+            result = await self._fetch(session, slot, page, limit)
+            if result["status"] == 429:
+                return self._rate_limited_error(limit, page, len(records))
+            users = result["data"]["users"] if result["data"] is not None else None
+            if users is None:
+                # Page en échec : comptée en erreur, hors latences (décile profond, pente)
+                self.errors[name] = self.errors.get(name, 0) + 1
+            else:
+                histogram.record(result["latency"])
+                records.append({"page": page, "offset": (page - 1) * limit,
+                                "latency": result["latency"], "bytes": result["bytes"],
+                                "users": len(users), "status": result["status"]})
+                if complete:
+                    listed += len(users)
+                    seen.update(user["id"] for user in users)
+            if self.log_pages:
+                self.logger.log_metric("pagination_page_latency", result["latency"],
+                                       endpoint=name, page=page, offset=(page - 1) * limit,
+                                       bytes=result["bytes"],
+                                       users=len(users) if users is not None else 0,
+                                       status_code=result["status"], unit="seconds")
+        self.durations[name] = time.perf_counter() - started
+        if not records:
+            self.logger.log_event("pagination_error", "Aucune page lue avec succès", limit=limit,
+                                errors=self.errors.get(name, 0), status="error")
+            return {}
+
+        report = self._walk_report(name, limit, pagination, records, started)
+        if complete:
+            # Offset sur createdAt desc : des insertions pendant le parcours, ou des createdAt
+            # égaux (ordre non déterministe entre pages), décalent les pages. Les comptes seedés
+            # ont des createdAt distincts : un écart signale une écriture concurrente.
+            report["consistency"] = {"listed": listed, "unique": len(seen),
+                                     "duplicates": listed - len(seen),
+                                     "missing": max(0, pagination["total"] - len(seen))}
+        self.logger.log_event("pagination_walk_complete", "Parcours terminé", **report,
+                            status="success" if not self.errors.get(name) else "warning")
+        return report
+
+    def _rate_limited_error(self, limit: int, page: int, walked: int) -> Dict:
+        """Journaliser l'arrêt du parcours sur un 429 du rateLimiter global"""
+        self.rate_limited = True
+        self.logger.log_event("pagination_error", "Réponse 429 du rateLimiter global, parcours "
+                            "arrêté : relever RATE_LIMIT_MAX_REQUESTS (k8s/configmap.yaml)",
+                            limit=limit, page=page, walked=walked, status="error")
+        return {}
+
+    def _walk_report(self, name: str, limit: int, pagination: Dict, records: List[Dict],
+                     started: float) -> Dict:
+        """Latence et taille par tranche d'offset, pente du coût de l'offset"""
+        count = len(records)
+        depth = []
+        for bucket in range(min(DEPTH_BUCKETS, count)):
+            chunk = records[bucket * count // min(DEPTH_BUCKETS, count):
+                            (bucket + 1) * count // min(DEPTH_BUCKETS, count)]
+            depth.append({
+                "offset_from": chunk[0]["offset"],
+                "offset_to": chunk[-1]["offset"],
+                "pages": len(chunk),
+                "latency_mean": sum(record["latency"] for record in chunk) / len(chunk),
+                "bytes_mean": sum(record["bytes"] for record in chunk) / len(chunk),
+            })
+
+        # Dernier décile : histogramme suivi à part dans la base des résultats
+        deep = LatencyHistogram()
+        for record in records[count - max(1, count // DEPTH_BUCKETS):]:
+            deep.record(record["latency"])
+        self.deep[name] = deep
+
+        fit = linear_fit([(record["offset"], record["latency"]) for record in records])
+        elapsed = time.perf_counter() - started
+        return {
+            "limit": limit,
+            "total": pagination["total"],
+            "pages": pagination["pages"],
+            "walked": count,
+            "errors": self.errors.get(name, 0),
+            "duration": elapsed,
+            "rows_per_second": sum(record["users"] for record in records) / elapsed
+                               if elapsed > 0 else 0,
+            "latency": self.recorder.histograms[name].summary(),
+            "bytes_mean": sum(record["bytes"] for record in records) / count,
+            "depth": depth,
+            "deep_slowdown": (depth[-1]["latency_mean"] / depth[0]["latency_mean"]
+                              if depth and depth[0]["latency_mean"] > 0 else None),
+            "cost_per_1k_offset": fit["slope"] * 1000 if fit else None,
+            "fit_r2": fit["r2"] if fit else None,
+        }
+
+    async def run(self, accounts: Sequence, limits: Sequence[int] = DEFAULT_LIMITS,
+                  max_pages: int = 0) -> Dict:
+        """Parcourir chaque taille de page avec un compte pré-authentifié"""
+        try:
+            import aiohttp
+        except ImportError:
+            self.logger.log_event("pagination_import", "aiohttp non installé", status="error")
+            return {}
+        from .token_pool import TokenPool
+
+        reports = {}
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=1),
+                                         timeout=timeout) as session, \
+                aiohttp.ClientSession(timeout=timeout) as auth_session:
+            pool = TokenPool(self.logger, self.base_url)
+            if not await pool.fill(auth_session, accounts[:1]):
+                return {}
+            # Parcours profonds : le token d'accès (15 min) est rafraîchi en tâche de fond
+            pool.start(auth_session)
+            slot = pool.acquire()
+            try:
+                for limit in limits:
+                    report = await self.walk(session, slot, limit, max_pages)
+                    if self.rate_limited:
+                        # Les tailles suivantes ne mesureraient que le limiteur
+                        return {}
+                    if report:
+                        reports[f"limit_{limit}"] = report
+            finally:
+                await pool.stop()
+
+        for name, report in reports.items():
+            if report["deep_slowdown"] is not None:
+                self.logger.log_metric("pagination_deep_slowdown", report["deep_slowdown"],
+                                       endpoint=name)
+            if report["cost_per_1k_offset"] is not None:
+                self.logger.log_metric("pagination_cost_per_1k_offset",
+                                       report["cost_per_1k_offset"], endpoint=name,
+                                       unit="seconds")
+            self.logger.log_metric("pagination_bytes_mean", report["bytes_mean"], endpoint=name,
+                                   unit="bytes")
+        self.recorder.log_summary(self.logger, prefix="pagination_latency")
+        return reports
+
+    def store_endpoints(self) -> Dict[str, Dict]:
+        """Parcours complet et dernier décile par taille, au format de results_store"""
+        endpoints = {}
+        for name, histogram in self.recorder.histograms.items():
+            errors = self.errors.get(name, 0)
+            duration = self.durations.get(name)
+            endpoints[name] = {"requests": histogram.count, "errors": errors,
+                               "duration": duration, "histogram": histogram}
+            deep = self.deep.get(name)
+            if deep is not None and deep.count:
+                endpoints[f"{name}_deep"] = {"requests": deep.count, "errors": 0,
+                                             "duration": None, "histogram": deep}
+        return endpoints
+
+
+def print_report(reports: Dict[str, Dict]):
+    """Tableau console : latence en surface et en profondeur par taille de page"""
+    print(f"\n{'taille':>7} {'pages':>7} {'p50':>9} {'p99':>9} {'1er déc.':>9} "
+          f"{'dernier':>9} {'x':>6} {'/1k off.':>9} {'octets':>8}")
+    for report in reports.values():
+        latency, depth = report["latency"], report["depth"]
+        slowdown = report["deep_slowdown"]
+        cost = report["cost_per_1k_offset"]
+        print(f"{report['limit']:>7} {report['walked']:>7} {latency['p50'] * 1000:>7.2f}ms "
+              f"{latency['p99'] * 1000:>7.2f}ms {depth[0]['latency_mean'] * 1000:>7.2f}ms "
+              f"{depth[-1]['latency_mean'] * 1000:>7.2f}ms "
+              f"{slowdown if slowdown is not None else 0:>6.2f} "
+              f"{(cost or 0) * 1e6:>7.1f}µs {report['bytes_mean']:>8.0f}")
+        consistency = report.get("consistency")
+        if consistency and (consistency["duplicates"] or consistency["missing"]):
+            print(f"        ⚠️  {consistency['duplicates']} doublon(s), "
+                  f"{consistency['missing']} manquant(s) sur le parcours")
+
+
+def main():
+    """Point d'entrée CLI du benchmark de pagination"""
+    from .db_seed import BulkSeeder
+    from .logger import StructuredLogger, configure_output
+    from .rbac_dataset import add_dataset_arguments, generator_from_args, seeded_accounts
+    from .results_store import add_store_arguments, record_and_compare
+    from .stand_in import add_stand_in_arguments, stand_in_from_args
+
+    parser = argparse.ArgumentParser(description="Benchmark de pagination /api/users "
+                                                 "AccessGate PoC")
+    parser.add_argument("--base-url", default="http://localhost:8001")
+    parser.add_argument("--limits", type=parse_counts, default=DEFAULT_LIMITS,
+                        help="Tailles de page parcourues, ex. 10,50,100")
+    parser.add_argument("--max-pages", type=int, default=0,
+                        help="Pages par taille, réparties sur tout le parcours (0 = toutes)")
+    parser.add_argument("--no-page-metrics", action="store_true",
+                        help="Ne pas journaliser une métrique par page")
+    parser.add_argument("--email", help="Compte du parcours (défaut : premier compte seedé)")
+    parser.add_argument("--password")
+    parser.add_argument("--seed-db", action="store_true",
+                        help="Seeder le jeu RBAC avant le parcours (db_seed)")
+    parser.add_argument("--namespace", default="accessgate-poc")
+    parser.add_argument("--database", default="accessgate")
+    parser.add_argument("--db-port", type=int, help="Port postgres forwardé (sinon kubectl exec)")
+    add_dataset_arguments(parser)
+    parser.set_defaults(users=10000)
+    add_stand_in_arguments(parser)
+    add_store_arguments(parser)
+    args = parser.parse_args()
+
+    configure_output("logs/pagination-bench-results.jsonl")
+    logger = StructuredLogger("pagination_bench")
+    dataset = generator_from_args(args)
+    accounts = ([(args.email, args.password)] if args.email
+                else seeded_accounts(1, args.prefix))
+
+    if args.seed_db and not args.stand_in:
+        logger.log_event("db_seed_dataset", "Jeu RBAC généré", **dataset.describe())
+        try:
+            BulkSeeder(logger, namespace=args.namespace, database=args.database,
+                       port=args.db_port).seed(dataset.tables())
+        except (RuntimeError, subprocess.CalledProcessError, FileNotFoundError) as e:
+            logger.log_event("pagination_error", "Seed du jeu impossible", error=str(e),
+                             status="error")
+            return 1
+
+    backend = stand_in_from_args(args, dataset)
+    if backend is not None:
+        args.base_url = backend.start_in_thread()
+    bench = PaginationBenchmark(logger, args.base_url, log_pages=not args.no_page_metrics)
+    try:
+        reports = asyncio.run(bench.run(accounts, args.limits, args.max_pages))
+    finally:
+        if backend is not None:
+            backend.stop_thread()
+    if not reports:
+        return 1
+    print_report(reports)
+
+    if args.store:
+        scenario = {"limits": list(args.limits), "max_pages": args.max_pages, "users": args.users,
+                    "target": "stand-in" if args.stand_in else args.base_url}
+        regressions = record_and_compare(args.store, "pagination_bench", scenario,
+                                         bench.store_endpoints(), logger, args.baseline_runs,
+                                         base_url=args.base_url)
+        if regressions and args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Sondes de disponibilité des port-forwards pour AccessGate PoC
+- Connexion TCP puis requête HTTP avec backoff exponentiel
+- Échec immédiat (stderr kubectl) si le tunnel meurt
+- stderr de kubectl lu en continu : le tube ne se remplit jamais pendant un long tir
+"""
+
+import socket
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from typing import Optional
+
+
+class PortForwardError(RuntimeError):
+    """Tunnel kubectl port-forward inutilisable"""
+
+
+class StderrDrain:
+    """Lecture du stderr d'un processus dans un thread démon
+
+    kubectl écrit une ligne par connexion en échec : non lu, le tube plein bloquerait
+    le tunnel. Seules les dernières lignes sont gardées (message d'erreur).
+    """
+
+    def __init__(self, process: subprocess.Popen, max_lines: int = 50):
+        self.lines = deque(maxlen=max_lines)
+        self.thread = threading.Thread(target=self._read, args=(process.stderr,), daemon=True)
+        self.thread.start()
+
+    def _read(self, stream):
+        for line in iter(stream.readline, b""):
+            if isinstance(line, bytes):
+                line = line.decode(errors="replace")
+            self.lines.append(line.rstrip())
+
+    def text(self) -> str:
+        """Dernières lignes lues (après la fin du processus : jusqu'à la fin du flux)"""
+        self.thread.join(timeout=1)
+        return "\n".join(self.lines)
+
+
+def wait_for_tunnel(process: subprocess.Popen, port: int, path: Optional[str] = "/health",
+                    host: str = "127.0.0.1", timeout: float = 30,
+                    initial_delay: float = 0.05, max_delay: float = 1.0,
+                    stderr: Optional[StderrDrain] = None) -> float:
+    """Attendre qu'un port-forward réponde ; retourne le délai d'ouverture (secondes)
+
+    stderr : lecteur déjà attaché au processus (sinon stderr est lu à sa fin).
+    """
+    start_time = time.perf_counter()
+    delay = initial_delay
+    last_error = None
+
+    while True:
+        if process.poll() is not None:
+            if stderr is not None:
+                output = stderr.text()
+            else:
+                output = process.stderr.read() if process.stderr else b""
+            if isinstance(output, bytes):
+                output = output.decode(errors="replace")
+            raise PortForwardError(
+                f"kubectl port-forward terminé (code {process.returncode}) : {output.strip()}"
+            )
+
+        try:
+            with socket.create_connection((host, port), timeout=max_delay):
+                pass
+            if path is None:
+                return time.perf_counter() - start_time
+            with urllib.request.urlopen(f"http://{host}:{port}{path}",
+                                        timeout=max_delay * 5) as response:
+                if response.status < 500:
+                    return time.perf_counter() - start_time
+                last_error = f"HTTP {response.status}"
+        except urllib.error.HTTPError as e:
+            if e.code < 500:
+                return time.perf_counter() - start_time
+            last_error = f"HTTP {e.code}"
+        except OSError as e:
+            last_error = str(e)
+
+        if time.perf_counter() - start_time + delay > timeout:
+            raise PortForwardError(f"Port {port} indisponible après {timeout}s : {last_error}")
+        time.sleep(delay)
+        delay = min(delay * 2, max_delay)
@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""
+Métriques Prometheus du backend AccessGate PoC (/api/metrics/metrics) pendant un tir
+- Scraping périodique en tâche de fond (boucle courante ou thread dédié)
+- Format texte d'exposition analysé ligne à ligne, au fil de la réponse
+- Deltas par intervalle : débits des compteurs, histogrammes de latence serveur, process
+- Latence serveur (metricsMiddleware) rapprochée de la latence client par route
+"""
+
+import argparse
+import asyncio
+import math
+import re
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+METRICS_PATH = "/api/metrics/metrics"
+
+# Familles lues : backend/src/utils/metrics.ts et métriques par défaut de prom-client
+DEFAULT_FAMILIES = (
+    "http_request_duration_seconds",
+    "auth_attempts_total",
+    "rbac_operations_total",
+    "errors_total",
+    "active_connections",
+    "process_cpu_seconds_total",
+    "process_resident_memory_bytes",
+    "nodejs_eventloop_lag_seconds",
+    "nodejs_heap_size_used_bytes",
+)
+
+# Histogramme de latence de metricsMiddleware (labels method, route, status_code)
+DURATION_FAMILY = "http_request_duration_seconds"
+
+# Compteurs rapportés en débit par labels
+RATE_FAMILIES = ("auth_attempts_total", "rbac_operations_total", "errors_total")
+
+# Clé d'un échantillon : nom, labels triés
+SampleKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+_LABEL = re.compile(r'\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*"((?:[^"\\]|\\.)*)"\s*,?')
+_UNESCAPE = {"\\\\": "\\", '\\"': '"', "\\n": "\n"}
+
+
+def _unescape(value: str) -> str:
+    if "\\" not in value:
+        return value
+    return re.sub(r'\\[\\"n]', lambda match: _UNESCAPE[match.group(0)], value)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def parse_sample(line: str) -> Optional[Tuple[str, Tuple[Tuple[str, str], ...], float]]:
+    """Ligne d'échantillon : nom, labels triés, valeur (None pour les commentaires)"""
+    line = line.strip()
+    if not line or line[0] == "#":
+        return None
+    brace = line.find("{")
+    space = line.find(" ")
+    if brace == -1 or (space != -1 and space < brace):
+        name, rest = line[:space], line[space:]
+        labels = ()
+    else:
+        name = line[:brace]
+        pairs = []
+        position = brace + 1
+        while line[position:position + 1] != "}":
+            match = _LABEL.match(line, position)
+            if match is None:
+                raise ValueError(f"Labels invalides: {line}")
+            pairs.append((match.group(1), _unescape(match.group(2))))
+            position = match.end()
+        labels = tuple(sorted(pairs))
+        rest = line[position + 1:]
+    # Horodatage optionnel après la valeur : ignoré
+    return name, labels, float(rest.split()[0])
+
+
+def parse_exposition(lines: Iterable[str], families: Optional[Sequence[str]] = None
+                     ) -> Iterator[Tuple[str, str, Tuple[Tuple[str, str], ...], float]]:
+    """Échantillons des familles demandées : famille, nom, labels, valeur
+
+    Les lignes sont consommées une à une (corps de réponse lu en flux) ; les familles
+    non demandées sont écartées sur leur nom, avant l'analyse des labels.
+    """
+    wanted = None
+    if families is not None:
+        wanted = {}
+        for family in families:
+            for suffix in ("", "_bucket", "_sum", "_count"):
+                wanted[family + suffix] = family
+    for line in lines:
+        if not line or line[0] == "#":
+            continue
+        end = len(line)
+        for separator in ("{", " "):
+            index = line.find(separator)
+            if index != -1:
+                end = min(end, index)
+        name = line[:end]
+        family = wanted.get(name) if wanted is not None else name
+        if family is None:
+            continue
+        sample = parse_sample(line)
+        if sample is not None:
+            yield (family, *sample)
+
+
+def express_route_label(path: str) -> str:
+    """Label route de metricsMiddleware pour un chemin d'API
+
+    req.route.path est relatif au routeur Express : /api/users -> "/",
+    /api/users/{user_id} -> "/:id", /api/auth/login -> "/login" ; /health reste tel quel.
+    """
+    path = path.split("?", 1)[0]
+    parts = path.strip("/").split("/")
+    if parts[0] == "api" and len(parts) >= 2:
+        parts = parts[2:]
+    label = "/" + "/".join(re.sub(r"^\{\w+\}$", ":id", part) for part in parts)
+    return label
+
+
+class MetricsSnapshot:
+    """Échantillons d'un scrape, horodatés (perf_counter)"""
+
+    def __init__(self, timestamp: float):
+        self.timestamp = timestamp
+        self.samples: Dict[SampleKey, float] = {}
+        self.families: Dict[SampleKey, str] = {}
+
+    def add(self, family: str, name: str, labels: Tuple[Tuple[str, str], ...], value: float):
+        self.samples[(name, labels)] = value
+        self.families[(name, labels)] = family
+
+    def delta(self, previous: "MetricsSnapshot") -> Dict[SampleKey, float]:
+        """Accroissements depuis previous (compteurs et histogrammes)
+
+        Un compteur qui décroît a été remis à zéro (redémarrage du pod) :
+        l'accroissement est alors la valeur courante.
+        """
+        deltas = {}
+        for key, value in self.samples.items():
+            before = previous.samples.get(key, 0.0)
+            deltas[key] = value - before if value >= before else value
+        return deltas
+
+
+class ServerHistogram:
+    """Histogramme cumulatif Prometheus (bornes le) reconstruit depuis un delta"""
+
+    def __init__(self):
+        self.buckets: Dict[float, float] = {}
+        self.sum = 0.0
+        self.count = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, quantile: float) -> float:
+        """Estimation linéaire dans le bucket (comme histogram_quantile de PromQL)"""
+        if not self.count:
+            return 0.0
+        rank = quantile * self.count
+        lower, below = 0.0, 0.0
+        for bound in sorted(self.buckets):
+            cumulative = self.buckets[bound]
+            if cumulative >= rank:
+                if math.isinf(bound):
+                    return lower
+                if cumulative == below:
+                    return bound
+                return lower + (bound - lower) * (rank - below) / (cumulative - below)
+            lower, below = bound, cumulative
+        return lower
+
+    def upper_bound(self, quantile: float) -> Optional[float]:
+        """Borne supérieure du bucket contenant le quantile (None au-delà du dernier)"""
+        rank = quantile * self.count
+        for bound in sorted(self.buckets):
+            if self.buckets[bound] >= rank:
+                return None if math.isinf(bound) else bound
+        return None
+
+    def to_dict(self, elapsed: float) -> Dict:
+        return {
+            "requests": self.count,
+            "throughput_rps": self.count / elapsed if elapsed > 0 else 0,
+            "mean": self.mean,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            # Buckets du backend grossiers (0.1 s au minimum) : borne réellement mesurée
+            "p99_le": self.upper_bound(0.99),
+        }
+
+
+def server_breakdown(deltas: Dict[SampleKey, float], snapshot: MetricsSnapshot,
+                     elapsed: float) -> Dict:
+    """Résumé serveur d'un intervalle : latence par route, débits, process"""
+    routes: Dict[str, ServerHistogram] = {}
+    status_codes: Dict[str, Dict[str, float]] = {}
+    counters: Dict[str, Dict[str, float]] = {}
+    gauges: Dict[str, float] = {}
+
+    for key, value in deltas.items():
+        name, labels = key
+        family = snapshot.families[key]
+        if family == DURATION_FAMILY:
+            label_map = dict(labels)
+            route = f"{label_map.get('method', '')} {label_map.get('route', '')}"
+            histogram = routes.setdefault(route, ServerHistogram())
+            if name.endswith("_bucket"):
+                bound = float(label_map["le"])
+                histogram.buckets[bound] = histogram.buckets.get(bound, 0.0) + value
+            elif name.endswith("_sum"):
+                histogram.sum += value
+            elif name.endswith("_count"):
+                histogram.count += value
+                if value:
+                    codes = status_codes.setdefault(route, {})
+                    code = label_map.get("status_code", "")
+                    codes[code] = codes.get(code, 0.0) + value
+        elif family in RATE_FAMILIES:
+            label_text = ",".join(f"{label}={label_value}" for label, label_value in labels)
+            if value:
+                counters.setdefault(name, {})[label_text] = value / elapsed if elapsed > 0 else 0
+        elif family == "process_cpu_seconds_total":
+            # Cœurs consommés en moyenne sur l'intervalle
+            gauges["process_cpu_cores"] = value / elapsed if elapsed > 0 else 0
+        elif not labels:
+            gauges[name] = snapshot.samples[key]
+
+    return {
+        "routes": {route: {**histogram.to_dict(elapsed), "status_codes": status_codes.get(route, {})}
+                   for route, histogram in sorted(routes.items()) if histogram.count},
+        "histograms": routes,
+        "counters": counters,
+        "process": gauges,
+    }
+
+
+def correlate_latency(server_routes: Dict[str, ServerHistogram], client_routes: Dict[str, Dict],
+                      client_paths: Dict[str, Tuple[str, str]],
+                      timing_key: str = "latency") -> Dict[str, Dict]:
+    """Rapprocher latence serveur et latence client par route Express
+
+    client_paths : nom client -> (méthode, chemin). Plusieurs routes client peuvent
+    partager un label serveur (GET / pour /api/users, /api/roles, /api/permissions) :
+    elles sont alors agrégées. L'écart des moyennes isole réseau, port-forward et
+    attente côté client du temps applicatif.
+    """
+    groups: Dict[str, List[str]] = {}
+    for name in client_routes:
+        if name in client_paths:
+            method, path = client_paths[name]
+            groups.setdefault(f"{method} {express_route_label(path)}", []).append(name)
+
+    correlation = {}
+    for route, names in sorted(groups.items()):
+        server = server_routes.get(route)
+        timings = [client_routes[name][timing_key] for name in names]
+        client_count = sum(timing["count"] for timing in timings)
+        if not server or not server.count or not client_count:
+            continue
+        client_mean = sum(timing["mean"] * timing["count"] for timing in timings) / client_count
+        correlation[route] = {
+            "client_routes": names,
+            "client_requests": client_count,
+            "server_requests": server.count,
+            "client_mean": client_mean,
+            "server_mean": server.mean,
+            "overhead_mean": client_mean - server.mean,
+            "server_share": server.mean / client_mean if client_mean > 0 else 0,
+            "client_p99": max(timing["p99"] for timing in timings),
+            "server_p99_le": server.upper_bound(0.99),
+        }
+    return correlation
+
+
+class MetricsScraper:
+    """Scraping périodique de /api/metrics/metrics pendant un tir
+
+    Le premier scrape sert de référence : les deltas couvrent exactement le tir.
+    Les scrapes passent par le rateLimiter global du backend comme toute requête.
+    """
+
+    def __init__(self, logger, base_url: str = "http://localhost:8001",
+                 interval: float = 5.0, path: str = METRICS_PATH,
+                 families: Sequence[str] = DEFAULT_FAMILIES, timeout: float = 5):
+        self.logger = logger
+        self.base_url = base_url
+        self.interval = interval
+        self.path = path
+        self.families = families
+        self.timeout = timeout
+        self.first: Optional[MetricsSnapshot] = None
+        self.last: Optional[MetricsSnapshot] = None
+        self.intervals: List[Dict] = []
+        self.failures = 0
+        self._session = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._summary: Dict = {}
+
+    async def scrape(self) -> Optional[MetricsSnapshot]:
+        """Un scrape : corps lu et analysé ligne à ligne"""
+        snapshot = MetricsSnapshot(time.perf_counter())
+        try:
+            async with self._session.get(self.base_url + self.path) as response:
+                if response.status != 200:
+                    raise ValueError(f"HTTP {response.status}")
+                lines = []
+                async for raw in response.content:
+                    lines.append(raw.decode("utf-8", "replace"))
+                    # Analyse par lots de lignes reçues : pas de corps complet en mémoire
+                    if len(lines) >= 256:
+                        for sample in parse_exposition(lines, self.families):
+                            snapshot.add(*sample)
+                        lines = []
+                for sample in parse_exposition(lines, self.families):
+                    snapshot.add(*sample)
+        except Exception as e:
+            self.failures += 1
+            self.logger.log_event("server_metrics_error", "Scrape /metrics échoué",
+                                url=self.base_url + self.path, error=str(e) or type(e).__name__,
+                                status="warning")
+            return None
+        return snapshot
+
+    def _record(self, snapshot: MetricsSnapshot):
+        """Intégrer un scrape : intervalle depuis le précédent"""
+        if self.first is None:
+            self.first = self.last = snapshot
+            return
+        elapsed = snapshot.timestamp - self.last.timestamp
+        breakdown = server_breakdown(snapshot.delta(self.last), snapshot, elapsed)
+        interval = {"offset": self.last.timestamp - self.first.timestamp, "duration": elapsed,
+                    **{key: value for key, value in breakdown.items() if key != "histograms"}}
+        self.intervals.append(interval)
+        self.last = snapshot
+        self.logger.log_event("server_metrics_interval", "Intervalle métriques serveur",
+                            offset=interval["offset"], duration=elapsed,
+                            routes={route: {"throughput_rps": stats["throughput_rps"],
+                                            "mean": stats["mean"], "p99": stats["p99"]}
+                                    for route, stats in interval["routes"].items()},
+                            counters=interval["counters"], process=interval["process"])
+
+    async def _run(self):
+        next_scrape = time.perf_counter() + self.interval
+        while True:
+            await asyncio.sleep(max(0.0, next_scrape - time.perf_counter()))
+            next_scrape += self.interval
+            snapshot = await self.scrape()
+            if snapshot is not None:
+                self._record(snapshot)
+
+    async def start(self) -> bool:
+        """Scrape de référence puis scraping périodique dans la boucle courante"""
+        try:
+            import aiohttp
+        except ImportError:
+            self.logger.log_event("server_metrics_import", "aiohttp non installé",
+                                status="error")
+            return False
+
+        self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+        snapshot = await self.scrape()
+        if snapshot is not None:
+            self._record(snapshot)
+        self.logger.log_event("server_metrics_start", "Scraping des métriques serveur",
+                            url=self.base_url + self.path, interval=self.interval,
+                            families=list(self.families))
+        self._task = asyncio.create_task(self._run())
+        return True
+
+    async def stop(self) -> Dict:
+        """Dernier scrape, arrêt et résumé sur toute la durée"""
+        if self._task is None:
+            return {}
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        snapshot = await self.scrape()
+        if snapshot is not None:
+            self._record(snapshot)
+        await self._session.close()
+        return self.summary()
+
+    def summary(self) -> Dict:
+        """Deltas entre le premier et le dernier scrape"""
+        if self.first is None or self.last is self.first:
+            self.logger.log_event("server_metrics_complete", "Métriques serveur insuffisantes",
+                                scrapes=len(self.intervals) + (self.first is not None),
+                                failures=self.failures, status="warning")
+            return {}
+        elapsed = self.last.timestamp - self.first.timestamp
+        breakdown = server_breakdown(self.last.delta(self.first), self.last, elapsed)
+        self.logger.log_event("server_metrics_complete", "Métriques serveur du tir",
+                            duration=elapsed, scrapes=len(self.intervals) + 1,
+                            failures=self.failures, routes=breakdown["routes"],
+                            counters=breakdown["counters"], process=breakdown["process"])
+        for route, stats in breakdown["routes"].items():
+            self.logger.log_metric("server_latency_mean", stats["mean"], endpoint=route,
+                                 unit="seconds")
+            self.logger.log_metric("server_throughput_rps", stats["throughput_rps"],
+                                 endpoint=route)
+        return {"duration": elapsed, "intervals": self.intervals, "failures": self.failures,
+                **breakdown}
+
+    def correlate(self, server: Dict, client_routes: Dict[str, Dict],
+                  client_paths: Dict[str, Tuple[str, str]],
+                  timing_key: str = "latency") -> Dict[str, Dict]:
+        """Journaliser le rapprochement latence serveur / latence client"""
+        if not server:
+            return {}
+        correlation = correlate_latency(server["histograms"], client_routes, client_paths,
+                                        timing_key)
+        for route, entry in correlation.items():
+            self.logger.log_metric("client_latency_mean", entry["client_mean"], endpoint=route,
+                                 unit="seconds")
+            self.logger.log_metric("network_overhead_mean", entry["overhead_mean"],
+                                 endpoint=route, unit="seconds")
+        self.logger.log_event("latency_correlation", "Latence serveur vs client",
+                            timing=timing_key, routes=correlation)
+        return correlation
+
+    def start_in_thread(self, timeout: float = 30) -> bool:
+        """Scraper dans un thread dédié (tirs multi-processus ou distribués)"""
+        ready = threading.Event()
+        started = []
+
+        def scrape():
+            self._loop = asyncio.new_event_loop()
+            started.append(self._loop.run_until_complete(self.start()))
+            ready.set()
+            if started[0]:
+                self._loop.run_forever()
+                self._summary = self._loop.run_until_complete(self.stop())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=scrape, name="metrics-scraper", daemon=True)
+        self._thread.start()
+        ready.wait(timeout)
+        return bool(started and started[0])
+
+    def stop_thread(self) -> Dict:
+        """Arrêter le scraper lancé par start_in_thread() ; retourne le résumé"""
+        if self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=self.timeout + 10)
+            self._thread = None
+        return self._summary
+
+
+def add_scrape_arguments(parser: argparse.ArgumentParser):
+    """Option CLI du scraping des métriques serveur"""
+    parser.add_argument("--scrape-metrics", nargs="?", type=float, const=5.0, default=None,
+                        metavar="INTERVAL",
+                        help=f"Scraper {METRICS_PATH} pendant le tir (intervalle en s, défaut 5)")
+
+
+def render_exposition(families: Dict[str, Tuple[str, str, List[Tuple[str, Dict[str, str], float]]]]
+                      ) -> str:
+    """Format texte d'exposition : nom -> (type, aide, [(suffixe, labels, valeur)])"""
+    lines = []
+    for name, (metric_type, help_text, samples) in families.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for suffix, labels, value in samples:
+            label_text = ",".join(f'{label}="{_escape(label_value)}"'
+                                  for label, label_value in labels.items())
+            label_text = "{" + label_text + "}" if label_text else ""
+            value_text = "+Inf" if value == math.inf else repr(float(value))
+            lines.append(f"{name}{suffix}{label_text} {value_text}")
+    return "\n".join(lines) + "\n"
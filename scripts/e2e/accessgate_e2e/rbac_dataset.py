@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Générateur de jeux de données RBAC synthétiques pour AccessGate PoC
+- Déterministe : même graine, mêmes utilisateurs, rôles, permissions et affectations
+- Fan-out configurable (rôles par utilisateur, permissions par rôle)
+- Production en flux (CSV ou entrée COPY), sans garder le jeu en mémoire
+"""
+
+import argparse
+import csv
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence, Tuple, Union
+
+# Mot de passe commun des utilisateurs générés (hash bcrypt 12 tours, comme AuthService)
+SEED_PASSWORD = "LoadTest123!"
+SEED_PASSWORD_HASH = "$2a$12$qhdyp7GtUVmwqK9G3qo4ROhZJ6EqLIHIWbpCDIdHyzA/oBawgmt9."
+
+# Espace de noms des UUID déterministes (un même email donne toujours le même id)
+SEED_NAMESPACE = uuid.UUID("8d3c5a52-6f0e-4c43-9a55-2f1f4bbf5e10")
+
+# Colonnes du schéma Prisma (backend/prisma/schema.prisma), dans l'ordre des clés étrangères
+TABLE_COLUMNS = {
+    "users": ["id", "email", "password", "firstName", "lastName", "isActive",
+              "createdAt", "updatedAt"],
+    "roles": ["id", "name", "description", "isActive", "createdAt", "updatedAt"],
+    "permissions": ["id", "name", "resource", "action", "description", "createdAt"],
+    "role_permissions": ["roleId", "permissionId", "assignedAt"],
+    "user_roles": ["userId", "roleId", "assignedAt", "assignedBy"],
+}
+
+# Horodatage fixe des lignes générées (sorties identiques d'une exécution à l'autre)
+DATASET_TIMESTAMP = "2025-01-01T00:00:00"
+
+# Actions des permissions générées (resource.action, comme backend/src/scripts/seed.ts)
+PERMISSION_ACTIONS = ("read", "write", "delete", "admin")
+
+FanOut = Union[int, Tuple[int, int]]
+
+
+def seed_uuid(kind: str, key) -> str:
+    """UUID déterministe d'une entité générée"""
+    return str(uuid.uuid5(SEED_NAMESPACE, f"{kind}:{key}"))
+
+
+def seeded_accounts(count: int, prefix: str = "bench") -> List[Tuple[str, str]]:
+    """Identifiants (email, mot de passe) des N premiers comptes générés"""
+    return [(f"{prefix}-{index}@accessgate.com", SEED_PASSWORD) for index in range(count)]
+
+
+def parse_fan_out(value: str) -> FanOut:
+    """Fan-out CLI : "5" (fixe) ou "1:10" (intervalle inclusif)"""
+    if ":" in value:
+        low, high = value.split(":", 1)
+        return int(low), int(high)
+    return int(value)
+
+
+class RBACDatasetGenerator:
+    """Graphe RBAC synthétique : utilisateurs -> rôles -> permissions"""
+
+    def __init__(self, users: int = 1000, roles: int = 10, permissions: int = 40,
+                 roles_per_user: FanOut = (1, 3), permissions_per_role: FanOut = (1, 10),
+                 seed: int = 42, prefix: str = "bench",
+                 grant: Sequence[str] = ("user.read", "role.read")):
+        self.users = users
+        self.roles = roles
+        self.permissions = permissions
+        self.roles_per_user = self._bounds(roles_per_user, roles)
+        self.permissions_per_role = self._bounds(permissions_per_role, permissions)
+        self.seed = seed
+        self.prefix = prefix
+        # Permissions réelles accordées à chaque rôle (accès aux routes protégées)
+        self.grant = list(grant)
+        self.now = DATASET_TIMESTAMP
+
+    @staticmethod
+    def _bounds(fan_out: FanOut, population: int) -> Tuple[int, int]:
+        """Normaliser un fan-out en intervalle borné par la population"""
+        low, high = (fan_out, fan_out) if isinstance(fan_out, int) else fan_out
+        if low > high or low < 0:
+            raise ValueError(f"Fan-out invalide: {fan_out}")
+        return min(low, population), min(high, population)
+
+    def _rng(self, kind: str, index: int) -> random.Random:
+        """Générateur pseudo-aléatoire propre à une entité (reproductible, sans état global)"""
+        return random.Random(f"{self.seed}:{self.prefix}:{kind}:{index}")
+
+    def user_email(self, index: int) -> str:
+        """Email de l'utilisateur généré n°index"""
+        return f"{self.prefix}-{index}@accessgate.com"
+
+    def role_name(self, index: int) -> str:
+        """Nom du rôle généré n°index"""
+        return f"{self.prefix}-role-{index}"
+
+    def permission_name(self, index: int) -> str:
+        """Nom (resource.action) de la permission générée n°index"""
+        resource = f"{self.prefix}-resource-{index // len(PERMISSION_ACTIONS)}"
+        return f"{resource}.{PERMISSION_ACTIONS[index % len(PERMISSION_ACTIONS)]}"
+
+    def user_created_at(self, index: int) -> str:
+        """createdAt de l'utilisateur généré n°index : une seconde de moins par index
+
+        Distinct et décroissant : l'ordre createdAt desc de UserService.getUsers est total
+        (pagination stable) et suit l'ordre des index.
+        """
+        created = datetime.fromisoformat(self.now) - timedelta(seconds=index)
+        return created.isoformat(timespec="seconds")
+
+    def user_ids(self) -> Iterator[str]:
+        """Ids des utilisateurs générés"""
+        for index in range(self.users):
+            yield seed_uuid("user", self.user_email(index))
+
+    def role_indexes(self, user_index: int) -> Sequence[int]:
+        """Rôles affectés à un utilisateur"""
+        rng = self._rng("user_roles", user_index)
+        return rng.sample(range(self.roles), rng.randint(*self.roles_per_user))
+
+    def permission_indexes(self, role_index: int) -> Sequence[int]:
+        """Permissions générées accordées à un rôle"""
+        rng = self._rng("role_permissions", role_index)
+        return rng.sample(range(self.permissions), rng.randint(*self.permissions_per_role))
+
+    def user_rows(self) -> Iterator[Tuple]:
+        """Lignes de la table users"""
+        for index in range(self.users):
+            email = self.user_email(index)
+            created = self.user_created_at(index)
+            yield (seed_uuid("user", email), email, SEED_PASSWORD_HASH,
+                   "Bench", f"User{index}", True, created, created)
+
+    def role_rows(self) -> Iterator[Tuple]:
+        """Lignes de la table roles"""
+        for index in range(self.roles):
+            name = self.role_name(index)
+            yield (seed_uuid("role", name), name, f"Rôle généré {index}", True,
+                   self.now, self.now)
+
+    def permission_rows(self) -> Iterator[Tuple]:
+        """Lignes de la table permissions (permissions accordées puis générées)"""
+        for name in self.grant:
+            resource, action = name.split(".", 1)
+            yield (seed_uuid("permission", name), name, resource, action,
+                   f"Permission {name}", self.now)
+        for index in range(self.permissions):
+            name = self.permission_name(index)
+            resource, action = name.rsplit(".", 1)
+            yield (seed_uuid("permission", name), name, resource, action,
+                   f"Permission générée {index}", self.now)
+
+    def role_permission_rows(self) -> Iterator[Tuple]:
+        """Lignes de la table role_permissions"""
+        for role_index in range(self.roles):
+            role_id = seed_uuid("role", self.role_name(role_index))
+            for name in self.grant:
+                yield (role_id, seed_uuid("permission", name), self.now)
+            for permission_index in self.permission_indexes(role_index):
+                yield (role_id, seed_uuid("permission", self.permission_name(permission_index)),
+                       self.now)
+
+    def user_role_rows(self) -> Iterator[Tuple]:
+        """Lignes de la table user_roles"""
+        assigner = seed_uuid("user", self.user_email(0))
+        for user_index in range(self.users):
+            user_id = seed_uuid("user", self.user_email(user_index))
+            for role_index in self.role_indexes(user_index):
+                yield (user_id, seed_uuid("role", self.role_name(role_index)),
+                       self.now, assigner)
+
+    def tables(self) -> Dict[str, Iterator[Tuple]]:
+        """Flux de lignes par table, dans l'ordre des clés étrangères"""
+        return {
+            "users": self.user_rows(),
+            "roles": self.role_rows(),
+            "permissions": self.permission_rows(),
+            "role_permissions": self.role_permission_rows(),
+            "user_roles": self.user_role_rows(),
+        }
+
+    def describe(self) -> Dict:
+        """Paramètres du jeu (pour les logs et les résultats de benchmark)"""
+        return {
+            "users": self.users,
+            "roles": self.roles,
+            "permissions": self.permissions,
+            "roles_per_user": list(self.roles_per_user),
+            "permissions_per_role": list(self.permissions_per_role),
+            "seed": self.seed,
+            "prefix": self.prefix,
+            "grant": self.grant,
+        }
+
+    def write_csv(self, directory: str) -> Dict[str, int]:
+        """Écrire un fichier CSV (avec en-tête) par table"""
+        output_dir = Path(directory)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        counts = {}
+        for table, rows in self.tables().items():
+            with open(output_dir / f"{table}.csv", "w", newline="", encoding="utf-8") as output:
+                writer = csv.writer(output, lineterminator="\n")
+                writer.writerow(TABLE_COLUMNS[table])
+                count = 0
+                for row in rows:
+                    writer.writerow(row)
+                    count += 1
+                counts[table] = count
+        return counts
+
+
+def add_dataset_arguments(parser: argparse.ArgumentParser):
+    """Options CLI communes décrivant un jeu RBAC"""
+    parser.add_argument("--users", type=int, default=1000, help="Nombre d'utilisateurs")
+    parser.add_argument("--roles", type=int, default=10, help="Nombre de rôles")
+    parser.add_argument("--permissions", type=int, default=40,
+                        help="Nombre de permissions générées")
+    parser.add_argument("--roles-per-user", type=parse_fan_out, default=(1, 3),
+                        help="Rôles par utilisateur : N ou MIN:MAX")
+    parser.add_argument("--permissions-per-role", type=parse_fan_out, default=(1, 10),
+                        help="Permissions par rôle : N ou MIN:MAX")
+    parser.add_argument("--seed", type=int, default=42, help="Graine du générateur")
+    parser.add_argument("--prefix", default="bench", help="Préfixe des entités générées")
+
+
+def generator_from_args(args: argparse.Namespace) -> RBACDatasetGenerator:
+    """Construire le générateur depuis les options CLI"""
+    return RBACDatasetGenerator(users=args.users, roles=args.roles,
+                                permissions=args.permissions,
+                                roles_per_user=args.roles_per_user,
+                                permissions_per_role=args.permissions_per_role,
+                                seed=args.seed, prefix=args.prefix)
+
+
+def main():
+    """Point d'entrée CLI : export CSV du jeu RBAC"""
+    parser = argparse.ArgumentParser(description="Générateur RBAC synthétique AccessGate PoC")
+    add_dataset_arguments(parser)
+    parser.add_argument("--output", default="logs/rbac-dataset",
+                        help="Répertoire des fichiers CSV")
+    args = parser.parse_args()
+
+    counts = generator_from_args(args).write_csv(args.output)
+    for table, count in counts.items():
+        print(f"{table}: {count} lignes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
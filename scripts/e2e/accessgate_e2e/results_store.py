@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Stockage local des résultats de performance (SQLite) et détection de régressions
+- Un run : suite, scénario, git SHA, environnement ; par endpoint : histogramme, débit, erreurs
+- Référence glissante : les N derniers runs sains du même scénario
+- Régression p95/p99 ou débit : écart au-delà de la tolérance, de la dispersion entre runs
+  et significatif (test de Mann-Whitney sur les histogrammes, z-test sur les erreurs)
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import socket
+import sqlite3
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional, Sequence
+
+from .jsonl_writer import utc_timestamp
+from .latency import LatencyHistogram
+
+DEFAULT_STORE = "logs/results.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    suite TEXT NOT NULL,
+    scenario TEXT NOT NULL,
+    git_sha TEXT,
+    git_branch TEXT,
+    git_dirty INTEGER,
+    hostname TEXT,
+    environment TEXT,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_scenario ON runs (suite, scenario, id);
+CREATE TABLE IF NOT EXISTS endpoint_results (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    endpoint TEXT NOT NULL,
+    requests INTEGER NOT NULL,
+    errors INTEGER,
+    duration REAL,
+    throughput_rps REAL,
+    error_rate REAL,
+    p50 REAL,
+    p95 REAL,
+    p99 REAL,
+    histogram TEXT NOT NULL,
+    PRIMARY KEY (run_id, endpoint)
+);
+"""
+
+# Métriques comparées : nom -> sens de la dégradation (+1 : hausse, -1 : baisse)
+COMPARED_METRICS = {"p95": 1, "p99": 1, "throughput_rps": -1}
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        result = subprocess.run(["git", *args], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def run_metadata(**extra) -> Dict:
+    """Git SHA (ou GIT_SHA / GITHUB_SHA en CI) et environnement d'exécution"""
+    status = _git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "git_sha": os.environ.get("GIT_SHA") or os.environ.get("GITHUB_SHA")
+                   or _git("rev-parse", "HEAD"),
+        "git_branch": _git("rev-parse", "--abbrev-ref", "HEAD"),
+        "git_dirty": None if status is None else bool(status),
+        "hostname": socket.gethostname(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            **extra,
+        },
+    }
+
+
+def endpoints_from_summary(summary: Dict, prefix: str = "") -> Dict[str, Dict]:
+    """Endpoints d'un résumé de tir (load_engine ou load_profiles) à enregistrer"""
+    routes = summary.get("routes") or summary.get("endpoints") or {}
+    duration = summary.get("duration")
+    return {
+        f"{prefix}{name}": {
+            "requests": route["requests"],
+            "errors": route["errors"],
+            "duration": duration,
+            "histogram": LatencyHistogram.from_dict(summary["histograms"][name]),
+        }
+        for name, route in routes.items()
+        if name in summary.get("histograms", {}) and route["requests"]
+    }
+
+
+def mann_whitney_greater(current: LatencyHistogram, baseline: LatencyHistogram) -> float:
+    """p-valeur unilatérale : les latences courantes sont-elles plus grandes que la référence ?
+
+    U calculé sur les buckets (rangs moyens pour les ex æquo), approximation normale
+    avec correction des ex æquo ; suffisant pour les effectifs d'un tir de charge.
+    """
+    n1, n2 = current.count, baseline.count
+    if not n1 or not n2:
+        return 1.0
+    rank = 0.0
+    rank_sum = 0.0
+    ties = 0.0
+    for index in sorted(set(current.buckets) | set(baseline.buckets)):
+        in_current = current.buckets.get(index, 0)
+        tied = in_current + baseline.buckets.get(index, 0)
+        rank_sum += in_current * (rank + (tied + 1) / 2)
+        rank += tied
+        ties += tied ** 3 - tied
+    u = rank_sum - n1 * (n1 + 1) / 2
+    total = n1 + n2
+    variance = n1 * n2 / 12 * ((total + 1) - ties / (total * (total - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def proportion_greater(errors: int, requests: int, base_errors: int, base_requests: int) -> float:
+    """p-valeur unilatérale du z-test à deux proportions (taux d'erreur courant plus élevé)"""
+    if not requests or not base_requests:
+        return 1.0
+    pooled = (errors + base_errors) / (requests + base_requests)
+    variance = pooled * (1 - pooled) * (1 / requests + 1 / base_requests)
+    if variance <= 0:
+        return 1.0
+    z = (errors / requests - base_errors / base_requests) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+class ResultsStore:
+    """Base SQLite des runs et de leurs résultats par endpoint"""
+
+    def __init__(self, path: str = DEFAULT_STORE):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def record_run(self, suite: str, scenario: Dict, endpoints: Dict[str, Dict],
+                   metadata: Optional[Dict] = None, status: str = "pass") -> int:
+        """Enregistrer un run ; endpoints : nom -> requests, errors, duration, histogram"""
+        metadata = metadata or run_metadata()
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (created_at, suite, scenario, git_sha, git_branch, git_dirty,"
+                " hostname, environment, status) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (utc_timestamp(), suite,
+                 json.dumps(scenario, sort_keys=True), metadata.get("git_sha"),
+                 metadata.get("git_branch"), metadata.get("git_dirty"),
+                 metadata.get("hostname"), json.dumps(metadata.get("environment", {})), status))
+            run_id = cursor.lastrowid
+            for name, endpoint in endpoints.items():
+                histogram: LatencyHistogram = endpoint["histogram"]
+                requests = endpoint["requests"]
+                errors = endpoint.get("errors")
+                duration = endpoint.get("duration")
+                self.connection.execute(
+                    "INSERT INTO endpoint_results (run_id, endpoint, requests, errors, duration,"
+                    " throughput_rps, error_rate, p50, p95, p99, histogram)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (run_id, name, requests, errors, duration,
+                     requests / duration if duration else None,
+                     errors / requests if errors is not None and requests else None,
+                     histogram.percentile(50), histogram.percentile(95),
+                     histogram.percentile(99), json.dumps(histogram.to_dict())))
+        return run_id
+
+    def set_status(self, run_id: int, status: str):
+        with self.connection:
+            self.connection.execute("UPDATE runs SET status = ? WHERE id = ?", (status, run_id))
+
+    def run(self, run_id: Optional[int] = None, suite: Optional[str] = None) -> Optional[Dict]:
+        """Run demandé, sinon dernier run (de la suite)"""
+        if run_id is not None:
+            row = self.connection.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+        elif suite is not None:
+            row = self.connection.execute("SELECT * FROM runs WHERE suite = ? ORDER BY id DESC"
+                                          " LIMIT 1", (suite,)).fetchone()
+        else:
+            row = self.connection.execute("SELECT * FROM runs ORDER BY id DESC LIMIT 1").fetchone()
+        return dict(row) if row else None
+
+    def runs(self, suite: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        query = "SELECT * FROM runs"
+        params: Sequence = ()
+        if suite:
+            query += " WHERE suite = ?"
+            params = (suite,)
+        rows = self.connection.execute(query + " ORDER BY id DESC LIMIT ?", (*params, limit))
+        return [dict(row) for row in rows]
+
+    def endpoint_results(self, run_id: int) -> Dict[str, Dict]:
+        rows = self.connection.execute("SELECT * FROM endpoint_results WHERE run_id = ?",
+                                       (run_id,))
+        return {row["endpoint"]: dict(row) for row in rows}
+
+    def baseline_runs(self, run: Dict, count: int) -> List[Dict]:
+        """N derniers runs antérieurs du même scénario, hors runs en régression"""
+        rows = self.connection.execute(
+            "SELECT * FROM runs WHERE suite = ? AND scenario = ? AND id < ?"
+            " AND status != 'regression' ORDER BY id DESC LIMIT ?",
+            (run["suite"], run["scenario"], run["id"], count))
+        return [dict(row) for row in rows]
+
+
+class RegressionDetector:
+    """Comparaison d'un run à sa référence glissante"""
+
+    def __init__(self, store: ResultsStore, baseline_runs: int = 10, min_baseline: int = 3,
+                 tolerance: float = 0.10, z_threshold: float = 3.0, alpha: float = 0.01):
+        self.store = store
+        self.baseline_runs = baseline_runs
+        # En dessous, pas assez de runs pour estimer la dispersion : aucun verdict
+        self.min_baseline = min_baseline
+        self.tolerance = tolerance
+        self.z_threshold = z_threshold
+        self.alpha = alpha
+
+    def compare(self, run_id: int) -> Dict:
+        """Régressions du run (liste vide si aucune ou référence insuffisante)"""
+        run = self.store.run(run_id)
+        baseline = self.store.baseline_runs(run, self.baseline_runs)
+        report = {"run_id": run_id, "suite": run["suite"], "git_sha": run["git_sha"],
+                  "baseline_run_ids": [item["id"] for item in baseline],
+                  "regressions": [], "endpoints": {}}
+        if len(baseline) < self.min_baseline:
+            report["insufficient_baseline"] = True
+            return report
+
+        current = self.store.endpoint_results(run_id)
+        previous = [self.store.endpoint_results(item["id"]) for item in baseline]
+        for name, result in current.items():
+            history = [results[name] for results in previous if name in results]
+            if len(history) < self.min_baseline:
+                continue
+            report["endpoints"][name] = self._compare_endpoint(name, result, history,
+                                                               report["regressions"])
+        return report
+
+    def _compare_endpoint(self, name: str, result: Dict, history: List[Dict],
+                          regressions: List[Dict]) -> Dict:
+        merged = LatencyHistogram.from_dict(json.loads(history[0]["histogram"]))
+        for item in history[1:]:
+            merged.merge(LatencyHistogram.from_dict(json.loads(item["histogram"])))
+        histogram = LatencyHistogram.from_dict(json.loads(result["histogram"]))
+        latency_p_value = mann_whitney_greater(histogram, merged)
+
+        comparison = {}
+        for metric, direction in COMPARED_METRICS.items():
+            values = [item[metric] for item in history if item[metric] is not None]
+            value = result[metric]
+            if value is None or len(values) < self.min_baseline:
+                continue
+            median = statistics.median(values)
+            mean = statistics.fmean(values)
+            spread = statistics.stdev(values)
+            relative = (value - median) / median if median else 0.0
+            beyond_tolerance = direction * relative > self.tolerance
+            beyond_spread = direction * (value - mean) > self.z_threshold * spread
+            # Débit : un seul échantillon par run, la dispersion entre runs fait office de test
+            significant = latency_p_value < self.alpha if metric != "throughput_rps" else True
+            regressed = beyond_tolerance and beyond_spread and significant
+            comparison[metric] = {"value": value, "baseline_median": median,
+                                  "relative_change": relative, "regression": regressed}
+            if regressed:
+                regressions.append({"endpoint": name, "metric": metric, **comparison[metric],
+                                    "p_value": latency_p_value
+                                    if metric != "throughput_rps" else None})
+
+        if result["errors"] is not None:
+            base_errors = sum(item["errors"] or 0 for item in history)
+            base_requests = sum(item["requests"] for item in history)
+            p_value = proportion_greater(result["errors"], result["requests"],
+                                         base_errors, base_requests)
+            base_rate = base_errors / base_requests if base_requests else 0.0
+            regressed = (p_value < self.alpha
+                         and result["error_rate"] - base_rate > self.tolerance * max(base_rate,
+                                                                                    0.01))
+            comparison["error_rate"] = {"value": result["error_rate"],
+                                        "baseline_median": base_rate, "regression": regressed}
+            if regressed:
+                regressions.append({"endpoint": name, "metric": "error_rate",
+                                    **comparison["error_rate"], "p_value": p_value})
+        comparison["latency_p_value"] = latency_p_value
+        return comparison
+
+
+def record_and_compare(store_path: str, suite: str, scenario: Dict,
+                       endpoints: Dict[str, Dict], logger, baseline_runs: int = 10,
+                       **environment) -> List[Dict]:
+    """Enregistrer un run, le comparer à sa référence et journaliser le verdict"""
+    store = ResultsStore(store_path)
+    try:
+        run_id = store.record_run(suite, scenario, endpoints, run_metadata(**environment))
+        report = RegressionDetector(store, baseline_runs).compare(run_id)
+        if report["regressions"]:
+            store.set_status(run_id, "regression")
+    finally:
+        store.close()
+
+    logger.log_event("perf_baseline_compare", "Comparaison à la référence",
+                   run_id=run_id, suite=suite, baseline_runs=report["baseline_run_ids"],
+                   insufficient_baseline=report.get("insufficient_baseline", False),
+                   regressions=report["regressions"],
+                   status="error" if report["regressions"] else "success")
+    for regression in report["regressions"]:
+        logger.log_metric("perf_regression", regression["value"],
+                          endpoint=regression["endpoint"], metric=regression["metric"])
+    return report["regressions"]
+
+
+def add_store_arguments(parser: argparse.ArgumentParser):
+    """Options CLI d'enregistrement et de comparaison des runs"""
+    parser.add_argument("--store", nargs="?", const=DEFAULT_STORE,
+                        help=f"Enregistrer le run dans la base SQLite (défaut : {DEFAULT_STORE})")
+    parser.add_argument("--baseline-runs", type=int, default=10,
+                        help="Runs de référence (glissants) pour la comparaison")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="Code de sortie non nul si une régression est détectée")
+
+
+def _print_report(report: Dict):
+    if report.get("insufficient_baseline"):
+        print(f"ℹ️ Run {report['run_id']} : référence insuffisante "
+              f"({len(report['baseline_run_ids'])} run(s))")
+        return
+    print(f"📊 Run {report['run_id']} ({report['git_sha'] or '?'}) "
+          f"vs runs {report['baseline_run_ids']}")
+    for name, comparison in sorted(report["endpoints"].items()):
+        for metric, values in comparison.items():
+            if not isinstance(values, dict):
+                continue
+            flag = "❌" if values["regression"] else "✅"
+            print(f"   {flag} {name} {metric}: {values['value']:.6g} "
+                  f"(référence {values['baseline_median']:.6g})")
+
+
+def main():
+    """CLI : liste des runs et comparaison à la référence"""
+    parser = argparse.ArgumentParser(description="Base des résultats de performance AccessGate PoC")
+    parser.add_argument("--store", default=DEFAULT_STORE)
+    commands = parser.add_subparsers(dest="command", required=True)
+    list_parser = commands.add_parser("list", help="Derniers runs")
+    list_parser.add_argument("--suite")
+    list_parser.add_argument("--limit", type=int, default=20)
+    compare_parser = commands.add_parser("compare", help="Comparer un run à sa référence")
+    compare_parser.add_argument("--run", type=int, help="Id du run (défaut : dernier)")
+    compare_parser.add_argument("--suite")
+    compare_parser.add_argument("--baseline-runs", type=int, default=10)
+    compare_parser.add_argument("--tolerance", type=float, default=0.10,
+                                help="Écart relatif minimal signalé")
+    compare_parser.add_argument("--alpha", type=float, default=0.01,
+                                help="Seuil de significativité")
+    args = parser.parse_args()
+
+    store = ResultsStore(args.store)
+    try:
+        if args.command == "list":
+            for run in store.runs(args.suite, args.limit):
+                print(f"{run['id']:>5} {run['created_at']} {run['suite']:<16} "
+                      f"{(run['git_sha'] or '')[:10]:<10} {run['status']}")
+            return 0
+
+        run = store.run(args.run, args.suite)
+        if run is None:
+            print("❌ Aucun run enregistré")
+            return 1
+        report = RegressionDetector(store, args.baseline_runs, tolerance=args.tolerance,
+                                    alpha=args.alpha).compare(run["id"])
+        _print_report(report)
+        return 1 if report["regressions"] else 0
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Moteur commun des suites E2E AccessGate PoC
+- Cluster (kubectl, pods, port-forwards), API, charge, frontend HTTP et navigateur
+- Les étapes optionnelles sont activées par les points d'entrée
+- Avec un backend de substitution (stand_in), ni kubectl, ni pods, ni port-forwards
+- Latence par endpoint agrégée sur toute la suite
+- Emails des comptes de test uniques par tir (inscription mesurée à chaque exécution)
+"""
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .api import APITester
+from .frontend import FrontendTester
+from .identities import IdentityAllocator, delete_identities
+from .k8s_resources import PodResourceSampler, add_resource_arguments
+from .kubernetes import KubernetesManager
+from .latency import LatencyRecorder
+from .logger import StructuredLogger
+from .prometheus import MetricsScraper, add_scrape_arguments
+
+# Taux d'erreur maximal toléré pendant le tir de charge
+LOAD_MAX_ERROR_RATE = 0.05
+
+# Compte de test : email, mot de passe, prénom, nom
+Account = Tuple[str, str, str, str]
+
+
+class E2ETestRunner:
+    """Runner principal des tests E2E"""
+
+    def __init__(self, account: Account = ("api-test@accessgate.com", "ApiTest123!", "API", "Test"),
+                 namespace: str = "accessgate-poc", http_frontend: bool = True,
+                 complete_account: Optional[Account] = None,
+                 load_options: Optional[Dict] = None,
+                 browser_options: Optional[Dict] = None,
+                 stand_in=None, identities: Optional[IdentityAllocator] = None,
+                 cleanup_users: bool = False):
+        self.logger = StructuredLogger("e2e_runner")
+        self.latency = LatencyRecorder()
+        self.k8s_manager = KubernetesManager(namespace)
+        self.api_tester = APITester(latency=self.latency)
+        self.frontend_tester = FrontendTester(latency=self.latency)
+        # Seuls mot de passe et noms des comptes fournis sont gardés : un email fixe
+        # n'est inscriptible qu'une fois (400 à chaque tir suivant)
+        self.identities = identities or IdentityAllocator()
+        self.cleanup_users = cleanup_users
+        self.account = self.identities.account(account[2], account[3], account[1])
+        self.http_frontend = http_frontend
+        self.complete_account = (self.identities.account(*complete_account[2:],
+                                                         complete_account[1])
+                                 if complete_account else None)
+        self.load_options = load_options
+        self.browser_options = browser_options
+        # StandInBackend non démarré : remplace le cluster pour les tests API et la charge
+        self.stand_in = stand_in
+        self.port_forward_processes = {}
+        self.results: Dict[str, bool] = {}
+        self.load_summary: Dict = {}
+
+    async def run_complete_test_suite(self) -> bool:
+        """Exécuter la suite complète de tests"""
+        self.logger.log_event("test_suite_start", "Démarrage suite de tests E2E")
+        start_time = time.time()
+
+        try:
+            if self.stand_in is not None:
+                self.api_tester.base_url = self.stand_in.start_in_thread()
+                self.logger.log_event("test_suite", "Backend de substitution, cluster ignoré",
+                                    base_url=self.api_tester.base_url)
+            elif not self._prepare_cluster():
+                return False
+
+            # 4. Tests API
+            self.logger.log_event("test_suite", "Exécution tests API...")
+            self.results.update(self._run_api_tests())
+
+            # 4b. Tir de charge (optionnel)
+            if self.load_options:
+                self.logger.log_event("test_suite", "Exécution tir de charge...")
+                self.results["api_load"] = await self._run_load_test()
+
+            # 5. Tests Frontend (aucun frontend derrière le backend de substitution)
+            if self.http_frontend and self.stand_in is None:
+                self.logger.log_event("test_suite", "Exécution tests Frontend...")
+                self.results["frontend_access"] = self.frontend_tester.test_frontend_access()
+
+            # 5b. Tests navigateur (Playwright chargé seulement ici)
+            if self.browser_options is not None and self.stand_in is None:
+                self.logger.log_event("test_suite", "Exécution tests Playwright...")
+                self.results.update(await self._run_browser_tests())
+
+            # 6. Résultats finaux
+            total_duration = time.time() - start_time
+
+            success_count = sum(1 for result in self.results.values() if result)
+            total_count = len(self.results)
+            success_rate = (success_count / total_count) * 100 if total_count > 0 else 0
+
+            self.logger.log_event("test_suite_complete", "Suite de tests terminée",
+                                total_tests=total_count,
+                                successful_tests=success_count,
+                                success_rate=success_rate,
+                                total_duration=total_duration,
+                                latency=self.latency.summary(),
+                                status="success" if success_rate >= 80 else "warning")
+
+            self.logger.log_metric("test_success_rate", success_rate)
+            self.logger.log_metric("test_total_duration", total_duration)
+            self.latency.log_summary(self.logger)
+
+            return success_rate >= 80
+
+        except Exception as e:
+            self.logger.log_event("test_suite_error", "Erreur suite de tests",
+                                error=str(e), status="error")
+            return False
+
+        finally:
+            # Nettoyage
+            if self.cleanup_users:
+                self._cleanup_users()
+            self.k8s_manager.cleanup_port_forwarding(self.port_forward_processes)
+            if self.stand_in is not None:
+                self.stand_in.stop_thread()
+
+    def _prepare_cluster(self) -> bool:
+        """Vérifier kubectl et les pods, puis ouvrir les port-forwards"""
+        # 1. Vérifier kubectl
+        if not self.k8s_manager.check_kubectl():
+            self.logger.log_event("test_suite", "kubectl non disponible",
+                                status="error")
+            return False
+
+        # 2. Vérifier les pods
+        self.logger.log_event("test_suite", "Vérification des pods...")
+        if not self.k8s_manager.wait_for_pods_ready():
+            self.logger.log_event("test_suite", "Pods non prêts",
+                                status="error")
+            return False
+
+        # 3. Configurer port forwarding
+        self.port_forward_processes = self.k8s_manager.setup_port_forwarding()
+        return True
+
+    def _run_api_tests(self) -> Dict[str, bool]:
+        """Exécuter les tests API"""
+        email, password, first_name, last_name = self.account
+        results = {}
+
+        # Test health
+        results["api_health"] = self.api_tester.test_health()
+
+        # Test inscription
+        results["api_registration"] = self.api_tester.register_user(
+            email, password, first_name, last_name
+        )
+
+        # Test connexion
+        results["api_login"] = self.api_tester.login_user(email, password)
+
+        # Test endpoint protégé
+        results["api_protected"] = self.api_tester.test_protected_endpoint()
+
+        # Parcours complet avec un second compte (optionnel)
+        if self.complete_account:
+            results["api_complete"] = self.api_tester.test_api_complete(*self.complete_account)
+
+        return results
+
+    async def _run_load_test(self) -> bool:
+        """Exécuter le tir de charge asyncio (métriques serveur et pods suivis en parallèle)"""
+        from .load_engine import LOAD_ENDPOINTS
+
+        email, password = self.account[:2]
+        options = dict(self.load_options)
+        metrics_interval = options.pop("metrics_interval", None)
+        resource_interval = options.pop("resource_interval", None)
+        scraper = None
+        if metrics_interval:
+            scraper = MetricsScraper(self.logger, self.api_tester.base_url, metrics_interval)
+            if not await scraper.start():
+                scraper = None
+        # Pas de pods derrière le backend de substitution
+        sampler = None
+        if resource_interval and self.stand_in is None:
+            sampler = PodResourceSampler(self.logger, self.k8s_manager.namespace,
+                                         resource_interval)
+            if not sampler.start():
+                sampler = None
+        try:
+            summary = await self.api_tester.run_load(email, password, **options)
+        finally:
+            server = await scraper.stop() if scraper is not None else {}
+            if sampler is not None:
+                sampler.stop()
+        if summary and server:
+            scraper.correlate(server, summary["endpoints"], LOAD_ENDPOINTS)
+        if summary and sampler is not None:
+            summary["resources"] = sampler.report(summary["total_requests"], summary["duration"])
+        self.load_summary = summary
+        total_requests = summary.get("total_requests", 0)
+        error_rate = summary.get("total_errors", 0) / total_requests if total_requests else 1
+        return total_requests > 0 and error_rate <= LOAD_MAX_ERROR_RATE
+
+    async def _run_browser_tests(self) -> Dict[str, bool]:
+        """Exécuter les scénarios Playwright"""
+        from .browser import PlaywrightE2ETester
+
+        tester = PlaywrightE2ETester(**self.browser_options,
+                                     account=self.identities.account("E2E", "Test",
+                                                                     "E2ETest123!"))
+        return await tester.run_tests()
+
+    def _cleanup_users(self):
+        """Supprimer les comptes inscrits par la suite (pod postgres via kubectl exec)"""
+        from .db_seed import BulkSeeder
+
+        if self.stand_in is not None:
+            delete_identities(self.logger, self.identities.pattern(), stand_in=self.stand_in)
+        else:
+            delete_identities(self.logger, self.identities.pattern(),
+                              seeder=BulkSeeder(self.logger, self.k8s_manager.namespace))
+
+    def record_results(self, store_path: str, suite: str,
+                       baseline_runs: int = 10) -> List[Dict]:
+        """Enregistrer latences et tir de charge dans la base des résultats ; régressions"""
+        from .results_store import endpoints_from_summary, record_and_compare
+
+        # Appels fonctionnels : latence seule (ni débit ni taux d'erreur significatifs)
+        endpoints = {name: {"requests": histogram.count, "errors": None, "duration": None,
+                            "histogram": histogram}
+                     for name, histogram in self.latency.histograms.items() if histogram.count}
+        if self.load_summary:
+            endpoints.update(endpoints_from_summary(self.load_summary, "load:"))
+        scenario = {"tests": sorted(self.results), "load": self.load_options,
+                    "target": "stand-in" if self.stand_in is not None else self.api_tester.base_url}
+        return record_and_compare(store_path, suite, scenario, endpoints, self.logger,
+                                  baseline_runs, namespace=self.k8s_manager.namespace)
+
+
+def add_load_arguments(parser):
+    """Options CLI du tir de charge optionnel"""
+    parser.add_argument("--load", action="store_true",
+                        help="Ajouter un tir de charge asyncio après les tests API")
+    parser.add_argument("--virtual-users", type=int, default=100,
+                        help="Nombre d'utilisateurs virtuels concurrents")
+    parser.add_argument("--duration", type=float, default=30,
+                        help="Durée du tir de charge en secondes")
+    parser.add_argument("--connections", type=int, default=100,
+                        help="Taille maximale du pool de connexions keep-alive")
+    parser.add_argument("--pool-size", type=int, default=10,
+                        help="Comptes seedés (db_seed.py) pré-authentifiés pour le tir "
+                             "(0 = compte inscrit par la suite, sans rôle : 403)")
+    parser.add_argument("--with-login", action="store_true",
+                        help="Inclure /api/auth/login dans la boucle (soumis à authRateLimiter)")
+    add_scrape_arguments(parser)
+    add_resource_arguments(parser)
+
+
+def load_options_from_args(args) -> Optional[Dict]:
+    """Options du tir de charge (None si --load absent)"""
+    if not args.load:
+        return None
+    return {
+        "virtual_users": args.virtual_users,
+        "duration": args.duration,
+        "max_connections": args.connections,
+        "pool_size": args.pool_size,
+        "endpoints": ["health", "login", "users"] if args.with_login else None,
+        "metrics_interval": args.scrape_metrics,
+        "resource_interval": args.sample_resources,
+    }
@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+Scénarios déclaratifs de parcours utilisateur pour AccessGate PoC
+- Format dict (JSON / YAML) ou DSL Python (Scenario, Step), mêmes objets dans les deux cas
+- Étapes pondérées ou en séquence, temps de réflexion tirés d'une distribution
+- Extraction de valeurs (accessToken, id, claim JWT) réutilisées par les étapes suivantes
+- Assertions par étape (statut, champs JSON, latence maximale, contenu)
+- Compilation unique : gabarits pré-analysés, corps constants figés, aucun parcours
+  de la description pendant le tir (exécuté par AsyncLoadTester.run_scenario)
+"""
+
+import argparse
+import asyncio
+import bisect
+import json
+import random
+import string
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from .rbac_dataset import SEED_PASSWORD
+from .stand_in import LatencyDistribution
+from .token_pool import jwt_claims
+
+SCENARIO_MODES = ("weighted", "sequence")
+
+# Valeur compilée : (constante ?, valeur ou fonction contexte -> valeur)
+Compiled = Tuple[bool, Any]
+
+# Parcours fournis : navigation pré-authentifiée et parcours complet (_test_api_complete)
+SCENARIOS: Dict[str, Dict] = {
+    "browse": {
+        "name": "browse",
+        "description": "Lectures protégées avec les tokens du pool (comptes seedés)",
+        "setup": [
+            {"name": "users_list", "request": "GET /api/users?page=1&limit=10", "auth": "pool",
+             "expect": {"status": 200, "json": ["users", "pagination.total"]},
+             "extract": {"user_id": "users.0.id"}},
+        ],
+        "steps": [
+            {"name": "users_list", "request": "GET /api/users?page=1&limit=10", "auth": "pool",
+             "weight": 3, "expect": {"status": 200, "json": ["users"]}},
+            {"name": "user_by_id", "request": "GET /api/users/{user_id}", "auth": "pool",
+             "expect": {"status": 200, "json": ["id"]}},
+            {"name": "roles_list", "request": "GET /api/roles", "auth": "pool",
+             "expect": {"status": 200}},
+            {"name": "permissions_list", "request": "GET /api/permissions", "auth": "pool",
+             "expect": {"status": 200}},
+            {"name": "health", "request": "GET /health", "expect": {"status": 200}},
+        ],
+    },
+    "register_login": {
+        "name": "register_login",
+        "description": "Inscription d'un compte neuf, connexion, endpoint protégé (authRateLimiter !)",
+        "mode": "sequence",
+        "think": "exp:0.5",
+        "steps": [
+            {"name": "auth_register", "request": "POST /api/auth/register",
+             "json": {"email": "scenario-{run}-v{vu}-{iteration}@accessgate.com",
+                      "password": "{password}", "firstName": "Scenario", "lastName": "User"},
+             "expect": {"status": 201, "json": ["accessToken"]}},
+            {"name": "auth_login", "request": "POST /api/auth/login",
+             "json": {"email": "scenario-{run}-v{vu}-{iteration}@accessgate.com",
+                      "password": "{password}"},
+             "expect": {"status": 200, "json": ["accessToken", "refreshToken"]},
+             "extract": {"token": "accessToken",
+                         "user_id": {"jwt": "accessToken", "claim": "userId"}}},
+            {"name": "user_by_id", "request": "GET /api/users/{user_id}", "auth": "{token}",
+             "expect": {"status": 200, "json": {"id": "{user_id}"}}},
+        ],
+    },
+}
+
+
+def _template_fields(value: str) -> List[str]:
+    return [field for _, field, _, _ in string.Formatter().parse(value) if field is not None]
+
+
+def compile_template(value: Any) -> Compiled:
+    """Gabarit "{variable}" dans une chaîne, un dict ou une liste, compilé une fois
+
+    Une chaîne réduite à "{x}" rend la valeur telle quelle (entier, booléen...) ;
+    sinon str.format_map. Les sous-arbres sans variable restent des constantes.
+    """
+    if isinstance(value, str):
+        fields = _template_fields(value)
+        if not fields:
+            return True, value
+        if len(fields) == 1 and value == "{" + fields[0] + "}" and fields[0].isidentifier():
+            name = fields[0]
+            return False, lambda context: context[name]
+        return False, value.format_map
+    if isinstance(value, dict):
+        items = [(key, compile_template(item)) for key, item in value.items()]
+        if all(constant for _, (constant, _) in items):
+            return True, value
+        return False, lambda context: {key: item if constant else item(context)
+                                       for key, (constant, item) in items}
+    if isinstance(value, (list, tuple)):
+        items = [compile_template(item) for item in value]
+        if all(constant for constant, _ in items):
+            return True, list(value)
+        return False, lambda context: [item if constant else item(context)
+                                       for constant, item in items]
+    return True, value
+
+
+def _path_getter(path: str) -> Callable[[Any], Any]:
+    """Accès "users.0.id" (clés et index) compilé ; KeyError / IndexError si absent"""
+    keys = [int(part) if part.lstrip("-").isdigit() else part for part in path.split(".")]
+
+    def get(data):
+        for key in keys:
+            data = data[key]
+        return data
+
+    return get
+
+
+def _compile_extract(name: str, spec: Union[str, Dict]) -> Tuple[str, Callable[[Any], Any]]:
+    """Extraction : chemin JSON, ou {"jwt": chemin du token, "claim": nom du claim}"""
+    if isinstance(spec, dict):
+        token = _path_getter(spec["jwt"])
+        claim = spec["claim"]
+        return name, lambda data: jwt_claims(token(data))[claim]
+    return name, _path_getter(spec)
+
+
+def _compile_expect(expect: Dict) -> List[Tuple[str, Callable]]:
+    """Assertions : (nom, vérification(statut, données JSON, corps, latence, contexte))"""
+    checks = []
+    status = expect.get("status")
+    if status is None:
+        checks.append(("status", lambda code, data, body, latency, context: 0 < code < 400))
+    else:
+        allowed = frozenset(status if isinstance(status, (list, tuple)) else [status])
+        checks.append(("status", lambda code, data, body, latency, context: code in allowed))
+
+    fields = expect.get("json", ())
+    if isinstance(fields, dict):
+        for path, expected in fields.items():
+            getter = _path_getter(path)
+            constant, value = compile_template(expected)
+
+            def check(code, data, body, latency, context, getter=getter, constant=constant,
+                      value=value):
+                try:
+                    actual = getter(data)
+                except (KeyError, IndexError, TypeError):
+                    return False
+                return actual == (value if constant else value(context))
+
+            checks.append((f"json:{path}", check))
+    else:
+        for path in fields:
+            getter = _path_getter(path)
+
+            def check(code, data, body, latency, context, getter=getter):
+                try:
+                    getter(data)
+                except (KeyError, IndexError, TypeError):
+                    return False
+                return True
+
+            checks.append((f"json:{path}", check))
+
+    if "max_latency" in expect:
+        limit = float(expect["max_latency"])
+        checks.append(("max_latency", lambda code, data, body, latency, context: latency <= limit))
+    if "contains" in expect:
+        needle = expect["contains"].encode()
+        checks.append(("contains", lambda code, data, body, latency, context: needle in body))
+    return checks
+
+
+class Step:
+    """Étape déclarative : une requête, ses assertions et ses extractions"""
+
+    def __init__(self, name: str, request: str, json: Any = None,
+                 headers: Optional[Dict[str, str]] = None, auth: Optional[str] = None,
+                 weight: float = 1.0, think: Optional[str] = None,
+                 expect: Optional[Dict] = None, extract: Optional[Dict] = None):
+        method, _, path = request.strip().partition(" ")
+        if not path.startswith("/"):
+            raise ValueError(f"Étape {name}: requête invalide {request!r} (attendu 'GET /chemin')")
+        if weight <= 0:
+            raise ValueError(f"Étape {name}: poids invalide {weight}")
+        self.name = name
+        self.method = method.upper()
+        self.path = path.strip()
+        self.json = json
+        self.headers = headers or {}
+        # "pool" : token du pool pré-authentifié, sinon gabarit du token ("{token}")
+        self.auth = auth
+        self.weight = weight
+        self.think = think
+        self.expect = expect or {}
+        self.extract = extract or {}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Step":
+        unknown = set(data) - {"name", "request", "json", "headers", "auth", "weight", "think",
+                               "expect", "extract"}
+        if unknown:
+            raise ValueError(f"Étape {data.get('name')}: clés inconnues {sorted(unknown)}")
+        return cls(**data)
+
+
+class CompiledStep:
+    """Étape prête à l'exécution : gabarits compilés, assertions et extractions en closures"""
+
+    __slots__ = ("name", "method", "url", "body", "headers", "pool_auth", "token", "parse",
+                 "checks", "extractors", "think")
+
+    def __init__(self, step: Step, base_url: str, think: Optional[LatencyDistribution]):
+        self.name = step.name
+        self.method = step.method
+        self.url = compile_template(base_url + step.path)
+        self.body = compile_template(step.json) if step.json is not None else None
+        self.headers = compile_template(step.headers) if step.headers else None
+        self.pool_auth = step.auth == "pool"
+        self.token = (compile_template(step.auth)
+                      if step.auth is not None and not self.pool_auth else None)
+        self.checks = _compile_expect(step.expect)
+        self.extractors = [_compile_extract(name, spec) for name, spec in step.extract.items()]
+        # Décodage JSON seulement si une assertion ou une extraction en a besoin
+        self.parse = bool(self.extractors) or any(name.startswith("json:")
+                                                  for name, _ in self.checks)
+        self.think = LatencyDistribution.parse(step.think) if step.think else think
+
+
+class Scenario:
+    """Parcours déclaratif : étapes initiales (une fois par utilisateur virtuel) puis itérations
+
+    mode "weighted" : chaque itération tire une étape selon les poids ;
+    mode "sequence" : chaque itération enchaîne toutes les étapes (arrêt au premier échec).
+    """
+
+    def __init__(self, name: str, steps: Sequence[Step], setup: Sequence[Step] = (),
+                 mode: str = "weighted", think: Optional[str] = None,
+                 variables: Optional[Dict[str, Any]] = None, description: str = ""):
+        if mode not in SCENARIO_MODES:
+            raise ValueError(f"Mode inconnu: {mode} (attendu: {', '.join(SCENARIO_MODES)})")
+        if not steps:
+            raise ValueError(f"Scénario {name}: aucune étape")
+        self.name = name
+        self.steps = list(steps)
+        self.setup = list(setup)
+        self.mode = mode
+        self.think = think
+        self.variables = {"password": SEED_PASSWORD, **(variables or {})}
+        self.description = description
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Scenario":
+        return cls(name=data.get("name", "scenario"),
+                   steps=[Step.from_dict(step) for step in data.get("steps", [])],
+                   setup=[Step.from_dict(step) for step in data.get("setup", [])],
+                   mode=data.get("mode", "weighted"), think=data.get("think"),
+                   variables=data.get("variables"), description=data.get("description", ""))
+
+    @property
+    def uses_pool(self) -> bool:
+        return any(step.auth == "pool" for step in self.setup + self.steps)
+
+    def describe(self) -> Dict:
+        return {"name": self.name, "mode": self.mode, "think": self.think,
+                "setup": [step.name for step in self.setup],
+                "steps": {step.name: step.weight for step in self.steps}}
+
+    def compile(self, base_url: str) -> "CompiledScenario":
+        return CompiledScenario(self, base_url)
+
+
+class ScenarioStats:
+    """Échecs d'assertion et itérations, en plus des EndpointStats par étape"""
+
+    def __init__(self):
+        self.assertions: Dict[str, Dict[str, int]] = {}
+        self.iterations = 0
+        self.aborted_users = 0
+
+    def fail(self, step: str, check: str):
+        failures = self.assertions.setdefault(step, {})
+        failures[check] = failures.get(check, 0) + 1
+
+
+class CompiledScenario:
+    """Exécuteur d'un scénario compilé pour une URL de base"""
+
+    def __init__(self, scenario: Scenario, base_url: str):
+        think = LatencyDistribution.parse(scenario.think) if scenario.think else None
+        self.scenario = scenario
+        self.setup = [CompiledStep(step, base_url, think) for step in scenario.setup]
+        self.steps = [CompiledStep(step, base_url, think) for step in scenario.steps]
+        self.weighted = scenario.mode == "weighted"
+        weights = [step.weight for step in scenario.steps]
+        self.cumulative = [sum(weights[:index + 1]) for index in range(len(weights))]
+        self.step_names = sorted({step.name for step in self.setup + self.steps})
+
+    def context(self, vu: int, run: str, account: Optional[Tuple[str, str]] = None,
+                slot=None) -> Dict:
+        """Variables d'un utilisateur virtuel"""
+        context = dict(self.scenario.variables)
+        context.update(vu=vu, run=run, iteration=0)
+        if account is not None:
+            context["email"], context["password"] = account
+        if slot is not None:
+            context["_slot"] = slot
+            if slot.user_id:
+                context.setdefault("user_id", slot.user_id)
+        return context
+
+    async def execute(self, session, step: CompiledStep, context: Dict, stats: Dict,
+                      scenario_stats: ScenarioStats, rng: random.Random) -> bool:
+        """Une étape : requête, assertions, extractions puis temps de réflexion"""
+        try:
+            url = step.url[1] if step.url[0] else step.url[1](context)
+            kwargs = {}
+            if step.body is not None:
+                kwargs["json"] = step.body[1] if step.body[0] else step.body[1](context)
+            if step.headers is not None:
+                kwargs["headers"] = dict(step.headers[1] if step.headers[0]
+                                         else step.headers[1](context))
+            if step.pool_auth:
+                kwargs.setdefault("headers", {}).update(context["_slot"].headers())
+            elif step.token is not None:
+                token = step.token[1] if step.token[0] else step.token[1](context)
+                kwargs.setdefault("headers", {})["Authorization"] = f"Bearer {token}"
+        except (KeyError, IndexError, AttributeError):
+            # Variable absente (extraction précédente en échec) : étape non envoyée
+            scenario_stats.fail(step.name, "variables")
+            return False
+
+        sent = time.perf_counter()
+        try:
+            async with session.request(step.method, url, **kwargs) as response:
+                body = await response.read()
+                status = response.status
+        except Exception:
+            body, status = b"", 0
+        latency = time.perf_counter() - sent
+        stats[step.name].record(latency, status)
+
+        data = None
+        if step.parse and body:
+            try:
+                data = json.loads(body)
+            except ValueError:
+                pass
+        passed = True
+        for name, check in step.checks:
+            if not check(status, data, body, latency, context):
+                scenario_stats.fail(step.name, name)
+                passed = False
+        if passed:
+            for name, extract in step.extractors:
+                try:
+                    context[name] = extract(data)
+                except (KeyError, IndexError, TypeError, ValueError):
+                    scenario_stats.fail(step.name, f"extract:{name}")
+                    passed = False
+
+        if step.think is not None:
+            delay = step.think.sample(rng)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        return passed
+
+    async def run_user(self, session, context: Dict, stats: Dict, scenario_stats: ScenarioStats,
+                       deadline: float, rng: random.Random):
+        """Boucle d'un utilisateur virtuel : étapes initiales puis itérations jusqu'à l'échéance"""
+        execute = self.execute
+        for step in self.setup:
+            if not await execute(session, step, context, stats, scenario_stats, rng):
+                scenario_stats.aborted_users += 1
+                return
+
+        steps, cumulative = self.steps, self.cumulative
+        total = cumulative[-1]
+        clock = time.perf_counter
+        while clock() < deadline:
+            if self.weighted:
+                step = steps[bisect.bisect_right(cumulative, rng.random() * total)]
+                await execute(session, step, context, stats, scenario_stats, rng)
+            else:
+                for step in steps:
+                    if not await execute(session, step, context, stats, scenario_stats, rng):
+                        break
+            context["iteration"] += 1
+            scenario_stats.iterations += 1
+
+
+def load_scenario(source: str) -> Scenario:
+    """Scénario fourni (SCENARIOS) ou fichier .json / .yaml"""
+    if source in SCENARIOS:
+        return Scenario.from_dict(SCENARIOS[source])
+    path = Path(source)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError(f"{source}: PyYAML non installé (pip install pyyaml), "
+                             f"ou utiliser un scénario .json") from None
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+    return Scenario.from_dict(data)
+
+
+def main():
+    """Point d'entrée CLI : tir d'un scénario déclaratif"""
+    from .load_engine import AsyncLoadTester
+    from .logger import StructuredLogger, configure_output
+    from .rbac_dataset import RBACDatasetGenerator, seeded_accounts
+    from .results_store import add_store_arguments, endpoints_from_summary, record_and_compare
+    from .stand_in import add_stand_in_arguments, stand_in_from_args
+
+    parser = argparse.ArgumentParser(description="Tir d'un scénario déclaratif AccessGate PoC")
+    parser.add_argument("scenario", nargs="?", help=f"Scénario fourni ({', '.join(SCENARIOS)}) "
+                                         f"ou fichier .json / .yaml")
+    parser.add_argument("--base-url", default="http://localhost:8001")
+    parser.add_argument("--users", type=int, default=50, help="Utilisateurs virtuels")
+    parser.add_argument("--duration", type=float, default=30, help="Durée en secondes")
+    parser.add_argument("--ramp-up", type=float, default=0, help="Montée en charge (s)")
+    parser.add_argument("--connections", type=int, default=100,
+                        help="Taille maximale du pool de connexions keep-alive")
+    parser.add_argument("--pool-size", type=int, default=10,
+                        help="Comptes seedés (db_seed.py) : tokens du pool et variables "
+                             "{email} / {password}")
+    parser.add_argument("--seed", type=int, default=42, help="Graine des tirages")
+    parser.add_argument("--list", action="store_true", help="Lister les scénarios fournis")
+    add_stand_in_arguments(parser)
+    add_store_arguments(parser)
+    args = parser.parse_args()
+
+    if args.list:
+        for name, data in SCENARIOS.items():
+            print(f"{name:16} {data.get('description', '')}")
+        return 0
+    if not args.scenario:
+        parser.error("scénario requis (nom fourni ou fichier), voir --list")
+
+    try:
+        scenario = load_scenario(args.scenario)
+    except (OSError, ValueError, TypeError) as e:
+        print(f"❌ Scénario invalide: {e}", file=sys.stderr)
+        return 1
+
+    configure_output("logs/scenario-results.jsonl")
+    logger = StructuredLogger("scenario")
+    backend = stand_in_from_args(args, RBACDatasetGenerator(users=max(1000, args.pool_size)))
+    if backend is not None:
+        args.base_url = backend.start_in_thread()
+    tester = AsyncLoadTester(logger, args.base_url, max_connections=args.connections)
+    try:
+        summary = asyncio.run(tester.run_scenario(scenario, args.users, args.duration,
+                                                  args.ramp_up, seeded_accounts(args.pool_size),
+                                                  seed=args.seed))
+    finally:
+        if backend is not None:
+            backend.stop_thread()
+    if not summary:
+        return 1
+
+    print(f"\n🧭 {scenario.name} : {summary['iterations']} itérations, "
+          f"{summary['total_requests']} requêtes ({summary['throughput_rps']:.0f} req/s)")
+    for name, endpoint in summary["endpoints"].items():
+        failures = summary["assertions"].get(name, {})
+        print(f"   {name:20} {endpoint['requests']:>8} req  p50 "
+              f"{endpoint['latency']['p50'] * 1000:>7.2f}ms  p99 "
+              f"{endpoint['latency']['p99'] * 1000:>7.2f}ms  "
+              + (", ".join(f"{check}: {count}" for check, count in failures.items())
+                 or "assertions OK"))
+
+    if args.store:
+        scenario_key = {"scenario": scenario.describe(), "users": args.users,
+                        "target": "stand-in" if args.stand_in else args.base_url}
+        regressions = record_and_compare(args.store, "scenario", scenario_key,
+                                         endpoints_from_summary(summary), logger,
+                                         args.baseline_runs, base_url=args.base_url)
+        if regressions and args.fail_on_regression:
+            return 1
+    return 0 if not summary["assertion_failures"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
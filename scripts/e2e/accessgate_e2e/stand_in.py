@@ -0,0 +1,670 @@
+#!/usr/bin/env python3
+"""
+Backend de substitution asyncio pour AccessGate PoC (sans cluster)
+- /health, /api/auth/register|login|refresh, /api/users, /api/roles, /api/permissions[/:id]
+- Jeu RBAC déterministe (rbac_dataset) : les comptes seedés se connectent comme sur le vrai backend
+- Tokens HS256 signés localement (payload AuthService : userId, email), checkAuth + requirePermission
+- Latence par route tirée d'une distribution, injection d'erreurs, capacité de traitement bornée
+- /api/metrics/metrics : histogramme http_request_duration_seconds et compteurs du backend
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from .logger import StructuredLogger
+from .prometheus import METRICS_PATH, express_route_label, render_exposition
+from .rbac_dataset import (DATASET_TIMESTAMP, SEED_PASSWORD, RBACDatasetGenerator,
+                           add_dataset_arguments, generator_from_args, seed_uuid)
+
+# Routes servies : nom (clés de latence et d'erreurs) -> méthode, chemin aiohttp, permission requise
+# (None : publique, "" : checkAuth seul, comme GET /api/users/:id)
+STAND_IN_ROUTES = {
+    "health": ("GET", "/health", None),
+    "auth_register": ("POST", "/api/auth/register", None),
+    "auth_login": ("POST", "/api/auth/login", None),
+    "auth_refresh": ("POST", "/api/auth/refresh", None),
+    "users_list": ("GET", "/api/users", "user.read"),
+    "user_by_id": ("GET", "/api/users/{user_id}", ""),
+    "roles_list": ("GET", "/api/roles", "role.read"),
+    "permissions_list": ("GET", "/api/permissions", "role.read"),
+    "permissions_grouped": ("GET", "/api/permissions/grouped", "role.read"),
+    "permission_by_id": ("GET", "/api/permissions/{permission_id}", "role.read"),
+}
+
+# Buckets de httpRequestDuration (backend/src/utils/metrics.ts)
+DURATION_BUCKETS = (0.1, 0.5, 1, 2, 5, 10)
+
+ACCESS_TOKEN_TTL = 15 * 60
+REFRESH_TOKEN_TTL = 7 * 24 * 3600
+
+
+class LatencyDistribution:
+    """Temps de traitement simulé (secondes) : fixed, uniform, normal, lognormal, exp"""
+
+    KINDS = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2, "exp": 1}
+
+    def __init__(self, kind: str = "fixed", *params: float):
+        if self.KINDS.get(kind) != len(params):
+            raise ValueError(f"Distribution invalide: {kind}{list(params)}")
+        self.kind = kind
+        self.params = params
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        """Spécification CLI : "0.005", "fixed:0.005", "uniform:0.001:0.01",
+        "normal:moyenne:écart", "lognormal:médiane:sigma", "exp:moyenne" """
+        kind, *params = spec.split(":")
+        if not params:
+            return cls("fixed", float(kind))
+        return cls(kind, *(float(param) for param in params))
+
+    def sample(self, rng: random.Random) -> float:
+        """Tirer une durée (jamais négative)"""
+        if self.kind == "uniform":
+            return rng.uniform(*self.params)
+        if self.kind == "normal":
+            return max(0.0, rng.gauss(*self.params))
+        if self.kind == "lognormal":
+            median, sigma = self.params
+            return rng.lognormvariate(math.log(median), sigma) if median > 0 else 0.0
+        if self.kind == "exp":
+            return rng.expovariate(1.0 / self.params[0]) if self.params[0] > 0 else 0.0
+        return self.params[0]
+
+    def describe(self) -> str:
+        return ":".join([self.kind, *(f"{param:g}" for param in self.params)])
+
+
+def parse_route_options(value: str, parse: Callable) -> Dict:
+    """Options par route : "users_list=lognormal:0.01:0.5,*=fixed:0.002" (* = toutes)"""
+    options = {}
+    for item in value.split(","):
+        name, _, spec = item.strip().partition("=")
+        if name != "*" and name not in STAND_IN_ROUTES:
+            raise argparse.ArgumentTypeError(f"Route inconnue: {name}")
+        options[name] = parse(spec)
+    return options
+
+
+def parse_error_injection(spec: str) -> Tuple[float, int]:
+    """Erreur injectée : "taux" ou "taux:statut" (statut 0 = connexion coupée)"""
+    rate, _, status = spec.partition(":")
+    return float(rate), int(status or 500)
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def _b64_decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class StandInBackend:
+    """Substitut du backend Express : mêmes routes, mêmes formes de réponse, aucun stockage"""
+
+    def __init__(self, logger: Optional[StructuredLogger] = None, host: str = "127.0.0.1",
+                 port: int = 0, dataset: Optional[RBACDatasetGenerator] = None,
+                 latency: Optional[Dict[str, LatencyDistribution]] = None,
+                 errors: Optional[Dict[str, Tuple[float, int]]] = None,
+                 capacity: int = 0, seed: int = 42):
+        self.logger = logger or StructuredLogger("stand_in")
+        self.host = host
+        self.port = port
+        self.dataset = dataset or RBACDatasetGenerator()
+        latency = latency or {}
+        errors = errors or {}
+        default_latency = latency.get("*", LatencyDistribution("fixed", 0.0))
+        self.latency = {name: latency.get(name, default_latency) for name in STAND_IN_ROUTES}
+        self.errors = {name: errors.get(name, errors.get("*", (0.0, 500)))
+                       for name in STAND_IN_ROUTES}
+        # Requêtes traitées simultanément (0 = illimité) : au-delà, file d'attente
+        self.capacity = capacity
+        self.rng = random.Random(seed)
+        self.secret = hashlib.sha256(f"stand-in:{seed}".encode()).digest()
+        self.refresh_secret = hashlib.sha256(f"stand-in-refresh:{seed}".encode()).digest()
+        self.served = {name: 0 for name in STAND_IN_ROUTES}
+        self.injected = {name: 0 for name in STAND_IN_ROUTES}
+        # Métriques exposées : (méthode, route, statut) -> [buckets..., somme, nombre]
+        self.durations: Dict[Tuple[str, str, int], list] = {}
+        self.base_url: Optional[str] = None
+        self._runner = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._build_dataset()
+
+    def _build_dataset(self):
+        """Index des comptes seedés et réponses statiques (rôles, permissions)"""
+        dataset = self.dataset
+        self.seeded_ids = {dataset.user_email(index): seed_uuid("user", dataset.user_email(index))
+                           for index in range(dataset.users)}
+        self.seeded_index = {user_id: index
+                             for index, user_id in enumerate(self.seeded_ids.values())}
+        self.registered: Dict[str, Dict] = {}
+        self.registered_ids: Dict[str, str] = {}
+        self._permission_cache: Dict[str, Set[str]] = {}
+
+        permissions = [{"id": row[0], "name": row[1], "resource": row[2], "action": row[3],
+                        "description": row[4], "createdAt": row[5]}
+                       for row in dataset.permission_rows()]
+        by_id = {permission["id"]: permission for permission in permissions}
+        role_permissions: Dict[str, list] = {}
+        for role_id, permission_id, _ in dataset.role_permission_rows():
+            role_permissions.setdefault(role_id, []).append(permission_id)
+        user_counts: Dict[str, int] = {}
+        for _, role_id, _, _ in dataset.user_role_rows():
+            user_counts[role_id] = user_counts.get(role_id, 0) + 1
+        permission_counts: Dict[str, int] = {}
+        for permission_ids in role_permissions.values():
+            for permission_id in permission_ids:
+                permission_counts[permission_id] = permission_counts.get(permission_id, 0) + 1
+
+        self.roles = {}
+        for role_id, name, description, is_active, created, updated in dataset.role_rows():
+            self.roles[role_id] = {"id": role_id, "name": name, "description": description,
+                                   "isActive": is_active, "createdAt": created,
+                                   "updatedAt": updated}
+        roles = [{**role,
+                  "rolePermissions": [{"roleId": role_id, "permissionId": permission_id,
+                                       "permission": {key: by_id[permission_id][key]
+                                                      for key in ("id", "name", "resource",
+                                                                  "action", "description")}}
+                                      for permission_id in role_permissions.get(role_id, [])],
+                  "_count": {"userRoles": user_counts.get(role_id, 0)}}
+                 for role_id, role in self.roles.items()]
+        self.permissions = by_id
+        self.permission_roles: Dict[str, list] = {}
+        for role_id, permission_ids in role_permissions.items():
+            for permission_id in permission_ids:
+                self.permission_roles.setdefault(permission_id, []).append(role_id)
+        self._permission_bodies: Dict[str, bytes] = {}
+        self.role_permission_names = {role_id: {by_id[permission_id]["name"]
+                                                for permission_id in permission_ids}
+                                      for role_id, permission_ids in role_permissions.items()}
+
+        listed = sorted(({**permission,
+                          "_count": {"rolePermissions": permission_counts.get(permission["id"], 0)}}
+                         for permission in permissions),
+                        key=lambda permission: (permission["resource"], permission["action"]))
+        grouped: Dict[str, list] = {}
+        for permission in listed:
+            grouped.setdefault(permission["resource"], []).append(permission)
+
+        # Corps pré-sérialisés : le coût mesuré est celui du client, pas de json.dumps
+        self.static_bodies = {
+            "roles_list": json.dumps(roles).encode(),
+            "permissions_list": json.dumps(listed).encode(),
+            "permissions_grouped": json.dumps(grouped).encode(),
+        }
+
+    # --- Tokens -----------------------------------------------------------------
+
+    def _sign(self, payload: Dict, secret: bytes) -> str:
+        header = _b64(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+        body = _b64(json.dumps(payload).encode())
+        signature = hmac.new(secret, f"{header}.{body}".encode(), hashlib.sha256).digest()
+        return f"{header}.{body}.{_b64(signature)}"
+
+    def _verify(self, token: str, secret: bytes) -> Optional[Dict]:
+        try:
+            header, body, signature = token.split(".")
+            expected = hmac.new(secret, f"{header}.{body}".encode(), hashlib.sha256).digest()
+            if not hmac.compare_digest(expected, _b64_decode(signature)):
+                return None
+            payload = json.loads(_b64_decode(body))
+        except ValueError:
+            return None
+        return payload if payload.get("exp", 0) > time.time() else None
+
+    def generate_tokens(self, user_id: str, email: str) -> Dict[str, str]:
+        """Paire de tokens (mêmes champs que AuthService.generateTokens)"""
+        now = int(time.time())
+        payload = {"userId": user_id, "email": email, "iat": now}
+        return {
+            "accessToken": self._sign({**payload, "exp": now + ACCESS_TOKEN_TTL}, self.secret),
+            "refreshToken": self._sign({**payload, "exp": now + REFRESH_TOKEN_TTL},
+                                       self.refresh_secret),
+        }
+
+    # --- Utilisateurs -----------------------------------------------------------
+
+    def _user_exists(self, user_id: str) -> bool:
+        return user_id in self.seeded_index or user_id in self.registered
+
+    def delete_users(self, pattern: str) -> int:
+        """Supprimer les comptes inscrits dont l'email correspond au motif (nettoyage)"""
+        expression = re.compile(pattern)
+        emails = [email for email in self.registered_ids if expression.match(email)]
+        for email in emails:
+            user_id = self.registered_ids.pop(email)
+            self.registered.pop(user_id, None)
+            self._permission_cache.pop(user_id, None)
+        return len(emails)
+
+    def _user_role_ids(self, user_id: str):
+        index = self.seeded_index.get(user_id)
+        if index is None:
+            return []
+        return [seed_uuid("role", self.dataset.role_name(role_index))
+                for role_index in self.dataset.role_indexes(index)]
+
+    def _permissions(self, user_id: str) -> Set[str]:
+        permissions = self._permission_cache.get(user_id)
+        if permissions is None:
+            permissions = set()
+            for role_id in self._user_role_ids(user_id):
+                permissions |= self.role_permission_names.get(role_id, set())
+            self._permission_cache[user_id] = permissions
+        return permissions
+
+    def _user_body(self, user_id: str) -> Dict:
+        """Utilisateur tel que renvoyé par UserService (sans mot de passe)"""
+        if user_id in self.registered:
+            user = self.registered[user_id]
+            created = user["createdAt"]
+            email, first_name, last_name = user["email"], user["firstName"], user["lastName"]
+        else:
+            index = self.seeded_index[user_id]
+            created = self.dataset.user_created_at(index)
+            email, first_name, last_name = self.dataset.user_email(index), "Bench", f"User{index}"
+        return {
+            "id": user_id, "email": email, "firstName": first_name, "lastName": last_name,
+            "isActive": True, "createdAt": created, "updatedAt": created,
+            "userRoles": [{"userId": user_id, "roleId": role_id,
+                           "role": {key: self.roles[role_id][key]
+                                    for key in ("id", "name", "description")}}
+                          for role_id in self._user_role_ids(user_id)],
+        }
+
+    # --- Serveur ----------------------------------------------------------------
+
+    def _error(self, message: str, status: int):
+        from aiohttp import web
+
+        return web.json_response({"error": {"message": message, "statusCode": status}},
+                                 status=status)
+
+    def _observe(self, method: str, route: str, status: int, duration: float):
+        """Enregistrer une requête comme metricsMiddleware (recordHttpRequest)"""
+        entry = self.durations.get((method, route, status))
+        if entry is None:
+            entry = self.durations[(method, route, status)] = [0] * (len(DURATION_BUCKETS) + 2)
+        for index, bound in enumerate(DURATION_BUCKETS):
+            if duration <= bound:
+                entry[index] += 1
+        entry[-2] += duration
+        entry[-1] += 1
+
+    def _route(self, name: str, handler):
+        """Envelopper un handler : checkAuth, requirePermission, capacité, latence, erreurs"""
+        from aiohttp import web
+
+        method = STAND_IN_ROUTES[name][0]
+        route = express_route_label(STAND_IN_ROUTES[name][1])
+
+        async def serve(request):
+            started = time.perf_counter()
+            response = await self._authorize(name, handler, request)
+            self._observe(method, route, response.status, time.perf_counter() - started)
+            return response
+
+        return web.route(method, STAND_IN_ROUTES[name][1], serve)
+
+    async def _authorize(self, name: str, handler, request):
+        """checkAuth et requirePermission, puis traitement sous la capacité bornée"""
+        permission = STAND_IN_ROUTES[name][2]
+        latency = self.latency[name]
+        error_rate, error_status = self.errors[name]
+        self.served[name] += 1
+        user_id = None
+        if permission is not None:
+            token = request.headers.get("Authorization", "").replace("Bearer ", "")
+            if not token:
+                return self._error("Access token required", 401)
+            payload = self._verify(token, self.secret)
+            if payload is None:
+                return self._error("Invalid token", 401)
+            user_id = payload.get("userId")
+            if not self._user_exists(user_id):
+                return self._error("User not found or inactive", 401)
+            if permission and permission not in self._permissions(user_id):
+                return self._error("Insufficient permissions", 403)
+
+        if self._semaphore is not None:
+            async with self._semaphore:
+                response = await self._process(name, handler, request, user_id, latency,
+                                               error_rate, error_status)
+        else:
+            response = await self._process(name, handler, request, user_id, latency,
+                                           error_rate, error_status)
+        return response
+
+    async def _process(self, name: str, handler, request, user_id: Optional[str],
+                       latency: LatencyDistribution, error_rate: float, error_status: int):
+        from aiohttp import web
+
+        delay = latency.sample(self.rng)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if error_rate and self.rng.random() < error_rate:
+            self.injected[name] += 1
+            if error_status == 0:
+                # Coupure brutale : erreur réseau côté client (aiohttp rejoue une fois
+                # les requêtes idempotentes sur une connexion keep-alive réutilisée)
+                request.transport.close()
+                return web.Response(status=500)
+            return self._error("Injected error", error_status)
+        return await handler(request, user_id)
+
+    async def _health(self, request, user_id):
+        from aiohttp import web
+
+        return web.json_response({"status": "OK", "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ",
+                                                                            time.gmtime()),
+                                  "uptime": time.monotonic() - self._started})
+
+    async def _register(self, request, user_id):
+        from aiohttp import web
+
+        try:
+            data = await request.json()
+            email, password = data["email"], data["password"]
+            first_name, last_name = data["firstName"], data["lastName"]
+        except (ValueError, KeyError, TypeError):
+            return self._error("Validation error", 400)
+        if len(password) < 8 or "@" not in email:
+            return self._error("Validation error", 400)
+        if email in self.seeded_ids or email in self.registered_ids:
+            return self._error("User already exists with this email", 400)
+        new_id = seed_uuid("stand-in-user", email)
+        self.registered_ids[email] = new_id
+        self.registered[new_id] = {"email": email, "password": password,
+                                   "firstName": first_name, "lastName": last_name,
+                                   "createdAt": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        return web.json_response({"message": "User registered successfully",
+                                  **self.generate_tokens(new_id, email)}, status=201)
+
+    async def _login(self, request, user_id):
+        from aiohttp import web
+
+        try:
+            data = await request.json()
+            email, password = data["email"], data["password"]
+        except (ValueError, KeyError, TypeError):
+            return self._error("Validation error", 400)
+        if email in self.seeded_ids:
+            found, expected = self.seeded_ids[email], SEED_PASSWORD
+        elif email in self.registered_ids:
+            found = self.registered_ids[email]
+            expected = self.registered[found]["password"]
+        else:
+            return self._error("Invalid credentials", 401)
+        if password != expected:
+            return self._error("Invalid credentials", 401)
+        return web.json_response({"message": "Login successful",
+                                  **self.generate_tokens(found, email)})
+
+    async def _refresh(self, request, user_id):
+        from aiohttp import web
+
+        try:
+            refresh_token = (await request.json()).get("refreshToken")
+        except (ValueError, AttributeError):
+            refresh_token = None
+        if not refresh_token:
+            return self._error("Refresh token required", 400)
+        payload = self._verify(refresh_token, self.refresh_secret)
+        if payload is None or not self._user_exists(payload.get("userId")):
+            return self._error("Invalid refresh token", 401)
+        return web.json_response({"message": "Token refreshed successfully",
+                                  **self.generate_tokens(payload["userId"], payload["email"])})
+
+    async def _users(self, request, user_id):
+        from aiohttp import web
+
+        try:
+            page = max(1, int(request.query.get("page", 1)))
+            limit = max(1, int(request.query.get("limit", 10)))
+        except ValueError:
+            return self._error("Validation error", 400)
+        # Ordre createdAt desc : inscrits (les plus récents d'abord) puis comptes seedés,
+        # dont le createdAt décroît avec l'index (RBACDatasetGenerator.user_created_at)
+        registered = list(reversed(self.registered))
+        total = len(registered) + self.dataset.users
+        start = (page - 1) * limit
+        ids = registered[start:start + limit]
+        for index in range(max(0, start - len(registered)),
+                           min(self.dataset.users, start + limit - len(registered))):
+            ids.append(seed_uuid("user", self.dataset.user_email(index)))
+        return web.json_response({
+            "users": [self._user_body(listed_id) for listed_id in ids],
+            "pagination": {"page": page, "limit": limit, "total": total,
+                           "pages": math.ceil(total / limit)},
+        })
+
+    async def _user_by_id(self, request, user_id):
+        from aiohttp import web
+
+        requested = request.match_info["user_id"]
+        if not self._user_exists(requested):
+            return self._error("User not found", 404)
+        return web.json_response(self._user_body(requested))
+
+    async def _permission_by_id(self, request, user_id):
+        """Permission et rôles qui la détiennent (PermissionService.getPermissionById)"""
+        from aiohttp import web
+
+        permission_id = request.match_info["permission_id"]
+        body = self._permission_bodies.get(permission_id)
+        if body is None:
+            permission = self.permissions.get(permission_id)
+            if permission is None:
+                return self._error("Permission not found", 404)
+            body = json.dumps({**permission, "rolePermissions": [
+                {"roleId": role_id, "permissionId": permission_id,
+                 "assignedAt": DATASET_TIMESTAMP,
+                 "role": {key: self.roles[role_id][key] for key in ("id", "name", "description")}}
+                for role_id in self.permission_roles.get(permission_id, [])]}).encode()
+            self._permission_bodies[permission_id] = body
+        return web.Response(body=body, content_type="application/json")
+
+    async def _metrics(self, request):
+        """Exposition Prometheus : familles alimentées par le backend (metricsMiddleware)"""
+        from aiohttp import web
+
+        started = time.perf_counter()
+        durations, totals = [], []
+        for (method, route, status), entry in sorted(self.durations.items()):
+            labels = {"method": method, "route": route, "status_code": str(status)}
+            for bound, count in zip(DURATION_BUCKETS, entry):
+                durations.append(("_bucket", {"le": f"{bound:g}", **labels}, count))
+            durations.append(("_bucket", {"le": "+Inf", **labels}, entry[-1]))
+            durations.append(("_sum", labels, entry[-2]))
+            durations.append(("_count", labels, entry[-1]))
+            totals.append(("", labels, entry[-1]))
+        process = [("process_cpu_seconds_total", "counter",
+                    "Total user and system CPU time spent in seconds.", time.process_time())]
+        try:
+            with open("/proc/self/statm") as statm:
+                resident = int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+            process.append(("process_resident_memory_bytes", "gauge",
+                            "Resident memory size in bytes.", resident))
+        except (OSError, ValueError):
+            pass
+
+        families = {
+            "http_request_duration_seconds": ("histogram", "Duration of HTTP requests in seconds",
+                                              durations),
+            "http_requests_total": ("counter", "Total number of HTTP requests", totals),
+            "active_connections": ("gauge", "Number of active connections", [("", {}, 0)]),
+        }
+        for name, metric_type, help_text, value in process:
+            families[name] = (metric_type, help_text, [("", {}, value)])
+        response = web.Response(text=render_exposition(families), content_type="text/plain")
+        self._observe("GET", express_route_label(METRICS_PATH), 200,
+                      time.perf_counter() - started)
+        return response
+
+    def _static(self, name: str):
+        from aiohttp import web
+
+        body = self.static_bodies[name]
+
+        async def handler(request, user_id):
+            return web.Response(body=body, content_type="application/json")
+
+        return handler
+
+    async def start(self) -> str:
+        """Démarrer le serveur dans la boucle courante ; retourne l'URL de base"""
+        from aiohttp import web
+
+        handlers = {
+            "health": self._health,
+            "auth_register": self._register,
+            "auth_login": self._login,
+            "auth_refresh": self._refresh,
+            "users_list": self._users,
+            "user_by_id": self._user_by_id,
+            "roles_list": self._static("roles_list"),
+            "permissions_list": self._static("permissions_list"),
+            "permissions_grouped": self._static("permissions_grouped"),
+            "permission_by_id": self._permission_by_id,
+        }
+        app = web.Application()
+        app.add_routes([self._route(name, handlers[name]) for name in STAND_IN_ROUTES])
+        # Hors STAND_IN_ROUTES : ni latence ni erreurs injectées sur le scrape
+        app.router.add_get(METRICS_PATH, self._metrics)
+        self._semaphore = asyncio.Semaphore(self.capacity) if self.capacity else None
+        self._started = time.monotonic()
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        self.base_url = f"http://{self.host}:{self.port}"
+        self.logger.log_event("stand_in_start", "Backend de substitution démarré",
+                            base_url=self.base_url, dataset=self.dataset.describe(),
+                            latency={name: dist.describe() for name, dist in self.latency.items()},
+                            errors={name: list(error) for name, error in self.errors.items()
+                                    if error[0]},
+                            capacity=self.capacity)
+        return self.base_url
+
+    async def stop(self):
+        """Arrêter le serveur et journaliser les requêtes servies"""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        self.logger.log_event("stand_in_stop", "Backend de substitution arrêté",
+                            served={name: count for name, count in self.served.items() if count},
+                            injected_errors={name: count for name, count in self.injected.items()
+                                             if count})
+
+    def start_in_thread(self, timeout: float = 30) -> str:
+        """Démarrer le serveur dans un thread dédié (clients synchrones ou autre boucle)"""
+        ready = threading.Event()
+        failure = []
+
+        def serve():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(self.start())
+            except Exception as e:
+                failure.append(e)
+                ready.set()
+                return
+            ready.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self.stop())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=serve, name="stand-in-backend", daemon=True)
+        self._thread.start()
+        ready.wait(timeout)
+        if failure or self.base_url is None:
+            raise RuntimeError(f"Backend de substitution non démarré: {failure}")
+        return self.base_url
+
+    def stop_thread(self):
+        """Arrêter le serveur lancé par start_in_thread()"""
+        if self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=10)
+            self._thread = None
+
+
+def add_stand_in_arguments(parser: argparse.ArgumentParser, switch: bool = True):
+    """Options CLI du backend de substitution (switch : ajouter --stand-in)"""
+    if switch:
+        parser.add_argument("--stand-in", action="store_true",
+                            help="Cibler un backend de substitution local (sans cluster)")
+    parser.add_argument("--stand-in-latency", default="*=fixed:0",
+                        type=lambda value: parse_route_options(value, LatencyDistribution.parse),
+                        help="Latence par route, ex. *=lognormal:0.005:0.5,users_list=exp:0.02")
+    parser.add_argument("--stand-in-errors", default="*=0",
+                        type=lambda value: parse_route_options(value, parse_error_injection),
+                        help="Erreurs injectées par route, ex. users_list=0.01:503 (0 = coupure)")
+    parser.add_argument("--stand-in-capacity", type=int, default=0,
+                        help="Requêtes traitées simultanément (0 = illimité)")
+
+
+def stand_in_from_args(args: argparse.Namespace,
+                       dataset: Optional[RBACDatasetGenerator] = None) -> Optional[StandInBackend]:
+    """Backend de substitution décrit par les options CLI (None sans --stand-in)"""
+    if not args.stand_in:
+        return None
+    return StandInBackend(dataset=dataset, latency=args.stand_in_latency,
+                          errors=args.stand_in_errors, capacity=args.stand_in_capacity)
+
+
+def main():
+    """Point d'entrée CLI : servir jusqu'à Ctrl-C"""
+    from .logger import configure_output
+
+    parser = argparse.ArgumentParser(description="Backend de substitution AccessGate PoC")
+    add_dataset_arguments(parser)
+    add_stand_in_arguments(parser, switch=False)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    args = parser.parse_args()
+
+    configure_output("logs/stand-in-results.jsonl")
+    backend = StandInBackend(host=args.host, port=args.port, dataset=generator_from_args(args),
+                             latency=args.stand_in_latency, errors=args.stand_in_errors,
+                             capacity=args.stand_in_capacity)
+
+    async def serve():
+        try:
+            import aiohttp  # noqa: F401
+        except ImportError:
+            backend.logger.log_event("stand_in_import", "aiohttp non installé", status="error")
+            return 1
+        base_url = await backend.start()
+        print(f"🧪 Backend de substitution sur {base_url} (Ctrl-C pour arrêter)")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await backend.stop()
+
+    try:
+        return asyncio.run(serve()) or 0
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
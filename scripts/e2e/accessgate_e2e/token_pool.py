@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Pool de tokens JWT pour les tirs de charge AccessGate PoC
+- Pré-authentifie N comptes avant le tir (bcrypt et authRateLimiter hors mesure)
+- Distribue les tokens aux utilisateurs virtuels en round-robin
+- Rafraîchit les tokens via /api/auth/refresh avant leur expiration, avec reprise
+  (Retry-After / RateLimit-Reset) quand authRateLimiter refuse
+"""
+
+import asyncio
+import base64
+import itertools
+import json
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+def jwt_claims(token: str) -> Dict:
+    """Payload JWT décodé, sans vérification de signature ({} si illisible)"""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        return claims if isinstance(claims, dict) else {}
+    except (IndexError, ValueError):
+        return {}
+
+
+# Réponses de /api/auth/refresh définitives (refresh token invalide) : inutile d'insister
+REFRESH_FATAL_STATUSES = (400, 401, 403)
+MAX_REFRESH_BACKOFF = 60
+
+
+def retry_delay(headers) -> Optional[float]:
+    """Attente demandée par le serveur (Retry-After, ou RateLimit-Reset d'express-rate-limit)"""
+    for name in ("Retry-After", "RateLimit-Reset"):
+        try:
+            return max(0.0, float(headers[name]))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return None
+
+
+def jwt_expiry(token: str) -> Optional[float]:
+    """Date d'expiration (epoch) lue dans le payload JWT, sans vérification de signature"""
+    try:
+        return float(jwt_claims(token)["exp"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class TokenSlot:
+    """Jetons courants d'un compte (mis à jour sur place par le rafraîchissement)"""
+
+    def __init__(self, email: str, access_token: str, refresh_token: Optional[str]):
+        self.email = email
+        self.access_token = access_token
+        self.refresh_token = refresh_token
+        self.expires_at = jwt_expiry(access_token)
+        # Nouvelle tentative de rafraîchissement après un échec transitoire (429, 5xx, réseau)
+        self.retry_at: Optional[float] = None
+        self.failures = 0
+        # Id du compte (payload AuthService : userId), pour les routes /api/users/:id
+        self.user_id = jwt_claims(access_token).get("userId")
+
+    def headers(self) -> Dict[str, str]:
+        """En-tête Authorization du token courant"""
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+
+class TokenPool:
+    """Pool de tokens pré-authentifiés partagé par les utilisateurs virtuels"""
+
+    def __init__(self, logger, base_url: str = "http://localhost:8001",
+                 refresh_margin: float = 60, login_concurrency: int = 4):
+        self.logger = logger
+        self.base_url = base_url
+        self.refresh_margin = refresh_margin
+        self.login_concurrency = login_concurrency
+        self.slots: List[TokenSlot] = []
+        # Attente demandée par authRateLimiter lors du dernier fill refusé (429)
+        self.retry_after: Optional[float] = None
+        self._cycle = None
+        self._refresher: Optional[asyncio.Task] = None
+
+    async def fill(self, session, accounts: Sequence[Tuple[str, str]]) -> int:
+        """Authentifier les comptes ; retourne le nombre de tokens obtenus"""
+        start_time = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.login_concurrency)
+        rate_limited = asyncio.Event()
+        self.retry_after = None
+
+        async def login(email: str, password: str) -> Optional[TokenSlot]:
+            async with semaphore:
+                if rate_limited.is_set():
+                    return None
+                try:
+                    async with session.post(f"{self.base_url}/api/auth/login",
+                                            json={"email": email, "password": password}) as response:
+                        if response.status == 429:
+                            # authRateLimiter : inutile d'insister, on garde les tokens déjà obtenus
+                            rate_limited.set()
+                            self.retry_after = retry_delay(response.headers)
+                            return None
+                        if response.status != 200:
+                            return None
+                        data = await response.json()
+                        return TokenSlot(email, data["accessToken"], data.get("refreshToken"))
+                except Exception as e:
+                    self.logger.log_event("token_pool_login", "Erreur login pool",
+                                        email=email, error=str(e), status="error")
+                    return None
+
+        results = await asyncio.gather(*(login(email, password) for email, password in accounts))
+        self.slots = [slot for slot in results if slot is not None]
+        self._cycle = itertools.cycle(self.slots) if self.slots else None
+
+        self.logger.log_event("token_pool_ready", "Pool de tokens prêt",
+                            requested=len(accounts), authenticated=len(self.slots),
+                            rate_limited=rate_limited.is_set(),
+                            retry_after=self.retry_after,
+                            duration=time.perf_counter() - start_time,
+                            status="success" if self.slots else "error")
+        return len(self.slots)
+
+    def acquire(self) -> Optional[TokenSlot]:
+        """Prochain compte du pool (round-robin)"""
+        return next(self._cycle) if self._cycle else None
+
+    def start(self, session):
+        """Lancer le rafraîchissement en tâche de fond"""
+        if self.slots and self._refresher is None:
+            self._refresher = asyncio.create_task(self._refresh_loop(session))
+
+    async def stop(self):
+        """Arrêter le rafraîchissement"""
+        if self._refresher is not None:
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+            self._refresher = None
+
+    async def _refresh_loop(self, session):
+        """Rafraîchir chaque token avant son expiration"""
+        while True:
+            expiring = [slot for slot in self.slots
+                        if slot.expires_at is not None and slot.refresh_token]
+            if not expiring:
+                return
+            next_due = min(self._due(slot) for slot in expiring)
+            await asyncio.sleep(max(1.0, next_due - time.time()))
+
+            now = time.time()
+            for slot in expiring:
+                if self._due(slot) <= now:
+                    await self._refresh(session, slot)
+
+    def _due(self, slot: TokenSlot) -> float:
+        """Heure du prochain rafraîchissement d'un compte (reprise programmée en priorité)"""
+        if slot.retry_at is not None:
+            return slot.retry_at
+        return slot.expires_at - self.refresh_margin
+
+    async def _refresh(self, session, slot: TokenSlot):
+        """Échanger le refresh token d'un compte contre de nouveaux tokens"""
+        try:
+            async with session.post(f"{self.base_url}/api/auth/refresh",
+                                    json={"refreshToken": slot.refresh_token}) as response:
+                if response.status != 200:
+                    self._refresh_failed(slot, response.status, retry_delay(response.headers))
+                    return
+                data = await response.json()
+                slot.access_token = data["accessToken"]
+                slot.refresh_token = data.get("refreshToken", slot.refresh_token)
+                slot.expires_at = jwt_expiry(slot.access_token)
+                slot.retry_at = None
+                slot.failures = 0
+                self.logger.log_event("token_refresh", "Token rafraîchi", email=slot.email)
+        except Exception as e:
+            self._refresh_failed(slot, 0, None, str(e))
+
+    def _refresh_failed(self, slot: TokenSlot, status_code: int, delay: Optional[float],
+                        error: Optional[str] = None):
+        """Programmer une reprise, ou abandonner le compte (refus définitif, token expiré)
+
+        Un 429 d'authRateLimiter peut imposer d'attendre au-delà de l'expiration : le
+        compte est abandonné seulement si une tentative échoue une fois le token expiré.
+        """
+        now = time.time()
+        slot.failures += 1
+        details = {"email": slot.email, "status_code": status_code, "failures": slot.failures}
+        if error is not None:
+            details["error"] = error
+        if status_code in REFRESH_FATAL_STATUSES or now >= slot.expires_at:
+            self.logger.log_event("token_refresh", "Rafraîchissement abandonné, token "
+                                "inutilisable jusqu'à la fin du tir", expired=now >= slot.expires_at,
+                                **details, status="error")
+            slot.expires_at = None
+            slot.retry_at = None
+            return
+        if delay is None:
+            delay = min(MAX_REFRESH_BACKOFF, 2.0 ** slot.failures)
+        slot.retry_at = now + delay
+        self.logger.log_event("token_refresh", "Échec rafraîchissement token, nouvelle tentative",
+                            retry_in=delay, expires_before_retry=slot.retry_at > slot.expires_at,
+                            **details, status="warning")
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Tir en modèle ouvert réparti sur plusieurs processus (un par cœur)
+- Chaque worker exécute sa propre boucle asyncio sur une part du débit offert
+- Les fenêtres closes remontent en instantanés d'histogrammes (pas de percentiles)
+- Le coordinateur fusionne les fenêtres par index et produit le résumé habituel
+"""
+
+import asyncio
+import multiprocessing
+import os
+import queue as queue_module
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from .load_profiles import ArrivalProfile, OpenModelLoadTester, RouteStats, ScaledProfile
+from .logger import StructuredLogger
+
+# Événements produits par le coordinateur à partir des fusions (non relayés depuis les workers)
+MERGED_EVENTS = {"metric", "load_profile_start", "load_interval",
+                 "load_profile_complete", "load_rate_limited"}
+# Métriques propres à une requête (--record-requests) : relayées telles quelles
+RELAYED_METRICS = {"load_request_latency"}
+
+
+class IntervalMerger:
+    """Fusion des fenêtres et totaux remontés par plusieurs participants (workers, agents)"""
+
+    def __init__(self, reporter: OpenModelLoadTester, profile: ArrivalProfile,
+                 participants: int):
+        self.reporter = reporter
+        self.profile = profile
+        self.participants = participants
+        self.finished: Set[int] = set()
+        self.failed: Set[int] = set()
+        self.last_index = {participant: -1 for participant in range(participants)}
+        self.windows: Dict[int, Dict] = {}
+        self.next_index = 0
+        self.totals: Dict[str, RouteStats] = {}
+        self.elapsed = 0.0
+        self.max_lag = 0.0
+
+    @property
+    def complete(self) -> bool:
+        return len(self.finished | self.failed) >= self.participants
+
+    def add_interval(self, participant: int, index: int, start: float, end: float,
+                     snapshot: Dict[str, Dict]):
+        """Ajouter la fenêtre index close par un participant"""
+        window = self.windows.setdefault(index, {"start": start, "end": end, "routes": {}})
+        window["start"] = min(window["start"], start)
+        window["end"] = max(window["end"], end)
+        for name, data in snapshot.items():
+            window["routes"].setdefault(name, RouteStats()).merge(RouteStats.from_snapshot(data))
+        self.last_index[participant] = index
+        self.flush()
+
+    def add_totals(self, participant: int, snapshot: Dict[str, Dict], duration: float,
+                   max_lag: float):
+        """Ajouter les totaux d'un participant terminé"""
+        for name, data in snapshot.items():
+            self.totals.setdefault(name, RouteStats()).merge(RouteStats.from_snapshot(data))
+        self.elapsed = max(self.elapsed, duration)
+        self.max_lag = max(self.max_lag, max_lag)
+        self.finished.add(participant)
+        self.flush()
+
+    def fail(self, participant: int):
+        """Écarter un participant : ses fenêtres ne sont plus attendues"""
+        self.failed.add(participant)
+        self.flush()
+
+    def flush(self, force: bool = False):
+        """Journaliser, dans l'ordre, les fenêtres closes par tous les participants actifs"""
+        active = [participant for participant in range(self.participants)
+                  if participant not in self.finished | self.failed]
+        while self.next_index in self.windows:
+            if not force and any(self.last_index[participant] < self.next_index
+                                 for participant in active):
+                return
+            window = self.windows.pop(self.next_index)
+            self.reporter._report_interval(window["routes"], window["start"], window["end"],
+                                           self.profile, 0.0)
+            self.next_index += 1
+
+    def summary(self) -> Dict:
+        """Résumé fusionné (vide si aucun participant n'a terminé)"""
+        self.flush(force=True)
+        if not self.finished:
+            self.reporter.logger.log_event("load_profile_error", "Aucun participant n'a terminé",
+                                           status="error")
+            return {}
+        summary = self.reporter._report(self.totals, self.profile, self.elapsed, self.max_lag)
+        summary["participants"] = len(self.finished)
+        return summary
+
+
+class _QueueWriter:
+    """Écrivain JSONL d'un worker : relaie les entrées au coordinateur"""
+
+    def __init__(self, queue, worker: int):
+        self.queue = queue
+        self.worker = worker
+
+    def write(self, entry: Dict):
+        if (entry.get("event_type") not in MERGED_EVENTS
+                or entry.get("metric_name") in RELAYED_METRICS):
+            self.queue.put(("log", {**entry, "worker": self.worker}))
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def snapshot_window(window: Dict[str, RouteStats]) -> Dict[str, Dict]:
+    """Statistiques par route sous forme sérialisable (pickle ou JSON)"""
+    return {name: route_stats.to_snapshot() for name, route_stats in window.items()}
+
+
+def _worker_main(worker: int, workers: int, profile: ArrivalProfile,
+                 route_mix: Optional[Dict[str, float]], accounts: Sequence[Tuple[str, str]],
+                 poisson: bool, seed: int, tester_options: Dict, queue, start_event):
+    """Point d'entrée d'un processus worker"""
+    logger = StructuredLogger("load_worker", _QueueWriter(queue, worker))
+    # Identifiant de worker dans les emails inscrits : compteurs disjoints entre processus
+    tester = OpenModelLoadTester(logger, **{**tester_options, "identity_worker": str(worker)})
+
+    async def on_ready():
+        queue.put(("ready", worker))
+        await asyncio.get_running_loop().run_in_executor(None, start_event.wait)
+
+    def on_interval(index: int, start: float, end: float, window: Dict[str, RouteStats]):
+        queue.put(("interval", worker, index, start, end, snapshot_window(window)))
+
+    try:
+        summary = asyncio.run(tester.run(ScaledProfile(profile, 1.0 / workers), route_mix,
+                                         accounts, poisson=poisson, seed=seed + worker,
+                                         phase=worker / workers, on_ready=on_ready,
+                                         on_interval=on_interval))
+        if summary:
+            queue.put(("done", worker, snapshot_window(tester.totals), summary["duration"],
+                       summary["max_schedule_lag"]))
+        else:
+            queue.put(("error", worker, "tir interrompu (voir les logs du worker)"))
+    except Exception as e:
+        queue.put(("error", worker, str(e)))
+
+
+class MultiProcessLoadRunner:
+    """Coordinateur : lance N workers, fusionne leurs fenêtres et leurs totaux"""
+
+    def __init__(self, logger, workers: Optional[int] = None, **tester_options):
+        self.logger = logger
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.tester_options = tester_options
+        # Instance locale réutilisée pour les rapports fusionnés et la saturation
+        self.reporter = OpenModelLoadTester(logger, **tester_options)
+
+    def run(self, profile: ArrivalProfile, route_mix: Optional[Dict[str, float]] = None,
+            accounts: Sequence[Tuple[str, str]] = (), poisson: bool = False,
+            seed: int = 42) -> Dict:
+        """Exécuter le profil sur tous les workers et retourner le résumé fusionné"""
+        # spawn : pas de boucle asyncio ni de sessions héritées du parent
+        context = multiprocessing.get_context("spawn")
+        queue = context.Queue()
+        start_event = context.Event()
+
+        self.logger.log_event("load_profile_start", "Démarrage tir multi-processus",
+                            profile=profile.describe(), routes=route_mix,
+                            poisson=poisson, workers=self.workers)
+
+        processes = []
+        for worker in range(self.workers):
+            # Comptes répartis : chaque login compte pour authRateLimiter
+            worker_accounts = list(accounts[worker::self.workers]) or list(accounts)
+            process = context.Process(
+                target=_worker_main, name=f"load-worker-{worker}", daemon=True,
+                args=(worker, self.workers, profile, route_mix, worker_accounts,
+                      poisson, seed, self.tester_options, queue, start_event))
+            process.start()
+            processes.append(process)
+
+        try:
+            return self._coordinate(processes, queue, start_event, profile)
+        finally:
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+
+    def _coordinate(self, processes: List, queue, start_event, profile: ArrivalProfile) -> Dict:
+        """Relayer les logs, synchroniser le départ et fusionner les fenêtres"""
+        merger = IntervalMerger(self.reporter, profile, self.workers)
+        ready: Set[int] = set()
+
+        while not merger.complete:
+            try:
+                message = queue.get(timeout=1)
+            except queue_module.Empty:
+                for worker, process in enumerate(processes):
+                    if not process.is_alive() and worker not in merger.finished | merger.failed:
+                        self.logger.log_event("load_worker_error", "Worker arrêté sans résultat",
+                                            worker=worker, exitcode=process.exitcode,
+                                            status="error")
+                        merger.fail(worker)
+                message = ("idle",)
+
+            kind = message[0]
+            if kind == "log":
+                self.logger.writer.write(message[1])
+            elif kind == "ready":
+                ready.add(message[1])
+            elif kind == "interval":
+                merger.add_interval(*message[1:])
+            elif kind == "done":
+                merger.add_totals(*message[1:])
+            elif kind == "error":
+                _, worker, error = message
+                self.logger.log_event("load_worker_error", "Échec d'un worker",
+                                    worker=worker, error=error, status="error")
+                merger.fail(worker)
+
+            if not start_event.is_set() and len(ready | merger.failed) == self.workers:
+                # Départ commun : tous les workers ont leurs tokens
+                start_event.set()
+
+        return merger.summary()
@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark checkAuth / requirePermission AccessGate PoC (voir accessgate_e2e.auth_bench)
+- Latence d'une route protégée pour des utilisateurs à 1, 10, 100 rôles, graphique SVG
+"""
+
+import sys
+
+from accessgate_e2e.auth_bench import main
+
+if __name__ == "__main__":
+    sys.exit(main())
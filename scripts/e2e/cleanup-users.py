@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+Nettoyage des comptes inscrits par les tirs AccessGate PoC (voir accessgate_e2e.identities)
+- Suppression groupée par préfixe de tir, ou de tous les tirs d'un espace de noms
+"""
+
+import sys
+
+from accessgate_e2e.identities import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+Conversion des résultats binaires AccessGate PoC en JSONL (voir accessgate_e2e.binary_log)
+- Sortie identique à celle de l'écrivain JSONL, directement exploitable par Grafana
+"""
+
+import sys
+
+from accessgate_e2e.binary_log import main
+
+if __name__ == "__main__":
+    sys.exit(main())
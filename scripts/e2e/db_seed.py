@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+"""
+Seed massif de la base AccessGate PoC (voir accessgate_e2e.db_seed)
+"""
+
+import sys
+
+from accessgate_e2e.db_seed import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+Agent de tir distribué AccessGate PoC (voir accessgate_e2e.distributed)
+- Se connecte à load-test.py --agents N et exécute sa part du débit offert
+"""
+
+import sys
+
+from accessgate_e2e.distributed import main
+
+if __name__ == "__main__":
+    sys.exit(main())
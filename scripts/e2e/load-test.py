@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+Tir de charge en modèle ouvert AccessGate PoC (voir accessgate_e2e.load_profiles)
+- Profils constant, ramp, step, spike et soak sur les routes protégées par checkAuth
+"""
+
+import sys
+
+from accessgate_e2e.load_profiles import main
+
+if __name__ == "__main__":
+    sys.exit(main())
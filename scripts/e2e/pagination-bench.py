@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+Benchmark de pagination /api/users AccessGate PoC (voir accessgate_e2e.pagination_bench)
+- Parcours de toutes les pages à plusieurs tailles, latence et taille par index de page
+"""
+
+import sys
+
+from accessgate_e2e.pagination_bench import main
+
+if __name__ == "__main__":
+    sys.exit(main())
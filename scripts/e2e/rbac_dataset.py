@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+"""
+Générateur de jeux de données RBAC synthétiques (voir accessgate_e2e.rbac_dataset)
+"""
+
+import sys
+
+from accessgate_e2e.rbac_dataset import main
+
+if __name__ == "__main__":
+    sys.exit(main())
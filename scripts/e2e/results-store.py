@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+Base des résultats de performance AccessGate PoC (voir accessgate_e2e.results_store)
+- Liste les tirs enregistrés et compare un tir à sa référence glissante
+"""
+
+import sys
+
+from accessgate_e2e.results_store import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+Tir de scénarios déclaratifs AccessGate PoC (voir accessgate_e2e.scenario)
+- Parcours pondérés ou séquentiels, extractions et assertions par étape, compilés une fois
+"""
+
+import sys
+
+from accessgate_e2e.scenario import main
+
+if __name__ == "__main__":
+    sys.exit(main())
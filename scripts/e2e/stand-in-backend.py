@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+Backend de substitution AccessGate PoC (voir accessgate_e2e.stand_in)
+- Routes auth, users, roles et permissions servies localement, sans cluster ni base
+"""
+
+import sys
+
+from accessgate_e2e.stand_in import main
+
+if __name__ == "__main__":
+    sys.exit(main())
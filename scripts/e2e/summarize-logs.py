@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+Analyse en flux des logs JSONL AccessGate PoC (voir accessgate_e2e.log_summary)
+- Comptes par événement, agrégats des métriques et taux de réussite, en mémoire constante
+"""
+
+import sys
+
+from accessgate_e2e.log_summary import main
+
+if __name__ == "__main__":
+    sys.exit(main())
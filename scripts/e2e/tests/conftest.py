@@ -0,0 +1,44 @@
+"""
+Configuration pytest des scripts E2E AccessGate PoC
+- Rend le paquet accessgate_e2e importable depuis scripts/e2e/tests
+- Logger structuré en mémoire (aucun fichier de logs écrit par les tests)
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from accessgate_e2e.logger import StructuredLogger  # noqa: E402
+
+
+class MemoryWriter:
+    """Écrivain qui garde les entrées en mémoire"""
+
+    def __init__(self):
+        self.entries: List[Dict] = []
+
+    def write(self, entry: Dict):
+        self.entries.append(entry)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+    def events(self, event_type: str) -> List[Dict]:
+        return [entry for entry in self.entries if entry["event_type"] == event_type]
+
+
+@pytest.fixture
+def log_writer() -> MemoryWriter:
+    return MemoryWriter()
+
+
+@pytest.fixture
+def logger(log_writer: MemoryWriter) -> StructuredLogger:
+    return StructuredLogger("test", log_writer)
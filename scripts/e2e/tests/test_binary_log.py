@@ -0,0 +1,37 @@
+"""Tests du format binaire : aller-retour exact des entrées du logger"""
+
+import json
+
+from accessgate_e2e.binary_log import encode_block, iter_entries
+
+ENTRIES = [
+    {"timestamp": "2025-01-01T12:00:00.123456Z", "component": "load_profile",
+     "event_type": "metric", "metric_name": "load_throughput_rps", "metric_value": 512.25,
+     "endpoint": "users_list", "level": "INFO"},
+    {"timestamp": "2025-01-01T12:00:00Z", "component": "load_profile", "event_type": "metric",
+     "metric_name": "load_error_count", "metric_value": 0, "endpoint": "users_list",
+     "level": "INFO", "ok": True, "missing": None},
+    # Horodatage hors des formes du logger : conservé tel quel
+    {"timestamp": "2025-01-01 12:00", "nested": {"status_codes": {"200": 3, "503": -1}},
+     "tags": ["a", "b", 1.5], "error": "x" * 300, "negative": -42},
+]
+
+
+def _as_jsonl(entries):
+    return [json.dumps(entry, default=str) for entry in entries]
+
+
+def test_block_round_trip(tmp_path):
+    path = tmp_path / "run.agbin"
+    path.write_bytes(encode_block(ENTRIES[:2]) + encode_block(ENTRIES[2:]))
+    restored = list(iter_entries(str(path)))
+    assert restored == ENTRIES
+    # Conversion JSONL identique à celle de BatchedJSONLWriter (ordre des clés compris)
+    assert _as_jsonl(restored) == _as_jsonl(ENTRIES)
+
+
+def test_truncated_last_block_is_dropped(tmp_path, capsys):
+    path = tmp_path / "run.agbin"
+    path.write_bytes(encode_block(ENTRIES[:1]) + encode_block(ENTRIES[1:])[:-5])
+    assert list(iter_entries(str(path))) == ENTRIES[:1]
+    assert "tronqué" in capsys.readouterr().err
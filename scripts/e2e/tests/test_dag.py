@@ -0,0 +1,64 @@
+"""Tests de l'ordonnanceur DAG : ordre des dépendances, échecs et validation"""
+
+import threading
+
+import pytest
+
+from accessgate_e2e.dag import DAGScheduler
+
+
+def _recorder(order, lock, name, fail=False):
+    def step():
+        with lock:
+            order.append(name)
+        if fail:
+            raise RuntimeError(f"{name} en échec")
+        return name
+    return step
+
+
+def test_dependencies_run_first(logger):
+    order, lock = [], threading.Lock()
+    scheduler = DAGScheduler(logger, max_workers=4)
+    scheduler.add("deploy", _recorder(order, lock, "deploy"), ["build", "migrate"])
+    scheduler.add("build", _recorder(order, lock, "build"))
+    scheduler.add("migrate", _recorder(order, lock, "migrate"), ["build"])
+    scheduler.add("tests", _recorder(order, lock, "tests"), ["deploy"])
+
+    assert scheduler.run()
+    assert order == ["build", "migrate", "deploy", "tests"]
+    assert scheduler.steps["deploy"].result == "deploy"
+    assert scheduler.critical_path() == ["build", "migrate", "deploy", "tests"]
+
+
+def test_failure_skips_dependents_only(logger, log_writer):
+    order, lock = [], threading.Lock()
+    scheduler = DAGScheduler(logger)
+    scheduler.add("build", _recorder(order, lock, "build", fail=True))
+    scheduler.add("deploy", _recorder(order, lock, "deploy"), ["build"])
+    scheduler.add("tests", _recorder(order, lock, "tests"), ["deploy"])
+    scheduler.add("lint", _recorder(order, lock, "lint"))
+
+    assert not scheduler.run()
+    statuses = {name: step.status for name, step in scheduler.steps.items()}
+    assert statuses == {"build": "failed", "deploy": "skipped", "tests": "skipped",
+                        "lint": "success"}
+    assert scheduler.steps["build"].error == "build en échec"
+    assert sorted(order) == ["build", "lint"]
+    assert {entry["step"] for entry in log_writer.events("dag_step_skipped")} == {"deploy",
+                                                                               "tests"}
+
+
+def test_invalid_graphs_rejected(logger):
+    scheduler = DAGScheduler(logger)
+    scheduler.add("a", lambda: None, ["b"])
+    scheduler.add("b", lambda: None, ["a"])
+    with pytest.raises(ValueError, match="Cycle"):
+        scheduler.run()
+
+    scheduler = DAGScheduler(logger)
+    scheduler.add("a", lambda: None, ["missing"])
+    with pytest.raises(ValueError, match="inconnue"):
+        scheduler.run()
+    with pytest.raises(ValueError):
+        scheduler.add("a", lambda: None)
@@ -0,0 +1,41 @@
+"""Tests de l'échantillonneur de ressources : disponibilité de metrics.k8s.io"""
+
+import urllib.error
+
+from accessgate_e2e.k8s_resources import PodResourceSampler
+
+PODS = {"items": [{"metadata": {"name": "backend-1", "labels": {"app": "backend"}},
+                   "status": {"phase": "Running",
+                              "containerStatuses": [{"restartCount": 1}]}}]}
+METRICS = {"items": [{"metadata": {"name": "backend-1"}, "timestamp": "2025-01-01T00:00:00Z",
+                      "containers": [{"usage": {"cpu": "250m", "memory": "64Mi"}}]}]}
+
+
+class ScriptedSampler(PodResourceSampler):
+    """Réponses de l'API Kubernetes rejouées, erreurs metrics.k8s.io d'abord"""
+
+    def __init__(self, logger, metrics_errors):
+        super().__init__(logger)
+        self.metrics_errors = list(metrics_errors)
+
+    def _get(self, path: str):
+        if "metrics.k8s.io" not in path:
+            return PODS
+        if self.metrics_errors:
+            raise urllib.error.HTTPError(path, self.metrics_errors.pop(0), "erreur", {}, None)
+        return METRICS
+
+
+def test_transient_metrics_error_retried(logger):
+    sampler = ScriptedSampler(logger, [503])
+    assert "cpu" not in sampler.sample()["pods"]["backend-1"]
+    assert sampler.metrics_available
+    pod = sampler.sample()["pods"]["backend-1"]
+    assert pod["cpu"] == 0.25 and pod["restarts"] == 1
+
+
+def test_missing_metrics_server_disables_metrics(logger):
+    sampler = ScriptedSampler(logger, [404])
+    sampler.sample()
+    assert not sampler.metrics_available
+    assert "cpu" not in sampler.sample()["pods"]["backend-1"]
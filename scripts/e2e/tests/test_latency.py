@@ -0,0 +1,50 @@
+"""Tests de l'histogramme de latences : percentiles, fusion et sérialisation"""
+
+import json
+
+import pytest
+
+from accessgate_e2e.latency import LatencyHistogram
+
+
+def test_percentiles_within_precision():
+    histogram = LatencyHistogram()
+    for millis in range(1, 1001):
+        histogram.record(millis / 1000)
+    assert histogram.count == 1000
+    assert histogram.percentile(50) == pytest.approx(0.5, rel=0.01)
+    assert histogram.percentile(99) == pytest.approx(0.99, rel=0.01)
+    assert histogram.percentile(100) == histogram.max == 1.0
+    assert histogram.summary()["mean"] == pytest.approx(0.5005)
+
+
+def test_empty_histogram():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(99) == 0.0
+    assert histogram.summary()["min"] == 0.0
+
+
+def test_merge_equals_single_recording():
+    left, right, single = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for index in range(500):
+        value = 0.001 * (1 + index % 37)
+        (left if index % 2 else right).record(value)
+        single.record(value)
+    left.merge(right)
+    assert left.buckets == single.buckets
+    assert (left.count, left.min, left.max) == (single.count, single.min, single.max)
+    assert left.total == pytest.approx(single.total)
+
+
+def test_merge_rejects_other_precision():
+    with pytest.raises(ValueError):
+        LatencyHistogram().merge(LatencyHistogram(precision=0.05))
+
+
+def test_dict_round_trip_through_json():
+    histogram = LatencyHistogram()
+    for value in (0.002, 0.004, 0.004, 0.3):
+        histogram.record(value)
+    restored = LatencyHistogram.from_dict(json.loads(json.dumps(histogram.to_dict())))
+    assert restored.summary() == histogram.summary()
+    assert LatencyHistogram.from_dict(LatencyHistogram().to_dict()).count == 0
@@ -0,0 +1,44 @@
+"""Tests du tir en modèle ouvert : fenêtres partielles et point de saturation"""
+
+import asyncio
+
+import pytest
+
+from accessgate_e2e.load_profiles import ArrivalProfile, OpenModelLoadTester
+
+
+def _interval(offered: float, partial: bool = False, p99: float = 0.01) -> dict:
+    return {"offered_rps": offered, "throughput_rps": offered, "requests": 100, "dropped": 0,
+            "errors": 0, "latency": {"p99": p99}, "partial": partial}
+
+
+def test_saturation_ignores_partial_windows(logger):
+    tester = OpenModelLoadTester(logger)
+    tester.intervals = [_interval(200), _interval(200), _interval(726, partial=True)]
+    assert tester.saturation_point() == 200
+
+
+def test_saturation_stops_at_first_breach(logger):
+    tester = OpenModelLoadTester(logger, slo_p99=0.5)
+    tester.intervals = [_interval(100), _interval(200), _interval(300, p99=0.8), _interval(400)]
+    assert tester.saturation_point() == 200
+
+
+def test_constant_profile_saturation_within_target(logger):
+    pytest.importorskip("aiohttp")
+    from accessgate_e2e.rbac_dataset import RBACDatasetGenerator
+    from accessgate_e2e.stand_in import StandInBackend
+
+    backend = StandInBackend(logger, dataset=RBACDatasetGenerator(users=10))
+    base_url = backend.start_in_thread()
+    try:
+        tester = OpenModelLoadTester(logger, base_url, report_interval=0.5)
+        profile = ArrivalProfile(rps=100, duration=2.2)
+        summary = asyncio.run(tester.run(profile, {"health": 1}))
+    finally:
+        backend.stop_thread()
+
+    assert summary["total_requests"] >= 220
+    assert tester.intervals[-1]["partial"]
+    assert summary["saturation_rps"] is not None
+    assert summary["saturation_rps"] <= profile.rps * 1.001
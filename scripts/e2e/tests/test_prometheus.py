@@ -0,0 +1,46 @@
+"""Tests de l'analyse du format d'exposition Prometheus"""
+
+import pytest
+
+from accessgate_e2e.prometheus import parse_exposition, parse_sample
+
+EXPOSITION = """\
+# HELP http_request_duration_seconds Durée des requêtes
+# TYPE http_request_duration_seconds histogram
+http_request_duration_seconds_bucket{method="GET",route="/api/users",le="0.1"} 12
+http_request_duration_seconds_bucket{route="/api/users",method="GET",le="+Inf"} 15
+http_request_duration_seconds_sum{method="GET",route="/api/users"} 0.75
+http_request_duration_seconds_count{method="GET",route="/api/users"} 15
+process_cpu_seconds_total 4.5 1700000000000
+nodejs_heap_size_used_bytes 1.2e+07
+"""
+
+
+def test_parse_sample_sorts_labels_and_unescapes():
+    name, labels, value = parse_sample('m{b="x \\"y\\"",a="1\\\\2"} 3')
+    assert name == "m"
+    assert labels == (("a", "1\\2"), ("b", 'x "y"'))
+    assert value == 3.0
+    assert parse_sample("# TYPE m counter") is None
+    assert parse_sample("up 1 1700000000000") == ("up", (), 1.0)
+
+
+def test_parse_sample_rejects_bad_labels():
+    with pytest.raises(ValueError):
+        parse_sample("m{a=1} 2")
+
+
+def test_parse_exposition_filters_families():
+    samples = list(parse_exposition(EXPOSITION.splitlines(), ["http_request_duration_seconds"]))
+    assert {sample[0] for sample in samples} == {"http_request_duration_seconds"}
+    assert len(samples) == 4
+    family, name, labels, value = samples[1]
+    assert name == "http_request_duration_seconds_bucket"
+    assert labels == (("le", "+Inf"), ("method", "GET"), ("route", "/api/users"))
+    assert value == 15.0
+
+
+def test_parse_exposition_all_families():
+    samples = {sample[1]: sample[3] for sample in parse_exposition(EXPOSITION.splitlines())}
+    assert samples["process_cpu_seconds_total"] == 4.5
+    assert samples["nodejs_heap_size_used_bytes"] == 1.2e7
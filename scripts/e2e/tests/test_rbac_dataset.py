@@ -0,0 +1,24 @@
+"""Tests du générateur de jeux RBAC : déterminisme et ordre createdAt des utilisateurs"""
+
+from accessgate_e2e.rbac_dataset import DATASET_TIMESTAMP, RBACDatasetGenerator, seeded_accounts
+
+
+def test_rows_are_deterministic():
+    first, second = RBACDatasetGenerator(users=50), RBACDatasetGenerator(users=50)
+    assert list(first.user_rows()) == list(second.user_rows())
+    assert list(first.user_role_rows()) == list(second.user_role_rows())
+    assert list(first.role_permission_rows()) == list(second.role_permission_rows())
+
+
+def test_user_created_at_distinct_and_decreasing():
+    dataset = RBACDatasetGenerator(users=100)
+    created = [row[6] for row in dataset.user_rows()]
+    assert created[0] == DATASET_TIMESTAMP
+    assert len(set(created)) == len(created)
+    # createdAt desc (UserService.getUsers) suit l'ordre des index
+    assert created == sorted(created, reverse=True)
+
+
+def test_seeded_accounts_match_generated_emails():
+    dataset = RBACDatasetGenerator(users=3)
+    assert [email for email, _ in seeded_accounts(3)] == [dataset.user_email(i) for i in range(3)]
@@ -0,0 +1,55 @@
+"""Tests de la détection de régressions sur la base des résultats"""
+
+import random
+
+from accessgate_e2e.latency import LatencyHistogram
+from accessgate_e2e.results_store import (RegressionDetector, ResultsStore, mann_whitney_greater,
+                                          proportion_greater)
+
+METADATA = {"git_sha": "abc1234", "git_branch": "main", "git_dirty": False,
+            "hostname": "ci", "environment": {}}
+
+
+def _histogram(mean: float, count: int = 2000, seed: int = 0) -> LatencyHistogram:
+    rng = random.Random(seed)
+    histogram = LatencyHistogram()
+    for _ in range(count):
+        histogram.record(rng.lognormvariate(0, 0.2) * mean)
+    return histogram
+
+
+def _record(store: ResultsStore, mean: float, seed: int, errors: int = 0) -> int:
+    endpoint = {"requests": 2000, "errors": errors, "duration": 10.0,
+                "histogram": _histogram(mean, seed=seed)}
+    return store.record_run("load_profile", {"profile": "constant"}, {"users_list": endpoint},
+                            METADATA)
+
+
+def test_statistical_tests():
+    fast, slow = _histogram(0.010, seed=1), _histogram(0.015, seed=2)
+    assert mann_whitney_greater(slow, fast) < 0.001
+    assert mann_whitney_greater(fast, slow) > 0.999
+    assert mann_whitney_greater(LatencyHistogram(), fast) == 1.0
+    assert proportion_greater(50, 1000, 10, 1000) < 0.001
+    assert proportion_greater(10, 1000, 10, 1000) == 0.5
+    assert proportion_greater(0, 0, 10, 1000) == 1.0
+
+
+def test_regression_detected_against_baseline(tmp_path):
+    store = ResultsStore(str(tmp_path / "results.db"))
+    try:
+        detector = RegressionDetector(store, baseline_runs=5, min_baseline=3)
+        first = _record(store, 0.010, seed=0)
+        assert detector.compare(first)["insufficient_baseline"]
+        for seed, mean in enumerate((0.0101, 0.0099, 0.0100, 0.0102), start=1):
+            _record(store, mean, seed)
+
+        steady = detector.compare(_record(store, 0.0100, seed=10))
+        assert steady["regressions"] == []
+
+        slow = detector.compare(_record(store, 0.0150, seed=11, errors=200))
+        regressed = {item["metric"] for item in slow["regressions"]}
+        assert {"p95", "p99", "error_rate"} <= regressed
+        assert len(slow["baseline_run_ids"]) == 5
+    finally:
+        store.close()